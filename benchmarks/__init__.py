@@ -0,0 +1,26 @@
+"""Benchmarks for the Tasmanian Fuel Prices integration."""
+from __future__ import annotations
+
+import importlib
+import importlib.machinery
+import importlib.util
+from pathlib import Path
+import sys
+from types import ModuleType
+
+INTEGRATION_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "tas_fuel_prices"
+PACKAGE = "tas_fuel_prices_headless"
+
+
+def load_integration_module(name: str) -> ModuleType:
+    """
+    Import a module of the integration without running its package __init__,
+    which needs Home Assistant. Only modules free of Home Assistant imports,
+    such as `core`, `snapshot` and `search`, can be loaded this way.
+    """
+    if PACKAGE not in sys.modules:
+        spec = importlib.machinery.ModuleSpec(PACKAGE, None, is_package=True)
+        package = importlib.util.module_from_spec(spec)
+        package.__path__ = [str(INTEGRATION_DIR)]
+        sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{name}")
@@ -0,0 +1,195 @@
+"""
+Run the Tasmanian Fuel Prices benchmarks.
+
+    python -m benchmarks --scales 150 1000 10000 --output results.json
+
+Each scale level generates a synthetic snapshot with that many stations and
+all nine fuel types, then times the stages a refresh goes through. Results are
+written as JSON so runs can be compared between releases.
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+from zoneinfo import ZoneInfo
+
+from . import load_integration_module
+from .fixtures import generate_dataset, mutate_prices
+
+const = load_integration_module("const")
+core = load_integration_module("core")
+metrics = load_integration_module("metrics")
+search = load_integration_module("search")
+snapshot = load_integration_module("snapshot")
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DEFAULT_SCALES = [150, 500, 1000, 2500, 5000, 10000]
+TIME_ZONE = ZoneInfo("Australia/Hobart")
+
+# Every discount program and a location enabled, so the engine does all of its work
+ENGINE_OPTIONS = {
+    const.CONF_FUEL_TYPES: list(const.FUEL_TYPE_ORDER),
+    const.CONF_ENABLE_WOOLWORTHS_DISCOUNT: True,
+    const.CONF_WOOLWORTHS_DISCOUNT_AMOUNT: 4,
+    const.CONF_ENABLE_COLES_DISCOUNT: True,
+    const.CONF_COLES_DISCOUNT_AMOUNT: 4,
+    const.CONF_ENABLE_RACT_DISCOUNT: True,
+    const.CONF_RACT_DISCOUNT_AMOUNT: 5,
+    const.CONF_ENABLE_UNITED_DISCOUNT: True,
+    const.CONF_UNITED_DISCOUNT_AMOUNT: 6,
+    const.CONF_LOCATION_ENTITY: "device_tracker.benchmark",
+    const.CONF_RANGE: 10,
+    const.CONF_EXCLUDED_DISTRIBUTORS: ["Mobil"],
+    const.CONF_EXCLUDED_OPERATORS: ["7-Eleven"],
+}
+HOBART = (-42.8821, 147.3272)
+LAUNCESTON = (-41.4332, 147.1441)
+
+
+def measure(func: Callable[[], Any], repeat: int) -> dict[str, float]:
+    """Run a function `repeat` times and return its min, median and max duration in ms."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return {
+        "min_ms": round(min(durations), 3),
+        "median_ms": round(statistics.median(durations), 3),
+        "max_ms": round(max(durations), 3),
+    }
+
+
+def run_scale(station_count: int, repeat: int, seed: int) -> dict[str, Any]:
+    """Benchmark every stage at one scale level."""
+    dataset = generate_dataset(station_count, seed=seed)
+    prices = dataset["prices"]
+    next_prices = mutate_prices(prices, fraction=0.05, seed=seed + 1)
+    additional_data = dataset["additional_data"]
+    trading_hours = dataset["trading_hours"]
+    fuel_types = const.FUEL_TYPE_ORDER
+    stations = [str(s["code"]) for s in prices["stations"]]
+    raw_prices = orjson.dumps(prices) if orjson else json.dumps(prices).encode()
+    json_loads = orjson.loads if orjson else json.loads
+
+    def new_engine() -> Any:
+        engine = core.FuelPriceEngine(ENGINE_OPTIONS, TIME_ZONE)
+        engine.set_location(*HOBART)
+        return engine
+
+    def snapshot_build() -> None:
+        engine = new_engine()
+        engine.sync(prices, additional_data, trading_hours)
+
+    def diff() -> None:
+        snapshot.diff_prices(snapshot.index_prices(prices), snapshot.index_prices(next_prices))
+
+    engine = new_engine()
+    engine.sync(prices, additional_data, trading_hours)
+
+    def entity_update() -> None:
+        for code in stations:
+            for fuel in fuel_types:
+                engine.station_result(code, fuel)
+
+    def summary_ranking() -> None:
+        # A new snapshot drops the cached station lists, as a price refresh does
+        engine.sync(dict(prices), additional_data, trading_hours)
+        for fuel in fuel_types:
+            engine.summary(fuel)
+            engine.summary(fuel, filtered=True)
+
+    locations = [HOBART, LAUNCESTON]
+
+    def location_recalculation() -> None:
+        locations.reverse()
+        engine.set_location(*locations[0])
+        for code in stations:
+            engine.distance_attributes(code)
+        for fuel in fuel_types:
+            engine.summary(fuel)
+
+    def station_search_index() -> None:
+        search.StationSearchIndex.from_snapshot(prices)
+
+    stages = {
+        "json_decode": measure(lambda: json_loads(raw_prices), repeat),
+        "snapshot_build": measure(snapshot_build, repeat),
+        "diff": measure(diff, repeat),
+        "entity_update": measure(entity_update, repeat),
+        "summary_ranking": measure(summary_ranking, repeat),
+        "location_recalculation": measure(location_recalculation, repeat),
+        "station_search_index": measure(station_search_index, repeat),
+    }
+    entity_count = len(stations) * len(fuel_types)
+    stages["entity_update"]["per_entity_us"] = round(
+        stages["entity_update"]["median_ms"] * 1000 / entity_count, 3
+    )
+
+    tracemalloc.start()
+    traced_engine = new_engine()
+    traced_engine.sync(prices, additional_data, trading_hours)
+    for fuel in fuel_types:
+        traced_engine.summary(fuel)
+    engine_current, engine_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "stations": station_count,
+        "fuel_types": len(fuel_types),
+        "prices": len(prices["prices"]),
+        "entities": entity_count,
+        "payload_bytes": len(raw_prices),
+        "stages": stages,
+        "memory": {
+            "snapshot_bytes": metrics.deep_sizeof(prices),
+            "engine_bytes": engine_current,
+            "engine_peak_bytes": engine_peak,
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks and print or write the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, help="station counts to benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per stage")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic data")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "json_decoder": "orjson" if orjson else "json",
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "results": [],
+    }
+    for station_count in args.scales:
+        print(f"Benchmarking {station_count} stations...", file=sys.stderr)
+        results["results"].append(run_scale(station_count, args.repeat, args.seed))
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""Synthetic upstream payloads for benchmarks and load tests."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import random
+from typing import Any
+
+from . import load_integration_module
+
+const = load_integration_module("const")
+trading_hours = load_integration_module("trading_hours")
+
+BRANDS = ["Ampol", "BP", "Caltex", "Coles Express", "Liberty", "Mobil", "Shell", "United", "Tas Petroleum", "Independent"]
+SUBURBS = ["HOBART", "LAUNCESTON", "DEVONPORT", "BURNIE", "KINGSTON", "SORELL", "ULVERSTONE", "NEW NORFOLK", "GEORGE TOWN", "SMITHTON"]
+DISTRIBUTORS = ["Ampol", "BP", "Viva Energy", "Mobil", "United", "Tas Petroleum"]
+OPERATORS = ["Coles Express", "EG", "Reddy Express", "Independent", "Woolworths", "7-Eleven"]
+DAYS = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY", "SUNDAY"]
+
+# Base price in cents and the chance that a station sells each fuel
+FUEL_PROFILE = {
+    "U91": (189.9, 1.0),
+    "E10": (187.9, 0.6),
+    "P95": (205.9, 0.8),
+    "P98": (214.9, 0.8),
+    "E85": (175.9, 0.05),
+    "DL": (199.9, 0.9),
+    "PDL": (209.9, 0.3),
+    "B20": (201.9, 0.05),
+    "LPG": (109.9, 0.3),
+}
+
+# Stations are spread over Tasmania, growing the area with the station count
+TAS_BOUNDS = (-43.6, 144.6, -40.7, 148.4)
+
+
+def _bounds(station_count: int) -> tuple[float, float, float, float]:
+    """Return a bounding box whose area grows with the station count."""
+    south, west, north, east = TAS_BOUNDS
+    scale = max(1.0, (station_count / 150) ** 0.5)
+    centre_lat, centre_lon = (south + north) / 2, (west + east) / 2
+    half_lat, half_lon = (north - south) / 2 * scale, (east - west) / 2 * scale
+    return (
+        max(centre_lat - half_lat, -44.0),
+        centre_lon - half_lon,
+        min(centre_lat + half_lat, -10.0),
+        centre_lon + half_lon,
+    )
+
+
+def _fuel_types(rng: random.Random) -> list[str]:
+    """Pick the fuels a station sells."""
+    return [fuel for fuel, (_, chance) in FUEL_PROFILE.items() if rng.random() < chance]
+
+
+def _trading_hours(rng: random.Random) -> list[dict]:
+    """Build the TAS FuelCheck 'tradinghours' list for one station."""
+    if rng.random() < 0.25:
+        return [{"Day": day, "IsOpen24Hours": True, "IsClose": False} for day in DAYS]
+    opens = rng.choice(["06:00", "06:30", "07:00"])
+    closes = rng.choice(["20:00", "21:00", "22:00"])
+    return [
+        {
+            "Day": day,
+            "IsOpen24Hours": False,
+            "IsClose": day == "SUNDAY" and rng.random() < 0.1,
+            "StartTime": opens,
+            "EndTime": closes,
+        }
+        for day in DAYS
+    ]
+
+
+def generate_dataset(station_count: int, seed: int = 0, now: datetime | None = None) -> dict[str, Any]:
+    """
+    Generate a consistent set of synthetic upstream payloads.
+
+    The result holds the raw `prices` payload of FuelPriceCheck v2, the raw
+    per-fuel `trading_hours_by_fuel` responses of the TAS FuelCheck website,
+    the GitHub text files (`github_lists` and `github_directories`), plus the
+    `trading_hours` and `additional_data` mappings `TasFuelAPI` builds from them.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    south, west, north, east = _bounds(station_count)
+
+    stations = []
+    prices = []
+    raw_hours: dict[str, list[dict]] = {}
+    fuels_by_station: dict[str, list[str]] = {}
+    for index in range(station_count):
+        code = str(1000 + index)
+        brand = rng.choice(BRANDS)
+        suburb = rng.choice(SUBURBS)
+        stations.append({
+            "brandid": str(rng.randint(1, 50)),
+            "stationid": f"{code}-{index}",
+            "brand": brand,
+            "code": code,
+            "name": f"{brand} {suburb.title()} {index}",
+            "address": f"{rng.randint(1, 400)} Main Road, {suburb} TAS 7{rng.randint(0, 999):03d}",
+            "location": {
+                "latitude": round(rng.uniform(south, north), 6),
+                "longitude": round(rng.uniform(west, east), 6),
+            },
+            "state": "TAS",
+        })
+        fuels_by_station[code] = _fuel_types(rng)
+        for fuel in fuels_by_station[code]:
+            base, _ = FUEL_PROFILE[fuel]
+            updated = now - timedelta(minutes=rng.randint(0, 72 * 60))
+            prices.append({
+                "stationcode": code,
+                "fueltype": fuel,
+                "price": round(base + rng.uniform(-12, 12), 1),
+                "lastupdated": updated.strftime("%d/%m/%Y %H:%M:%S"),
+                "state": "TAS",
+            })
+        raw_hours[code] = _trading_hours(rng)
+
+    trading_hours_by_fuel = {
+        fuel: [
+            {"ServiceStationID": code, "tradinghours": raw_hours[code]}
+            for code, fuels in fuels_by_station.items()
+            if fuel in fuels
+        ]
+        for fuel in const.TRADING_HOURS_FUEL_TYPES
+    }
+
+    codes = list(fuels_by_station)
+    github_lists = {
+        provider: "\n".join(rng.sample(codes, k=len(codes) // 10)) + "\n"
+        for provider in ("coles", "woolworths", "ract", "united", "tyre_inflation")
+    }
+    github_directories: dict[str, dict[str, str]] = {"distributors": {}, "operators": {}}
+    for key, names in (("distributors", DISTRIBUTORS), ("operators", OPERATORS)):
+        assigned: dict[str, list[str]] = {name: [] for name in names}
+        for code in codes:
+            assigned[rng.choice(names)].append(f"{code} # synthetic")
+        github_directories[key] = {name: "\n".join(lines) + "\n" for name, lines in assigned.items()}
+
+    additional_data: dict[str, Any] = {
+        provider: text.split() for provider, text in github_lists.items()
+    }
+    for key, files in github_directories.items():
+        additional_data[key] = {
+            line.split("#", 1)[0].strip(): name
+            for name, text in files.items()
+            for line in text.splitlines()
+            if line.split("#", 1)[0].strip()
+        }
+
+    return {
+        "prices": {"stations": stations, "prices": prices},
+        "trading_hours_by_fuel": trading_hours_by_fuel,
+        "trading_hours": {
+            code: trading_hours.format_trading_hours(hours) for code, hours in raw_hours.items()
+        },
+        "github_lists": github_lists,
+        "github_directories": github_directories,
+        "additional_data": additional_data,
+    }
+
+
+def mutate_prices(prices: dict, fraction: float, seed: int = 1) -> dict:
+    """Return a copy of a prices payload with a fraction of the prices changed, as a later poll would see."""
+    rng = random.Random(seed)
+    changed = []
+    for price in prices["prices"]:
+        if rng.random() < fraction:
+            price = {**price, "price": round(price["price"] + rng.choice([-2.0, -1.0, 1.0, 3.0, 12.0]), 1)}
+        changed.append(price)
+    return {"stations": prices["stations"], "prices": changed}
@@ -0,0 +1,136 @@
+"""
+End-to-end load test of the API client against the local mock upstream.
+
+    python -m benchmarks.load_test --stations 1000 --clients 20 --rounds 5 --latency-ms 50 --error-rate 0.05
+
+Starts the mock server in-process, then runs `--clients` independent
+`TasFuelAPI` instances concurrently. Each one performs `--rounds` full
+refresh cycles (prices, trading hours and additional data) through the real
+fetch pipeline, including token handling, retries, circuit breakers and stale
+fallbacks. Latencies and outcomes are written as JSON.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Any
+
+from aiohttp import ClientSession
+
+from . import load_integration_module
+from .mock_server import RewritingSession, add_settings_arguments, settings_from_arguments, start_mock_server
+
+api = load_integration_module("api")
+metrics = load_integration_module("metrics")
+snapshot = load_integration_module("snapshot")
+
+OPERATIONS = ("prices", "trading_hours", "additional_data")
+
+
+def latency_summary(durations: list[float]) -> dict[str, float]:
+    """Return percentiles of a list of durations in ms."""
+    if not durations:
+        return {}
+    ordered = sorted(durations)
+    return {
+        "count": len(ordered),
+        **{f"p{pct}_ms": round(metrics.percentile(ordered, pct), 1) for pct in metrics.PERCENTILES},
+        "max_ms": round(ordered[-1], 1),
+    }
+
+
+async def run_client(session: RewritingSession, rounds: int, results: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """Run refresh cycles with one API client and return its final upstream state."""
+    client = api.TasFuelAPI("load-test-key", "load-test-secret", session)
+    prices = None
+    for _ in range(rounds):
+        for operation in OPERATIONS:
+            outcome = results[operation]
+            start = time.perf_counter()
+            try:
+                if operation == "prices":
+                    prices = await client.fetch_prices()
+                elif operation == "trading_hours":
+                    await client.fetch_trading_hours(snapshot.station_fuels(prices))
+                else:
+                    await client.fetch_additional_data_lists()
+            except Exception as err:  # Every failure is an outcome to report
+                outcome["errors"][type(err).__name__] = outcome["errors"].get(type(err).__name__, 0) + 1
+            else:
+                key = "stale" if client.is_stale(operation) else "ok"
+                outcome[key] += 1
+            outcome["durations"].append((time.perf_counter() - start) * 1000)
+
+    return {
+        "circuit_breakers": client.circuit_states,
+        "compressed_bytes": client.total_compressed_bytes,
+        "requests": sum(stats.get("requests", 0) for stats in client.fetch_stats.values()),
+    }
+
+
+async def run_load_test(args: argparse.Namespace) -> dict[str, Any]:
+    """Start the mock server, run every client and collect the results."""
+    dataset, settings = settings_from_arguments(args)
+    upstream, runner, base_url = await start_mock_server(dataset, settings)
+    results = {operation: {"ok": 0, "stale": 0, "errors": {}, "durations": []} for operation in OPERATIONS}
+    try:
+        async with ClientSession() as session:
+            rewriting_session = RewritingSession(session, base_url)
+            start = time.perf_counter()
+            clients = await asyncio.gather(
+                *(run_client(rewriting_session, args.rounds, results) for _ in range(args.clients))
+            )
+            wall_ms = (time.perf_counter() - start) * 1000
+    finally:
+        await runner.cleanup()
+
+    open_breakers: dict[str, int] = {}
+    for client in clients:
+        for upstream_name, state in client["circuit_breakers"].items():
+            if state != "closed":
+                open_breakers[upstream_name] = open_breakers.get(upstream_name, 0) + 1
+
+    return {
+        "settings": {**settings._asdict(), "stations": len(dataset["prices"]["stations"])},
+        "clients": args.clients,
+        "rounds": args.rounds,
+        "wall_ms": round(wall_ms, 1),
+        "operations": {
+            operation: {
+                "ok": outcome["ok"],
+                "stale": outcome["stale"],
+                "errors": outcome["errors"],
+                "latency": latency_summary(outcome["durations"]),
+            }
+            for operation, outcome in results.items()
+        },
+        "requests": sum(client["requests"] for client in clients),
+        "compressed_bytes": sum(client["compressed_bytes"] for client in clients),
+        "clients_with_open_breakers": open_breakers,
+        "server_responses": upstream.stats,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the load test and print or write the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_settings_arguments(parser)
+    parser.add_argument("--clients", type=int, default=10, help="concurrent API clients")
+    parser.add_argument("--rounds", type=int, default=3, help="refresh cycles per client")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    output = json.dumps(asyncio.run(run_load_test(args)), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
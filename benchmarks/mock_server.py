@@ -0,0 +1,277 @@
+"""
+Local stand-in for every upstream the integration talks to.
+
+Serves OneGov OAuth, FuelPriceCheck v2 prices, the TAS FuelCheck website and
+the GitHub contents/raw endpoints from synthetic or recorded fixtures, with
+configurable latency, error rate, token expiry and 304 responses.
+
+    python -m benchmarks.mock_server --stations 1000 --latency-ms 80 --error-rate 0.05
+
+Point `TasFuelAPI` at it with `RewritingSession`, which sends requests for the
+real upstream hosts to the mock server instead.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import secrets
+import time
+from typing import Any, NamedTuple
+from urllib.parse import urlsplit
+
+from aiohttp import ClientSession, web
+
+from . import load_integration_module
+from .fixtures import generate_dataset
+
+const = load_integration_module("const")
+
+UPSTREAM_HOSTS = (
+    "https://api.onegov.nsw.gov.au",
+    "https://www.fuelcheck.tas.gov.au",
+    "https://api.github.com",
+    "https://raw.githubusercontent.com",
+)
+
+# Raw GitHub file of each discount and amenity list
+GITHUB_LIST_PATHS = {
+    provider: urlsplit(url).path
+    for provider, url in (
+        ("coles", const.COLES_DISCOUNT_URL),
+        ("woolworths", const.WOOLWORTHS_DISCOUNT_URL),
+        ("ract", const.RACT_DISCOUNT_URL),
+        ("united", const.UNITED_DISCOUNT_URL),
+        ("tyre_inflation", const.TYRE_INFLATION_URL),
+    )
+}
+GITHUB_DIRECTORY_PATHS = {
+    "distributors": urlsplit(const.DISTRIBUTOR_URL).path,
+    "operators": urlsplit(const.OPERATORS_URL).path,
+}
+RAW_BASE_PATH = urlsplit(const.BASE_DATA_URL).path
+
+
+class MockSettings(NamedTuple):
+    """How the mock upstream behaves."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    # Chance of answering any request with a 503
+    error_rate: float = 0.0
+    # Seconds an issued token stays valid on the server, whatever `expires_in` says
+    token_ttl: float = 43200.0
+    # Chance of answering a GitHub request with a 304, even without a matching If-None-Match
+    not_modified_rate: float = 0.0
+    seed: int | None = None
+
+
+class MockUpstream:
+    """aiohttp application serving the upstream endpoints from a fixture dataset."""
+
+    def __init__(self, dataset: dict[str, Any], settings: MockSettings) -> None:
+        """Initialize the mock from a dataset shaped like `fixtures.generate_dataset` output."""
+        self._dataset = dataset
+        self._settings = settings
+        self._rng = random.Random(settings.seed)
+        self._tokens: dict[str, float] = {}
+        self._encoded: dict[str, bytes] = {}
+        self.stats: dict[str, dict[int, int]] = {}
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.router.add_get(urlsplit(const.OAUTH_URL).path, self._token)
+        self.app.router.add_post(urlsplit(const.OAUTH_URL).path, self._token)
+        self.app.router.add_get(urlsplit(const.API_BASE_URL).path, self._prices)
+        self.app.router.add_get(urlsplit(const.TAS_FUELCHECK_BY_LOCATION_URL).path, self._trading_hours)
+        for key, path in GITHUB_DIRECTORY_PATHS.items():
+            self.app.router.add_get(path, self._github_directory(key))
+        self.app.router.add_get(RAW_BASE_PATH + "{path:.+}", self._github_raw)
+        self.app.router.add_get("/_stats", self._stats)
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        """Add latency, inject errors and count responses."""
+        settings = self._settings
+        if request.path != "/_stats":
+            delay = settings.latency_ms + self._rng.uniform(0, settings.jitter_ms)
+            if delay:
+                await asyncio.sleep(delay / 1000)
+            if self._rng.random() < settings.error_rate:
+                response = web.Response(status=503, text="Service Unavailable (injected)")
+                self._count(request, response)
+                return response
+
+        response = await handler(request)
+        self._count(request, response)
+        return response
+
+    def _count(self, request: web.Request, response: web.StreamResponse) -> None:
+        """Count a response by endpoint and status."""
+        endpoint = request.match_info.route.resource.canonical if request.match_info.route.resource else request.path
+        per_status = self.stats.setdefault(endpoint, {})
+        per_status[response.status] = per_status.get(response.status, 0) + 1
+
+    def _json(self, request: web.Request, data: Any, cache_key: str | None = None) -> web.Response:
+        """Return a compressible JSON response with an ETag, encoding fixture data only once."""
+        if cache_key is None:
+            body = json.dumps(data).encode()
+        elif (body := self._encoded.get(cache_key)) is None:
+            body = self._encoded[cache_key] = json.dumps(data).encode()
+        return self._body(request, body, "application/json")
+
+    def _body(self, request: web.Request, body: bytes, content_type: str, github: bool = False) -> web.Response:
+        """Return a body with an ETag, or a 304 when the client already has it."""
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag or (
+            github and self._rng.random() < self._settings.not_modified_rate
+        ):
+            return web.Response(status=304, headers={"ETag": etag})
+        response = web.Response(body=body, content_type=content_type, headers={"ETag": etag})
+        response.enable_compression()
+        return response
+
+    async def _token(self, request: web.Request) -> web.Response:
+        """Issue an access token for any client credentials sent with basic auth."""
+        authorization = request.headers.get("Authorization", "")
+        try:
+            credentials = base64.b64decode(authorization.removeprefix("Basic "), validate=True)
+        except ValueError:
+            credentials = b""
+        if not authorization.startswith("Basic ") or b":" not in credentials:
+            return web.json_response({"error": "invalid_client"}, status=401)
+        token = secrets.token_urlsafe(24)
+        self._tokens[token] = time.monotonic() + self._settings.token_ttl
+        return self._json(request, {"access_token": token, "expires_in": "43199", "token_type": "BearerToken"})
+
+    async def _prices(self, request: web.Request) -> web.Response:
+        """Return the price snapshot to requests with a live token."""
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        expires = self._tokens.get(token)
+        if expires is None or expires < time.monotonic():
+            self._tokens.pop(token, None)
+            return web.json_response({"errorDetails": {"message": "Invalid or expired access token"}}, status=401)
+        return self._json(request, self._dataset["prices"], "prices")
+
+    async def _trading_hours(self, request: web.Request) -> web.Response:
+        """Return the stations selling the requested fuel with their trading hours."""
+        fuel = request.query.get("fuelType")
+        return self._json(request, self._dataset["trading_hours_by_fuel"].get(fuel, []), f"trading_hours_{fuel}")
+
+    def _github_directory(self, key: str):
+        """Return a handler listing the files of a GitHub directory."""
+        async def handler(request: web.Request) -> web.Response:
+            directory = GITHUB_DIRECTORY_PATHS[key].rsplit("/", 1)[-1]
+            listing = [
+                {
+                    "type": "file",
+                    "name": f"{name}.txt",
+                    "download_url": f"{const.BASE_DATA_URL}{directory}/{name}.txt",
+                }
+                for name in self._dataset["github_directories"][key]
+            ]
+            body = json.dumps(listing).encode()
+            return self._body(request, body, "application/json", github=True)
+        return handler
+
+    async def _github_raw(self, request: web.Request) -> web.Response:
+        """Return a raw GitHub list file."""
+        path = request.path
+        for provider, list_path in GITHUB_LIST_PATHS.items():
+            if path == list_path:
+                return self._body(request, self._dataset["github_lists"][provider].encode(), "text/plain", github=True)
+
+        directory, _, filename = request.match_info["path"].rpartition("/")
+        for key, directory_path in GITHUB_DIRECTORY_PATHS.items():
+            if directory_path.endswith(f"/{directory}"):
+                text = self._dataset["github_directories"][key].get(filename.removesuffix(".txt"))
+                if text is not None:
+                    return self._body(request, text.encode(), "text/plain", github=True)
+        raise web.HTTPNotFound()
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        """Return the response counts per endpoint and status."""
+        return web.json_response(self.stats)
+
+
+class RewritingSession:
+    """
+    Wrap a ClientSession so requests for the real upstream hosts go to the mock server.
+    It only provides the `get` method `TasFuelAPI` uses.
+    """
+
+    def __init__(self, session: ClientSession, base_url: str) -> None:
+        """Initialize the wrapper."""
+        self._session = session
+        self._base_url = base_url.rstrip("/")
+
+    def get(self, url: str, **kwargs: Any):
+        """Send a GET request, rewriting upstream hosts to the mock server."""
+        for host in UPSTREAM_HOSTS:
+            if url.startswith(host):
+                url = self._base_url + url[len(host):]
+                break
+        return self._session.get(url, **kwargs)
+
+
+async def start_mock_server(
+    dataset: dict[str, Any],
+    settings: MockSettings,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> tuple[MockUpstream, web.AppRunner, str]:
+    """Start the mock server and return it, its runner and its base URL."""
+    upstream = MockUpstream(dataset, settings)
+    runner = web.AppRunner(upstream.app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    bound_port = runner.addresses[0][1]
+    return upstream, runner, f"http://{host}:{bound_port}"
+
+
+def add_settings_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the fixture and behaviour arguments shared by the mock server and the load test."""
+    parser.add_argument("--stations", type=int, default=150, help="synthetic station count")
+    parser.add_argument("--fixtures", help="JSON file with a recorded dataset to serve instead of synthetic data")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra delay of up to this much")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 503")
+    parser.add_argument("--token-ttl", type=float, default=43200.0, help="seconds before issued tokens are rejected with a 401")
+    parser.add_argument("--not-modified-rate", type=float, default=0.0, help="fraction of GitHub requests answered with a 304")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic data and injected behaviour")
+
+
+def settings_from_arguments(args: argparse.Namespace) -> tuple[dict[str, Any], MockSettings]:
+    """Build the dataset and mock settings from parsed arguments."""
+    if args.fixtures:
+        with open(args.fixtures, encoding="utf-8") as file:
+            dataset = json.load(file)
+    else:
+        dataset = generate_dataset(args.stations, seed=args.seed)
+    settings = MockSettings(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        token_ttl=args.token_ttl,
+        not_modified_rate=args.not_modified_rate,
+        seed=args.seed,
+    )
+    return dataset, settings
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the mock server until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_settings_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args(argv)
+
+    dataset, settings = settings_from_arguments(args)
+    web.run_app(MockUpstream(dataset, settings).app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
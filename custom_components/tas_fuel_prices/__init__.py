@@ -2,16 +2,31 @@
 from __future__ import annotations
 
 import random
+from datetime import timedelta
+from typing import Any
+from zoneinfo import ZoneInfo
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, Event
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.helpers.event import async_track_state_change_event, async_track_time_change, async_call_later
 from homeassistant.helpers.dispatcher import dispatcher_send
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+from homeassistant.util import dt as dt_util
 
+from .alerts import PriceAlertIndex
+from .analytics import PriceCycleAnalytics
 from .api import TasFuelAPI
+from .coordinator import TasFuelDataUpdateCoordinator
+from .core import FuelPriceEngine
+from .history import HistoryJournal, PriceHistory
+from .polling import AdaptivePollingController
+from .recording import PayloadArchive
+from .statistics import StatisticsImporter
+from .services import async_setup_services, async_track_alert_locations, async_unload_services
+from .snapshot import PriceChange, diff_prices, index_prices, station_fuels
 from .const import (
     DOMAIN,
     LOGGER,
@@ -21,6 +36,27 @@ from .const import (
     CONF_API_SECRET,
     CONF_DEVICE_NAME,
     CONF_LOCATION_ENTITY,
+    CONF_EXTRA_LOCATION_ENTITIES,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    CONF_RECORD_PAYLOADS,
+    CONF_STATES,
+    DEFAULT_STATES,
+    TRADING_HOURS_STATES,
+    RECORDING_DIRECTORY,
+    RECORDING_MAX_SEGMENT_BYTES,
+    RECORDING_MAX_SEGMENTS,
+    STORAGE_VERSION,
+    STORAGE_SAVE_DELAY,
+    HISTORY_CAPACITY,
+    HISTORY_COMPACT_SLACK,
+    STATISTICS_IMPORT_MINUTE,
+    CONF_FUEL_TYPES,
+    CYCLE_REGIONS,
+    EVENT_PRICE_ALERT,
+    EVENT_PRICE_CHANGES,
 )
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BUTTON, Platform.SELECT]
@@ -47,30 +83,147 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         session,
     )
 
+    # Adaptive polling learns when prices change and tunes the price poll interval
+    polling_store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.polling")
+    adaptive_polling = AdaptivePollingController(
+        SCAN_INTERVAL,
+        timedelta(minutes=entry.options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL)),
+        timedelta(minutes=entry.options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)),
+    )
+    adaptive_polling.load(await polling_store.async_load())
+
+    # Rolling archive of fetched payloads, written only while recording is enabled
+    archive = PayloadArchive(
+        hass.config.path(RECORDING_DIRECTORY, entry.entry_id),
+        RECORDING_MAX_SEGMENT_BYTES,
+        RECORDING_MAX_SEGMENTS,
+    )
+    if entry.options.get(CONF_RECORD_PAYLOADS):
+        def record_payload(key: str, data: Any) -> None:
+            """Archive a fetched payload without blocking the event loop."""
+            hass.async_add_executor_job(archive.append, key, data, dt_util.utcnow())
+
+        api.recorder = record_payload
+
+    # Price changes seen by this entry, persisted by appending each refresh's changes
+    price_history = PriceHistory(HISTORY_CAPACITY)
+    history_journal = HistoryJournal(
+        hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry.entry_id}.history.jsonl"),
+        HISTORY_COMPACT_SLACK,
+    )
+    await hass.async_add_executor_job(history_journal.load, price_history)
+
+    # Price cycle state per region and fuel, updated from each diff rather than recomputed from history
+    cycles_store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.price_cycles")
+    price_cycles = PriceCycleAnalytics(CYCLE_REGIONS, entry.options.get(CONF_FUEL_TYPES, ["U91"]))
+    price_cycles.load(await cycles_store.async_load())
+
+    # Price alerts registered through the alert services
+    alerts_store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.alerts")
+    price_alerts = PriceAlertIndex()
+    price_alerts.load(await alerts_store.async_load())
+
+    async def async_update_prices() -> dict:
+        """Fetch prices and reschedule the next poll from the observed changes."""
+        data = await api.fetch_prices(entry.options.get(CONF_STATES, DEFAULT_STATES))
+        if api.is_stale("prices"):
+            # Serving the previous snapshot, there is nothing new to learn from
+            return data
+        with api.metrics.stage("prices", "index") as counts:
+            new_index = index_prices(data)
+            changes = diff_prices(index_prices(price_coordinator.data), new_index)
+            counts["records"] = len(new_index)
+        if api.replaying:
+            # Replayed payloads must not teach the polling model, move the schedule or enter the history
+            return data
+
+        now = dt_util.now()
+        if rows := price_history.record_changes(now.timestamp(), changes):
+            # One job, so a compaction cannot land before or after the append it replaces
+            snapshot = list(price_history.rows()) if history_journal.needs_compaction(len(price_history)) else None
+            hass.async_add_executor_job(history_journal.save, rows, snapshot)
+        with api.metrics.stage("prices", "cycles"):
+            if restorations := price_cycles.update(now.timestamp(), changes, data.get("stations", [])):
+                LOGGER.info("Price restoration detected in %s", ", ".join(restorations))
+                cycles_store.async_delay_save(price_cycles.as_dict, STORAGE_SAVE_DELAY)
+        with api.metrics.stage("prices", "alerts"):
+            crossings = price_alerts.evaluate(changes, new_index, data.get("stations", []))
+        # The first refresh runs before the data bundle exists and only learns the snapshot
+        if price_coordinator.data is not None:
+            engine: FuelPriceEngine = data_bundle["engine"]
+            if changes:
+                hass.bus.async_fire(EVENT_PRICE_CHANGES, price_changes_event_data(entry, engine, changes))
+            for crossing in crossings:
+                alert = crossing.alert
+                hass.bus.async_fire(EVENT_PRICE_ALERT, {
+                    "config_entry_id": entry.entry_id,
+                    "alert_id": alert.alert_id,
+                    "name": alert.name,
+                    "fuel_type": alert.fuel_type,
+                    "station_id": crossing.station_code,
+                    "price": engine.format_price(crossing.new_price),
+                    "previous_price": (
+                        engine.format_price(crossing.old_price) if crossing.old_price is not None else None
+                    ),
+                    "threshold": engine.format_price(alert.threshold),
+                    "direction": alert.direction,
+                })
+
+        if price_coordinator.data is not None:
+            # Without a previous snapshot every price looks changed, which says nothing about the change rate
+            adaptive_polling.record_poll(now, len(changes))
+            polling_store.async_delay_save(adaptive_polling.as_dict, STORAGE_SAVE_DELAY)
+        price_coordinator.update_interval = adaptive_polling.next_interval(now)
+        LOGGER.debug(
+            "%s prices changed since the last poll, next poll in %s",
+            len(changes),
+            price_coordinator.update_interval,
+        )
+        return data
+
     # Coordinator for fetching fuel prices from the API
-    price_coordinator = DataUpdateCoordinator(
+    price_coordinator = TasFuelDataUpdateCoordinator(
         hass,
         LOGGER,
+        metrics=api.metrics,
+        metrics_group="prices",
         name=f"{DOMAIN}_prices",
-        update_method=api.fetch_prices,
+        update_method=async_update_prices,
         update_interval=SCAN_INTERVAL,
     )
 
     # Coordinator for fetching discount/amenity station lists from GitHub
-    additional_data_coordinator = DataUpdateCoordinator(
+    additional_data_coordinator = TasFuelDataUpdateCoordinator(
         hass,
         LOGGER,
+        metrics=api.metrics,
+        metrics_group="additional_data",
         name=f"{DOMAIN}_additional_data",
         update_method=api.fetch_additional_data_lists,
         update_interval=ADDITIONAL_DATA_UPDATE_INTERVAL,
     )
 
+    # Remember which trading hours queries cover which stations between runs
+    trading_hours_store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.trading_hours_plan")
+    api.trading_hours_planner.load(await trading_hours_store.async_load())
+
+    async def async_update_trading_hours() -> dict:
+        """Fetch trading hours for the stations in the current price snapshot."""
+        with api.metrics.stage("trading_hours", "index") as counts:
+            fuels_by_station = station_fuels(price_coordinator.data, TRADING_HOURS_STATES)
+            counts["records"] = len(fuels_by_station)
+        data = await api.fetch_trading_hours(fuels_by_station)
+        trading_hours_store.async_delay_save(api.trading_hours_planner.as_dict, STORAGE_SAVE_DELAY)
+        return data
+
     # Coordinator for fetching trading hours (Custom scheduled below)
-    trading_hours_coordinator = DataUpdateCoordinator(
+    trading_hours_coordinator = TasFuelDataUpdateCoordinator(
         hass,
         LOGGER,
+        metrics=api.metrics,
+        metrics_group="trading_hours",
         name=f"{DOMAIN}_trading_hours",
-        update_method=api.fetch_trading_hours,
+        update_method=async_update_trading_hours,
     )
 
     # Fetch initial data
@@ -83,13 +236,50 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "additional_data_coordinator": additional_data_coordinator,
         "trading_hours_coordinator": trading_hours_coordinator,
         "api": api,
+        "engine": FuelPriceEngine(entry.options, ZoneInfo(hass.config.time_zone)),
+        "adaptive_polling": adaptive_polling,
+        "archive": archive,
+        "price_history": price_history,
+        "price_cycles": price_cycles,
+        "price_alerts": price_alerts,
+        "alerts_store": alerts_store,
+        "alert_location_listener_cancel": None,
+        "replay_task": None,
+        "station_index": None, # (snapshot, StationSearchIndex) built on demand by the options flow
         "location_listener_cancel": None, # To hold the listener cancel callback
         "trading_hours_schedule_cancel": None,
         "trading_hours_timer_cancel": None,
+        "price_sensor_stations": None, # Set by the sensor platform when limited by the entity radius
+        "statistics_importer": None,
+        "statistics_import_cancel": None,
     }
     hass.data[DOMAIN][entry.entry_id] = data_bundle
+    update_engine_location(hass, entry)
+    async_track_alert_locations(hass, data_bundle)
+
+    # Hourly price statistics from the history, so graphs need no per-sensor state history
+    if "recorder" in hass.config.components:
+        statistics_store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.statistics")
+        statistics_importer = StatisticsImporter(
+            hass,
+            price_history,
+            data_bundle["engine"],
+            entry.options.get(CONF_FUEL_TYPES, ["U91"]),
+            lambda: data_bundle["price_sensor_stations"],
+        )
+        statistics_importer.load(await statistics_store.async_load())
+
+        async def import_statistics(now) -> None:
+            await statistics_importer.async_import(now)
+            statistics_store.async_delay_save(statistics_importer.as_dict, STORAGE_SAVE_DELAY)
+
+        data_bundle["statistics_importer"] = statistics_importer
+        data_bundle["statistics_import_cancel"] = async_track_time_change(
+            hass, import_statistics, minute=STATISTICS_IMPORT_MINUTE, second=0
+        )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    await async_setup_services(hass)
     
     # Set up the location update listener
     async_setup_location_listener(hass, entry)
@@ -113,28 +303,69 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     return True
 
+def price_changes_event_data(entry: ConfigEntry, engine: FuelPriceEngine, changes: list[PriceChange]) -> dict:
+    """Return the data of the event fired for the price changes of one refresh."""
+    rows = []
+    for change in changes:
+        row = {
+            "station_id": change.station_code,
+            "fuel_type": change.fuel_type,
+            "old_price": engine.format_price(change.old_price) if change.old_price is not None else None,
+            "new_price": engine.format_price(change.new_price) if change.new_price is not None else None,
+        }
+        if (distance := engine.distance(change.station_code)) is not None:
+            row["distance"] = round(distance, 2)
+        rows.append(row)
+    return {"config_entry_id": entry.entry_id, "changes": rows}
+
+
+def entity_coordinates(hass: HomeAssistant, entity_id: str | None) -> tuple[float | None, float | None]:
+    """Return the current coordinates of a location entity, (None, None) when they are unknown."""
+    location_state = hass.states.get(entity_id) if entity_id else None
+    if location_state and 'latitude' in location_state.attributes and 'longitude' in location_state.attributes:
+        return location_state.attributes['latitude'], location_state.attributes['longitude']
+    return None, None
+
+def update_engine_location(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Point the price engine at the current coordinates of every location entity."""
+    engine: FuelPriceEngine = hass.data[DOMAIN][entry.entry_id]["engine"]
+    engine.set_location(*entity_coordinates(hass, entry.options.get(CONF_LOCATION_ENTITY)))
+    for entity_id in entry.options.get(CONF_EXTRA_LOCATION_ENTITIES, []):
+        engine.set_location(*entity_coordinates(hass, entity_id), origin=entity_id)
+
 def async_setup_location_listener(hass: HomeAssistant, entry: ConfigEntry):
-    """Set up a listener to recalculate distance when the location entity changes."""
+    """Set up a listener to recalculate distance when a location entity changes."""
     location_entity_id = entry.options.get(CONF_LOCATION_ENTITY)
-    if not location_entity_id:
+    extra_entity_ids = entry.options.get(CONF_EXTRA_LOCATION_ENTITIES, [])
+    if not location_entity_id and not extra_entity_ids:
         LOGGER.info("No location entity configured. Skipping location listener setup.")
         return
 
     data_bundle = hass.data[DOMAIN][entry.entry_id]
+    signal = f"{DOMAIN}_{entry.entry_id}_recalculate_distance"
 
     async def location_state_listener(event: Event) -> None:
-        """Handle state changes for the location entity."""
-        LOGGER.debug("Location entity %s changed, dispatching distance recalculation.", location_entity_id)
-        dispatcher_send(hass, f"{DOMAIN}_{entry.entry_id}_recalculate_distance")
+        """Handle state changes for a location entity."""
+        entity_id = event.data["entity_id"]
+        LOGGER.debug("Location entity %s changed, dispatching distance recalculation.", entity_id)
+        # One batched distance matrix update covers every location entity
+        update_engine_location(hass, entry)
+        if entity_id == location_entity_id:
+            dispatcher_send(hass, signal)
+        if entity_id in extra_entity_ids:
+            dispatcher_send(hass, f"{signal}_{entity_id}")
 
     # Register the state change listener
     cancel_listener = async_track_state_change_event(
-        hass, [location_entity_id], location_state_listener
+        hass, list(dict.fromkeys(filter(None, [location_entity_id, *extra_entity_ids]))), location_state_listener
     )
     data_bundle["location_listener_cancel"] = cancel_listener
     
     # Trigger an initial calculation right after setup
-    dispatcher_send(hass, f"{DOMAIN}_{entry.entry_id}_recalculate_distance")
+    update_engine_location(hass, entry)
+    dispatcher_send(hass, signal)
+    for entity_id in extra_entity_ids:
+        dispatcher_send(hass, f"{signal}_{entity_id}")
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -147,9 +378,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             data_bundle["trading_hours_schedule_cancel"]()
         if data_bundle.get("trading_hours_timer_cancel"):
             data_bundle["trading_hours_timer_cancel"]()
+        if data_bundle.get("replay_task"):
+            data_bundle["replay_task"].cancel()
+        if data_bundle.get("statistics_import_cancel"):
+            data_bundle["statistics_import_cancel"]()
+        if data_bundle.get("alert_location_listener_cancel"):
+            data_bundle["alert_location_listener_cancel"]()
 
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        async_unload_services(hass)
 
     return unload_ok
 
@@ -0,0 +1,205 @@
+"""Price threshold alerts for the Tasmanian Fuel Prices integration."""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from .const import ALERT_BELOW
+from .core import haversine
+from .snapshot import PriceChange
+
+
+class PriceAlert(NamedTuple):
+    """
+    A price threshold on one station, on any station within a radius, or on
+    the cheapest station within a radius. Prices are in cents. A radius set
+    around `entity_id` follows that entity's location.
+    """
+
+    alert_id: str
+    fuel_type: str
+    threshold: float
+    direction: str = ALERT_BELOW
+    station_code: str | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    radius_km: float | None = None
+    cheapest: bool = False
+    name: str | None = None
+    entity_id: str | None = None
+
+
+class AlertCrossing(NamedTuple):
+    """A price that crossed an alert's threshold."""
+
+    alert: PriceAlert
+    station_code: str
+    old_price: float | None
+    new_price: float
+
+
+def crossed(alert: PriceAlert, old_price: float, new_price: float) -> bool:
+    """Return True if a price moving from `old_price` to `new_price` crosses the alert threshold."""
+    if alert.direction == ALERT_BELOW:
+        return old_price > alert.threshold >= new_price
+    return old_price <= alert.threshold < new_price
+
+
+class PriceAlertIndex:
+    """
+    Registered alerts, indexed so a snapshot diff only checks the thresholds it crosses.
+
+    Station and radius alerts are kept per fuel type in a list sorted by
+    threshold; a change from `old` to `new` only looks at the thresholds
+    between the two prices. Cheapest-within-radius alerts are re-evaluated
+    only when a station inside their radius changes price, and fire when the
+    cheapest price moves across the threshold.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._alerts: dict[str, PriceAlert] = {}
+        # Fuel type -> sorted (threshold, alert id) of station and radius alerts
+        self._thresholds: dict[str, list[tuple[float, str]]] = {}
+        # Fuel type -> ids of cheapest-within-radius alerts
+        self._cheapest: dict[str, set[str]] = {}
+        # Alert id -> whether its condition held at the last evaluation, None until first evaluated
+        self._cheapest_met: dict[str, bool | None] = {}
+        # Alert id -> station codes within its radius
+        self._cheapest_stations: dict[str, set[str]] = {}
+        self._locations: dict[str, tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of registered alerts."""
+        return len(self._alerts)
+
+    def alerts(self) -> list[PriceAlert]:
+        """Return every registered alert."""
+        return list(self._alerts.values())
+
+    def as_dict(self) -> dict:
+        """Return the registered alerts for persistence."""
+        return {"alerts": [alert._asdict() for alert in self._alerts.values()]}
+
+    def load(self, data: dict | None) -> None:
+        """Register the alerts saved by `as_dict`."""
+        for alert in (data or {}).get("alerts", []):
+            self.add(PriceAlert(**alert))
+
+    def add(self, alert: PriceAlert) -> None:
+        """Register an alert, replacing any alert with the same id."""
+        self.remove(alert.alert_id)
+        self._alerts[alert.alert_id] = alert
+        if alert.cheapest:
+            self._cheapest.setdefault(alert.fuel_type, set()).add(alert.alert_id)
+            self._cheapest_met[alert.alert_id] = None
+            self._cheapest_stations[alert.alert_id] = self._stations_within(alert)
+        else:
+            insort(self._thresholds.setdefault(alert.fuel_type, []), (alert.threshold, alert.alert_id))
+
+    def entity_ids(self) -> set[str]:
+        """Return the location entities radius alerts follow."""
+        return {alert.entity_id for alert in self._alerts.values() if alert.entity_id is not None}
+
+    def move(self, entity_id: str, latitude: float, longitude: float) -> bool:
+        """Move the radius of every alert following `entity_id`, returning True if any alert moved."""
+        moved = [
+            alert for alert in self._alerts.values()
+            if alert.entity_id == entity_id and (alert.latitude, alert.longitude) != (latitude, longitude)
+        ]
+        for alert in moved:
+            # A moved cheapest alert learns its state again rather than firing for the move itself
+            self.add(alert._replace(latitude=latitude, longitude=longitude))
+        return bool(moved)
+
+    def remove(self, alert_id: str) -> PriceAlert | None:
+        """Unregister an alert, returning it if it existed."""
+        alert = self._alerts.pop(alert_id, None)
+        if alert is None:
+            return None
+        if alert.cheapest:
+            self._cheapest[alert.fuel_type].discard(alert_id)
+            self._cheapest_met.pop(alert_id, None)
+            self._cheapest_stations.pop(alert_id, None)
+        else:
+            self._thresholds[alert.fuel_type].remove((alert.threshold, alert_id))
+        return alert
+
+    def _stations_within(self, alert: PriceAlert) -> set[str]:
+        """Return the known stations within an alert's radius."""
+        return {
+            code
+            for code, (latitude, longitude) in self._locations.items()
+            if haversine(alert.latitude, alert.longitude, latitude, longitude) <= alert.radius_km
+        }
+
+    def _matches(self, alert: PriceAlert, station_code: str) -> bool:
+        """Return True if a station is covered by a station or radius alert."""
+        if alert.station_code is not None:
+            return alert.station_code == station_code
+        location = self._locations.get(station_code)
+        if location is None or alert.latitude is None or alert.radius_km is None:
+            return False
+        return haversine(alert.latitude, alert.longitude, *location) <= alert.radius_km
+
+    def _update_locations(self, stations: Iterable[dict]) -> None:
+        """Record the location of every station in a raw `fetch_prices` station list."""
+        for station in stations:
+            location = station.get("location") or {}
+            if location.get("latitude") is not None and location.get("longitude") is not None:
+                self._locations[str(station.get("code"))] = (location["latitude"], location["longitude"])
+        for alert_id in self._cheapest_stations:
+            self._cheapest_stations[alert_id] = self._stations_within(self._alerts[alert_id])
+
+    def evaluate(
+        self,
+        changes: list[PriceChange],
+        price_index: dict[tuple[str, str], float],
+        stations: Iterable[dict],
+    ) -> list[AlertCrossing]:
+        """
+        Return the alerts crossed by the changes of one snapshot diff.
+        `price_index` is the new snapshot indexed by `snapshot.index_prices`; `stations`
+        is only read when a change is for a station whose location is not known yet.
+        """
+        if not self._alerts:
+            return []
+        if any(change.station_code not in self._locations for change in changes):
+            self._update_locations(stations)
+
+        crossings: list[AlertCrossing] = []
+        changed_stations: dict[str, set[str]] = {}
+        for change in changes:
+            changed_stations.setdefault(change.fuel_type, set()).add(change.station_code)
+            thresholds = self._thresholds.get(change.fuel_type)
+            if not thresholds or change.old_price is None or change.new_price is None:
+                continue
+            low, high = sorted((change.old_price, change.new_price))
+            start = bisect_left(thresholds, (low, ""))
+            end = bisect_right(thresholds, (high, "\uffff"))
+            for _, alert_id in thresholds[start:end]:
+                alert = self._alerts[alert_id]
+                if crossed(alert, change.old_price, change.new_price) and self._matches(alert, change.station_code):
+                    crossings.append(AlertCrossing(alert, change.station_code, change.old_price, change.new_price))
+
+        for fuel_type, codes in changed_stations.items():
+            for alert_id in self._cheapest.get(fuel_type, ()):
+                within = self._cheapest_stations[alert_id]
+                if not within & codes:
+                    continue
+                alert = self._alerts[alert_id]
+                prices = [
+                    (price, code) for code in within
+                    if (price := price_index.get((code, fuel_type))) is not None
+                ]
+                if not prices:
+                    continue
+                price, code = min(prices)
+                met = price <= alert.threshold if alert.direction == ALERT_BELOW else price > alert.threshold
+                # The first evaluation after setup only learns the current state
+                if met and self._cheapest_met[alert_id] is False:
+                    crossings.append(AlertCrossing(alert, code, None, price))
+                self._cheapest_met[alert_id] = met
+
+        return crossings
@@ -0,0 +1,205 @@
+"""Price cycle detection for the Tasmanian Fuel Prices integration."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Mapping
+import statistics
+from typing import NamedTuple
+
+from .const import (
+    CYCLE_RESTORATION_RISE,
+    CYCLE_RESTORATION_SHARE,
+    CYCLE_RESTORATION_WINDOW,
+    CYCLE_MIN_LENGTH,
+    CYCLE_MAX_RESTORATIONS,
+    CYCLE_TROUGH_FRACTION,
+    CYCLE_PHASE_UNKNOWN,
+    CYCLE_PHASE_RESTORING,
+    CYCLE_PHASE_FALLING,
+    CYCLE_PHASE_TROUGH,
+)
+from .core import haversine
+from .snapshot import PriceChange
+
+
+class CycleEstimate(NamedTuple):
+    """Where a region is in its price cycle; times are UTC epoch seconds."""
+
+    phase: str
+    confidence: float
+    average: float | None
+    stations: int
+    last_restoration: float | None
+    cycle_length: float | None
+    next_trough: float | None
+
+
+class CycleTracker:
+    """
+    Rolling price cycle state of one region and fuel type.
+
+    The regional average is kept as a running total of each station's current
+    price. A restoration is detected when enough of the region's stations rise
+    sharply within CYCLE_RESTORATION_WINDOW. The spacing of recent restorations
+    gives the cycle length, and the next trough is expected just before the
+    next restoration.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty tracker."""
+        self._prices: dict[str, float] = {}
+        self._total = 0.0
+        # (timestamp, station code) of recent sharp rises
+        self._rises: deque[tuple[float, str]] = deque()
+        self._restorations: deque[float] = deque(maxlen=CYCLE_MAX_RESTORATIONS)
+
+    def as_dict(self) -> dict:
+        """Return the detected restorations for persistence."""
+        return {"restorations": list(self._restorations)}
+
+    def load(self, data: dict | None) -> None:
+        """Restore the restorations saved by `as_dict`."""
+        if data and isinstance(data.get("restorations"), list):
+            self._restorations.extend(float(t) for t in data["restorations"])
+
+    def apply(self, timestamp: float, change: PriceChange) -> None:
+        """Apply one price change of a station in the region."""
+        old_price = self._prices.pop(change.station_code, None)
+        if old_price is not None:
+            self._total -= old_price
+        if change.new_price is not None:
+            self._prices[change.station_code] = change.new_price
+            self._total += change.new_price
+        if (
+            change.old_price is not None
+            and change.new_price is not None
+            and change.new_price - change.old_price >= CYCLE_RESTORATION_RISE
+        ):
+            self._rises.append((timestamp, change.station_code))
+
+    def detect(self, timestamp: float) -> bool:
+        """Check the recent rises for a restoration at `timestamp`, returning True if one started."""
+        window_start = timestamp - CYCLE_RESTORATION_WINDOW.total_seconds()
+        while self._rises and self._rises[0][0] < window_start:
+            self._rises.popleft()
+        if not self._prices:
+            return False
+        rising = len({code for _, code in self._rises})
+        if rising / len(self._prices) < CYCLE_RESTORATION_SHARE:
+            return False
+        if self._restorations and timestamp - self._restorations[-1] < CYCLE_MIN_LENGTH.total_seconds():
+            return False
+        self._restorations.append(timestamp)
+        self._rises.clear()
+        return True
+
+    def estimate(self, now: float) -> CycleEstimate:
+        """Return the current phase and the expected next trough."""
+        average = self._total / len(self._prices) if self._prices else None
+        if not self._restorations:
+            return CycleEstimate(CYCLE_PHASE_UNKNOWN, 0.0, average, len(self._prices), None, None, None)
+
+        last = self._restorations[-1]
+        periods = [b - a for a, b in zip(self._restorations, list(self._restorations)[1:])]
+        if not periods:
+            phase = CYCLE_PHASE_RESTORING if now - last < CYCLE_RESTORATION_WINDOW.total_seconds() else CYCLE_PHASE_UNKNOWN
+            return CycleEstimate(phase, 0.0, average, len(self._prices), last, None, None)
+
+        length = statistics.fmean(periods)
+        elapsed = now - last
+        # Overdue cycles roll forward, but make the estimate less trustworthy
+        next_restoration = last + length
+        overdue = 0
+        while next_restoration <= now:
+            next_restoration += length
+            overdue += 1
+
+        if elapsed < CYCLE_RESTORATION_WINDOW.total_seconds():
+            phase = CYCLE_PHASE_RESTORING
+        elif overdue or elapsed >= CYCLE_TROUGH_FRACTION * length:
+            phase = CYCLE_PHASE_TROUGH
+        else:
+            phase = CYCLE_PHASE_FALLING
+
+        regularity = 1.0
+        if len(periods) > 1:
+            regularity = max(0.0, 1.0 - statistics.pstdev(periods) / length)
+        confidence = min(1.0, len(periods) / 3) * regularity / (1 + overdue)
+
+        return CycleEstimate(
+            phase,
+            round(confidence, 2),
+            average,
+            len(self._prices),
+            last,
+            length,
+            # Prices bottom out just before they are restored
+            next_restoration,
+        )
+
+
+class PriceCycleAnalytics:
+    """Cycle trackers for every region and fuel type, fed incrementally from snapshot diffs."""
+
+    def __init__(self, regions: Mapping[str, tuple[float, float, float]], fuel_types: Iterable[str]) -> None:
+        """Initialize the trackers; each region is a (latitude, longitude, radius in km) circle."""
+        self._regions = regions
+        self._fuel_types = set(fuel_types)
+        self._trackers: dict[tuple[str, str], CycleTracker] = {
+            (region, fuel_type): CycleTracker() for region in regions for fuel_type in self._fuel_types
+        }
+        # Station code -> region, None for stations outside every region
+        self._station_regions: dict[str, str | None] = {}
+
+    def as_dict(self) -> dict:
+        """Return the state of every tracker for persistence."""
+        return {f"{region}|{fuel_type}": tracker.as_dict() for (region, fuel_type), tracker in self._trackers.items()}
+
+    def load(self, data: dict | None) -> None:
+        """Restore the tracker state saved by `as_dict`."""
+        for key, value in (data or {}).items():
+            region, _, fuel_type = key.partition("|")
+            if tracker := self._trackers.get((region, fuel_type)):
+                tracker.load(value)
+
+    def _assign_regions(self, stations: Iterable[dict]) -> None:
+        """Work out the region of every station in a raw `fetch_prices` station list."""
+        for station in stations:
+            code = str(station.get("code"))
+            location = station.get("location") or {}
+            latitude, longitude = location.get("latitude"), location.get("longitude")
+            region = None
+            if latitude is not None and longitude is not None:
+                for name, (region_lat, region_lon, radius) in self._regions.items():
+                    if haversine(region_lat, region_lon, latitude, longitude) <= radius:
+                        region = name
+                        break
+            self._station_regions[code] = region
+
+    def update(self, timestamp: float, changes: list[PriceChange], stations: Iterable[dict]) -> list[str]:
+        """
+        Apply the changes of one snapshot diff, returning the regions where a restoration started.
+        `stations` is only read when a change is for a station not seen before.
+        """
+        if any(change.station_code not in self._station_regions for change in changes):
+            self._assign_regions(stations)
+
+        touched: set[tuple[str, str]] = set()
+        for change in changes:
+            if change.fuel_type not in self._fuel_types:
+                continue
+            region = self._station_regions.get(change.station_code)
+            if region is None:
+                continue
+            self._trackers[(region, change.fuel_type)].apply(timestamp, change)
+            touched.add((region, change.fuel_type))
+
+        return [
+            f"{region} {fuel_type}"
+            for region, fuel_type in sorted(touched)
+            if self._trackers[(region, fuel_type)].detect(timestamp)
+        ]
+
+    def estimate(self, region: str, fuel_type: str, now: float) -> CycleEstimate:
+        """Return the cycle estimate of one region and fuel type."""
+        return self._trackers[(region, fuel_type)].estimate(now)
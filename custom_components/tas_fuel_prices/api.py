@@ -1,12 +1,26 @@
 """API client for the Tasmanian Fuel Prices integration."""
 
+from collections.abc import Awaitable, Callable, Sequence
 from datetime import datetime, timedelta, UTC
+from typing import Any
+import asyncio
 import backoff
 import aiohttp
 import json
+import time
 import uuid
 
-from aiohttp import ClientError, ClientSession, ClientResponseError
+from aiohttp import ClientError, ClientSession, ClientResponse, ClientResponseError, hdrs
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from aiohttp.compression_utils import HAS_BROTLI
+except ImportError:
+    HAS_BROTLI = False
 
 from .const import (
     API_BASE_URL,
@@ -20,7 +34,21 @@ from .const import (
     TYRE_INFLATION_URL,
     DISTRIBUTOR_URL,
     OPERATORS_URL,
+    JSON_EXECUTOR_THRESHOLD,
+    TRADING_HOURS_FUEL_TYPES,
+    REQUEST_TIMEOUTS,
+    UPSTREAM_BY_ENDPOINT,
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_COOLDOWN,
+    MAX_STALE_AGE,
+    METRICS_GROUP_BY_ENDPOINT,
+    METRICS_SAMPLE_SIZE,
+    DEFAULT_STATES,
 )
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .metrics import RefreshMetrics, count_records
+from .snapshot import merge_snapshots
+from .trading_hours import TradingHoursPlanner, format_trading_hours
 
 # Define cache-busting headers to ensure fresh data from GitHub
 CACHE_BUSTING_HEADERS = {
@@ -29,6 +57,27 @@ CACHE_BUSTING_HEADERS = {
     'Expires': '0',
 }
 
+# Only advertise brotli when aiohttp is able to decode it
+ACCEPT_ENCODING = "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+
+# Failures that mean the upstream could not be reached or did not answer in time
+UPSTREAM_ERRORS = (ClientError, asyncio.TimeoutError, CircuitOpenError)
+
+DISCOUNT_AND_AMENITY_URLS = {
+    "coles": COLES_DISCOUNT_URL,
+    "woolworths": WOOLWORTHS_DISCOUNT_URL,
+    "ract": RACT_DISCOUNT_URL,
+    "united": UNITED_DISCOUNT_URL,
+    "tyre_inflation": TYRE_INFLATION_URL,
+}
+
+
+def default_json_loads() -> Callable[[bytes], Any]:
+    """Return the fastest available JSON decoder."""
+    if orjson is not None:
+        return orjson.loads
+    return json.loads
+
 
 class TasFuelAPI:
     """A class for handling the data retrieval from the FuelCheck API."""
@@ -38,6 +87,8 @@ class TasFuelAPI:
         api_key: str,
         api_secret: str,
         session: ClientSession,
+        json_loads: Callable[[bytes], Any] | None = None,
+        executor_threshold: int = JSON_EXECUTOR_THRESHOLD,
     ) -> None:
         """Initialize the API client."""
         self._api_key = api_key
@@ -45,12 +96,207 @@ class TasFuelAPI:
         self._session = session
         self._access_token: str | None = None
         self._token_expiry: datetime | None = None
+        self._json_loads = json_loads or default_json_loads()
+        self._executor_threshold = executor_threshold
+        self._fetch_stats: dict[str, dict[str, Any]] = {}
+        self.trading_hours_planner = TradingHoursPlanner(TRADING_HOURS_FUEL_TYPES)
+        self._breakers = {
+            upstream: CircuitBreaker(upstream, CIRCUIT_BREAKER_FAILURE_THRESHOLD, CIRCUIT_BREAKER_COOLDOWN)
+            for upstream in set(UPSTREAM_BY_ENDPOINT.values())
+        }
+        self._last_good: dict[str, tuple[Any, datetime]] = {}
+        self._serving_stale: set[str] = set()
+        self.metrics = RefreshMetrics(METRICS_SAMPLE_SIZE)
+        # Called with the key and result of every successful fetch, e.g. to archive payloads
+        self.recorder: Callable[[str, Any], None] | None = None
+        self._replay: dict[str, Any] | None = None
 
     @property
     def token_expiry(self) -> datetime | None:
         """Return the token expiry datetime object."""
         return self._token_expiry
 
+    @property
+    def fetch_stats(self) -> dict[str, dict[str, Any]]:
+        """Return transfer sizes and decode times per endpoint."""
+        return self._fetch_stats
+
+    @property
+    def circuit_states(self) -> dict[str, str]:
+        """Return the circuit breaker state of each upstream."""
+        return {name: breaker.state for name, breaker in self._breakers.items()}
+
+    def snapshot_time(self, key: str) -> datetime | None:
+        """Return when the snapshot currently being served for `key` was fetched."""
+        if cached := self._last_good.get(key):
+            return cached[1]
+        return None
+
+    def is_stale(self, key: str) -> bool:
+        """Return True if the last fetch for `key` failed and an older snapshot was served."""
+        return key in self._serving_stale
+
+    @property
+    def replaying(self) -> bool:
+        """Return True while recorded payloads are served instead of the upstreams."""
+        return self._replay is not None
+
+    def start_replay(self) -> None:
+        """Serve replayed payloads instead of fetching them from the upstreams."""
+        self._replay = {}
+
+    def replay_payload(self, key: str, data: Any) -> None:
+        """Set the payload served for `key` until the next one is replayed."""
+        if self._replay is not None:
+            self._replay[key] = data
+
+    def stop_replay(self) -> None:
+        """Go back to fetching from the upstreams."""
+        self._replay = None
+
+    async def _serve_stale_on_failure(
+        self,
+        key: str,
+        fetch: Callable[..., Awaitable[Any]],
+        *args: Any,
+    ) -> Any:
+        """
+        Run a fetch and remember its result as the last good snapshot.
+        If the upstream fails, the last good snapshot is served instead for up to MAX_STALE_AGE.
+        """
+        if self._replay is not None and key in self._replay:
+            return self._replay[key]
+
+        try:
+            data = await fetch(*args)
+        except UPSTREAM_ERRORS as err:
+            cached = self._last_good.get(key)
+            if cached is None or datetime.now(UTC) - cached[1] > MAX_STALE_AGE:
+                raise
+            self._serving_stale.add(key)
+            LOGGER.warning(
+                "Could not refresh %s (%s), serving the snapshot fetched at %s.",
+                key,
+                err,
+                cached[1].isoformat(),
+            )
+            return cached[0]
+
+        self._last_good[key] = (data, datetime.now(UTC))
+        self._serving_stale.discard(key)
+        if self.recorder is not None:
+            self.recorder(key, data)
+        return data
+
+    @property
+    def total_compressed_bytes(self) -> int:
+        """Return the number of bytes received on the wire across all endpoints."""
+        return sum(stats.get("total_compressed_bytes", 0) for stats in self._fetch_stats.values())
+
+    async def _request(
+        self,
+        endpoint: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> bytes:
+        """
+        Perform a GET request against an upstream endpoint and return the body.
+        Every upstream call goes through here so compression is negotiated and
+        transfer sizes are recorded consistently.
+        """
+        breaker = self._breakers[UPSTREAM_BY_ENDPOINT[endpoint]]
+        breaker.before_call()
+
+        request_headers = {hdrs.ACCEPT_ENCODING: ACCEPT_ENCODING, **(headers or {})}
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUTS[endpoint])
+        try:
+            with self._metrics_stage(endpoint, "fetch") as counts:
+                async with self._session.get(
+                    url, headers=request_headers, timeout=timeout, **kwargs
+                ) as response:
+                    body = await response.read()
+                    # No conditional requests are made, so a 304 carries no usable body
+                    if not response.ok or response.status == 304:
+                        raise ClientResponseError(
+                            response.request_info,
+                            response.history,
+                            status=response.status,
+                            message=body.decode("utf-8", errors="replace")[:500] or response.reason,
+                            headers=response.headers,
+                        )
+                    counts["bytes"] = self._record_transfer(endpoint, response, body)
+        except ClientResponseError as err:
+            # Client errors such as an expired token still prove the upstream is up
+            if err.status >= 500 or err.status == 429:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except (ClientError, asyncio.TimeoutError):
+            breaker.record_failure()
+            raise
+
+        breaker.record_success()
+        return body
+
+    def _metrics_stage(self, endpoint: str, stage: str):
+        """Time a stage of a request, counting everything done for the token endpoint as auth."""
+        return self.metrics.stage(
+            METRICS_GROUP_BY_ENDPOINT[endpoint],
+            "auth" if endpoint == "token" else stage,
+        )
+
+    def _record_transfer(self, endpoint: str, response: ClientResponse, body: bytes) -> int:
+        """Record the compressed and decompressed size of a response and return the bytes received."""
+        encoding = response.headers.get(hdrs.CONTENT_ENCODING, "identity")
+        if response.content_length is not None:
+            compressed = response.content_length
+        elif encoding == "identity":
+            compressed = len(body)
+        else:
+            # Chunked and compressed, the wire size is not reported by the server
+            compressed = None
+
+        stats = self._fetch_stats.setdefault(endpoint, {})
+        stats["requests"] = stats.get("requests", 0) + 1
+        stats["content_encoding"] = encoding
+        stats["compressed_bytes"] = compressed
+        stats["decompressed_bytes"] = len(body)
+        stats["total_compressed_bytes"] = stats.get("total_compressed_bytes", 0) + (compressed or len(body))
+        stats["total_decompressed_bytes"] = stats.get("total_decompressed_bytes", 0) + len(body)
+        return compressed or len(body)
+
+    async def _decode_json(self, endpoint: str, raw: bytes) -> Any:
+        """
+        Decode a JSON payload and record its size and decode time.
+        Payloads larger than the executor threshold are decoded off the event loop.
+        """
+        in_executor = len(raw) > self._executor_threshold
+        start = time.perf_counter()
+        with self._metrics_stage(endpoint, "decode") as counts:
+            if in_executor:
+                data = await asyncio.get_running_loop().run_in_executor(None, self._json_loads, raw)
+            else:
+                data = self._json_loads(raw)
+            counts["bytes"] = len(raw)
+            counts["records"] = count_records(data)
+        decode_ms = (time.perf_counter() - start) * 1000
+
+        self._fetch_stats.setdefault(endpoint, {}).update({
+            "payload_bytes": len(raw),
+            "decode_ms": round(decode_ms, 3),
+            "decoded_in_executor": in_executor,
+        })
+        LOGGER.debug(
+            "Decoded %s bytes from %s in %.1f ms%s",
+            len(raw),
+            endpoint,
+            decode_ms,
+            " (executor)" if in_executor else "",
+        )
+        return data
+
     @backoff.on_exception(backoff.expo, ClientResponseError, max_tries=3, logger=LOGGER)
     async def _get_access_token(self) -> str:
         """
@@ -67,14 +313,8 @@ class TasFuelAPI:
         auth = aiohttp.BasicAuth(self._api_key, self._api_secret)
 
         try:
-            response = await self._session.get(
-                OAUTH_URL,
-                params=params,
-                auth=auth
-            )
-            response.raise_for_status()
-            
-            token_data = await response.json(content_type=None)
+            body = await self._request("token", OAUTH_URL, params=params, auth=auth)
+            token_data = await self._decode_json("token", body)
 
             if "access_token" not in token_data:
                 LOGGER.error(
@@ -91,21 +331,43 @@ class TasFuelAPI:
             return self._access_token
 
         except ClientResponseError as err:
-            response_text = await response.text()
             LOGGER.error(
                 "API Error getting token. Status: %s, Response: %s",
                 err.status,
-                response_text,
+                err.message,
             )
             raise
+        except CircuitOpenError:
+            # An open circuit is the expected state of a failing upstream, not an error to report here
+            raise
         except Exception as err:
             LOGGER.error("Unexpected error getting token: %s", err)
             raise
 
-    @backoff.on_exception(backoff.expo, ClientError, max_tries=3, logger=LOGGER)
-    async def fetch_prices(self) -> dict:
+    async def fetch_prices(self, states: Sequence[str] = DEFAULT_STATES) -> dict:
+        """
+        Fetch fuel prices for the given states from the API.
+        While the API is failing, the last good snapshot is returned instead.
+        """
+        return await self._serve_stale_on_failure("prices", self._fetch_price_shards, tuple(states))
+
+    async def _fetch_price_shards(self, states: tuple[str, ...]) -> dict:
+        """
+        Fetch each state as its own request, concurrently, and merge them into one snapshot.
+        If any state fails the whole fetch fails, so a snapshot never silently misses a state.
+        """
+        # Get a token first so concurrent shards share it instead of each requesting one
+        await self._get_access_token()
+        shards = await asyncio.gather(*(self._fetch_prices(state) for state in states))
+        with self.metrics.stage("prices", "normalize") as counts:
+            data = merge_snapshots(dict(zip(states, shards)))
+            counts["records"] = len(data["prices"])
+        return data
+
+    @backoff.on_exception(backoff.expo, (ClientError, asyncio.TimeoutError), max_tries=3, logger=LOGGER)
+    async def _fetch_prices(self, state: str) -> dict:
         """
-        Fetch fuel prices from the API.
+        Fetch the fuel prices of one state from the API.
         This function handles token retrieval and renewal automatically.
         """
         token = await self._get_access_token()
@@ -121,17 +383,12 @@ class TasFuelAPI:
             "requesttimestamp": request_timestamp,
         }
 
-        params = {"states": "TAS"}
+        params = {"states": state}
         
         try:
-            LOGGER.debug("Fetching all fuel prices for TAS from API.")
-            response = await self._session.get(
-                API_BASE_URL,
-                params=params,
-                headers=headers,
-            )
-            response.raise_for_status()
-            data = await response.json(content_type=None)
+            LOGGER.debug("Fetching all fuel prices for %s from API.", state)
+            body = await self._request("prices", API_BASE_URL, headers=headers, params=params)
+            data = await self._decode_json("prices", body)
             LOGGER.debug("Successfully fetched all fuel prices.")
             return data
 
@@ -140,18 +397,38 @@ class TasFuelAPI:
                 LOGGER.warning("Access token rejected by prices endpoint, forcing refresh.")
                 self._access_token = None
             raise
+        except CircuitOpenError:
+            raise
         except Exception as err:
             LOGGER.error("Unexpected error fetching prices: %s", err)
             raise
 
-    @backoff.on_exception(backoff.expo, ClientError, max_tries=3, logger=LOGGER)
-    async def fetch_trading_hours(self) -> dict:
+    async def fetch_trading_hours(self, station_fuels: dict[str, set[str]] | None = None) -> dict:
         """
         Fetch trading hours from the TAS FuelCheck website API.
+        While the website is failing, the last good mapping is returned instead.
+        """
+        try:
+            return await self._serve_stale_on_failure(
+                "trading_hours", self._fetch_trading_hours, station_fuels
+            )
+        except UPSTREAM_ERRORS as err:
+            LOGGER.error("Failed to fetch trading hours and no earlier data is available: %s", err)
+            return {}
+
+    @backoff.on_exception(backoff.expo, (ClientError, asyncio.TimeoutError), max_tries=3, logger=LOGGER)
+    async def _fetch_trading_hours(self, station_fuels: dict[str, set[str]] | None = None) -> dict:
+        """
+        Fetch trading hours from the TAS FuelCheck website API.
+        When the stations from the price snapshot are given (mapped to the fuels
+        they sell), only the fuel-type queries needed to cover them are made.
         """
         LOGGER.info("Fetching trading hours from TAS FuelCheck API.")
-        fuel_types = ['E10', 'U91', 'E85', 'P95', 'P98', 'DL', 'PDL', 'LPG']
-        
+        uncovered = set(station_fuels) if station_fuels else None
+        queried: set[str] = set()
+        succeeded = 0
+        last_error: Exception | None = None
+
         params = {
             'brands': 'SelectAll|ASTRON|Ampol|Ampol Bennetts Petroleum|Ampol Mood Food|BP|Bennetts Petroleum|Caltex|Caltex Woolworths|Coles Express|EG Ampol|Independent|Liberty|Lowes Petroleum BP|Mobil|Reddy Express|Shell|Tas Petroleum|Tas Petroleum Caltex|Tas Petroleum Shell|U-Go|United',
             'radius': '3',
@@ -168,47 +445,59 @@ class TasFuelAPI:
         }
 
         master_stations_list = {}
-        for fuel in fuel_types:
+        while uncovered is None or uncovered:
+            if uncovered is None:
+                fuel = next((f for f in TRADING_HOURS_FUEL_TYPES if f not in queried), None)
+            else:
+                fuel = self.trading_hours_planner.next_query(uncovered, queried, station_fuels)
+            if fuel is None:
+                break
+            queried.add(fuel)
+
             params['fuelType'] = fuel
             try:
-                response = await self._session.get(
-                    TAS_FUELCHECK_BY_LOCATION_URL, 
-                    params=params, 
-                    headers=headers
+                body = await self._request(
+                    "trading_hours",
+                    TAS_FUELCHECK_BY_LOCATION_URL,
+                    headers=headers,
+                    params=params,
                 )
-                response.raise_for_status()
-                stations = await response.json(content_type=None)
+                stations = await self._decode_json("trading_hours", body)
                 
+                normalize_start = time.perf_counter()
                 if isinstance(stations, list):
+                    returned_ids = set()
                     for station in stations:
                         station_id = str(station.get('ServiceStationID'))
+                        returned_ids.add(station_id)
                         
                         if station_id and station_id not in master_stations_list:
-                            raw_hours = station.get('tradinghours') or []
-                            formatted_hours = {}
-                            
-                            for day_info in raw_hours:
-                                day_name = day_info.get('Day', '').capitalize()
-                                if day_info.get('IsOpen24Hours'):
-                                    hours_string = "24 Hours"
-                                elif day_info.get('IsClose'):
-                                    hours_string = "Closed"
-                                else:
-                                    start = day_info.get('StartTime', 'N/A')
-                                    end = day_info.get('EndTime', 'N/A')
-                                    hours_string = f"{start} - {end}"
-                                    
-                                formatted_hours[day_name] = hours_string
-
-                            if not formatted_hours:
-                                formatted_hours = "Hours not provided by station"
-
-                            master_stations_list[station_id] = formatted_hours
+                            master_stations_list[station_id] = format_trading_hours(station.get('tradinghours'))
+
+                    self.trading_hours_planner.record(fuel, returned_ids)
+                    if uncovered is not None:
+                        uncovered -= returned_ids
+                self.metrics.record(
+                    "trading_hours",
+                    "normalize",
+                    (time.perf_counter() - normalize_start) * 1000,
+                    record_count=len(stations) if isinstance(stations, list) else 0,
+                )
+                succeeded += 1
                             
             except Exception as e:
                 LOGGER.error("Failed to fetch trading hours for %s: %s", fuel, e)
+                last_error = e
+
+        if not succeeded and isinstance(last_error, UPSTREAM_ERRORS):
+            # Every query failed, let the caller fall back to the previous mapping
+            raise last_error
 
-        LOGGER.debug("Successfully processed trading hours mapping.")
+        LOGGER.debug(
+            "Successfully processed trading hours mapping for %s stations using %s fuel-type queries.",
+            len(master_stations_list),
+            len(queried),
+        )
         return master_stations_list
 
     async def force_refresh_token(self) -> None:
@@ -220,14 +509,13 @@ class TasFuelAPI:
         self._access_token = None
         self._token_expiry = None
 
-    async def _fetch_github_directory_data(self, url: str, data_key: str) -> dict:
-        """Fetch and parse all .txt files from a GitHub directory."""
+    async def _fetch_github_directory_data(self, url: str, data_key: str) -> dict | None:
+        """Fetch and parse all .txt files from a GitHub directory, returning None on failure."""
         data_map = {}
         try:
             LOGGER.info("Fetching file list from %s for %s.", url, data_key)
-            response = await self._session.get(url, headers=CACHE_BUSTING_HEADERS)
-            response.raise_for_status()
-            files = await response.json()
+            body = await self._request("github_contents", url, headers=CACHE_BUSTING_HEADERS)
+            files = await self._decode_json("github_contents", body)
 
             for file_info in files:
                 if file_info.get("type") == "file" and file_info.get("name").endswith(".txt"):
@@ -235,54 +523,84 @@ class TasFuelAPI:
                     download_url = file_info["download_url"]
                     LOGGER.debug("Fetching %s file: %s", data_key, download_url)
                     
-                    item_response = await self._session.get(download_url, headers=CACHE_BUSTING_HEADERS)
-                    item_response.raise_for_status()
-                    text = await item_response.text()
+                    item_body = await self._request("github_raw", download_url, headers=CACHE_BUSTING_HEADERS)
+                    with self.metrics.stage("additional_data", "normalize") as counts:
+                        text = item_body.decode("utf-8")
+                        codes = 0
 
-                    for line in text.splitlines():
-                        code_part = line.split('#', 1)[0]
-                        station_code = code_part.strip()
-                        if station_code:
-                            data_map[station_code] = item_name
+                        for line in text.splitlines():
+                            code_part = line.split('#', 1)[0]
+                            station_code = code_part.strip()
+                            if station_code:
+                                data_map[station_code] = item_name
+                                codes += 1
+                        counts["records"] = codes
             LOGGER.info("Successfully processed %s %s mappings.", len(data_map), data_key)
-        except (ClientError, KeyError) as e:
+        except (*UPSTREAM_ERRORS, KeyError) as e:
             LOGGER.error("Error fetching or processing %s data: %s", data_key, e)
+            return None
         return data_map
 
-    @backoff.on_exception(backoff.expo, ClientError, max_tries=3, logger=LOGGER)
     async def fetch_additional_data_lists(self) -> dict:
+        """
+        Fetch the lists of station codes for discounts, amenities, and distributors from GitHub.
+        While GitHub is failing, the last good lists are returned instead.
+        """
+        try:
+            return await self._serve_stale_on_failure("additional_data", self._fetch_additional_data_lists)
+        except UPSTREAM_ERRORS as err:
+            LOGGER.error("Failed to fetch additional data and no earlier data is available: %s", err)
+            return {
+                **{provider: [] for provider in DISCOUNT_AND_AMENITY_URLS},
+                "distributors": {},
+                "operators": {},
+            }
+
+    @backoff.on_exception(backoff.expo, (ClientError, asyncio.TimeoutError), max_tries=3, logger=LOGGER)
+    async def _fetch_additional_data_lists(self) -> dict:
         """Fetch the lists of station codes for discounts, amenities, and distributors from GitHub."""
         LOGGER.info("Fetching additional data lists from GitHub.")
         additional_data = {}
-        urls = {
-            "coles": COLES_DISCOUNT_URL,
-            "woolworths": WOOLWORTHS_DISCOUNT_URL,
-            "ract": RACT_DISCOUNT_URL,
-            "united": UNITED_DISCOUNT_URL,
-            "tyre_inflation": TYRE_INFLATION_URL,
-        }
+        # Lists that fail to download keep their previous contents
+        previous = self._last_good.get("additional_data", ({}, None))[0]
+        failures = 0
+        last_error: Exception | None = None
 
-        for provider, url in urls.items():
+        for provider, url in DISCOUNT_AND_AMENITY_URLS.items():
             try:
-                response = await self._session.get(url, headers=CACHE_BUSTING_HEADERS)
-                response.raise_for_status()
-                text = await response.text()
-                
-                station_codes = set()
-                for line in text.splitlines():
-                    code_part = line.split('#', 1)[0]
-                    station_code = code_part.strip()
-                    if station_code:
-                        station_codes.add(station_code)
+                body = await self._request("github_raw", url, headers=CACHE_BUSTING_HEADERS)
+                with self.metrics.stage("additional_data", "normalize") as counts:
+                    text = body.decode("utf-8")
+
+                    station_codes = set()
+                    for line in text.splitlines():
+                        code_part = line.split('#', 1)[0]
+                        station_code = code_part.strip()
+                        if station_code:
+                            station_codes.add(station_code)
+                    counts["records"] = len(station_codes)
                 
                 additional_data[provider] = list(station_codes)
                 LOGGER.debug("Successfully fetched and parsed %s station codes for %s", len(station_codes), provider)
-            except ClientError as e:
+            except UPSTREAM_ERRORS as e:
                 LOGGER.error("Error fetching additional data list for %s: %s", provider, e)
-                additional_data[provider] = []
+                additional_data[provider] = previous.get(provider, [])
+                failures += 1
+                last_error = e
         
         # Fetch and process distributors and operators
-        additional_data["distributors"] = await self._fetch_github_directory_data(DISTRIBUTOR_URL, "distributor")
-        additional_data["operators"] = await self._fetch_github_directory_data(OPERATORS_URL, "operator")
+        for key, url, data_key in (
+            ("distributors", DISTRIBUTOR_URL, "distributor"),
+            ("operators", OPERATORS_URL, "operator"),
+        ):
+            data_map = await self._fetch_github_directory_data(url, data_key)
+            if data_map is None:
+                data_map = previous.get(key, {})
+                failures += 1
+            additional_data[key] = data_map
+
+        if last_error is not None and failures == len(DISCOUNT_AND_AMENITY_URLS) + 2:
+            # Nothing could be downloaded, let the caller fall back to the previous lists
+            raise last_error
         
         return additional_data
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""Circuit breaker for upstream calls made by the Tasmanian Fuel Prices integration."""
+from __future__ import annotations
+
+from datetime import timedelta
+import time
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is short-circuited because its upstream keeps failing."""
+
+
+class CircuitBreaker:
+    """
+    Stop calling an upstream after repeated failures.
+
+    After `failure_threshold` consecutive failures the breaker opens and every
+    call fails immediately until `cooldown` has passed. The next call is then
+    let through as a trial: success closes the breaker, failure re-opens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, cooldown: timedelta) -> None:
+        """Initialize the circuit breaker."""
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._cooldown = cooldown.total_seconds()
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        """Return the current breaker state."""
+        if self._opened_at is None:
+            return STATE_CLOSED
+        if time.monotonic() - self._opened_at < self._cooldown:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if calls to this upstream are currently blocked."""
+        if self.state == STATE_OPEN:
+            remaining = self._cooldown - (time.monotonic() - self._opened_at)
+            raise CircuitOpenError(
+                f"{self.name} upstream is failing, calls paused for another {remaining:.0f}s"
+            )
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed call and open the breaker once the threshold is reached."""
+        self._failures += 1
+        if self._opened_at is not None or self._failures >= self._failure_threshold:
+            # A failed trial call (or the threshold being hit) starts a fresh cool-down
+            self._opened_at = time.monotonic()
@@ -1,14 +1,14 @@
 """Config flow for Tasmanian Fuel Prices."""
 from __future__ import annotations
 
+import asyncio
 import voluptuous as vol
 from typing import Any
-import aiohttp
 
 from aiohttp import ClientError, ClientResponseError
 
 from homeassistant.config_entries import ConfigFlow, OptionsFlow, ConfigEntry
-from homeassistant.core import callback
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.selector import (
@@ -16,8 +16,10 @@ from homeassistant.helpers.selector import (
     NumberSelectorConfig,
     EntitySelector,
     EntitySelectorConfig,
+    SelectOptionDict,
     SelectSelector,
     SelectSelectorConfig,
+    SelectSelectorMode,
 )
 
 
@@ -28,6 +30,8 @@ from .const import (
     CONF_API_SECRET,
     CONF_FUEL_TYPES,
     CONF_STATIONS,
+    CONF_STATION_SEARCH,
+    STATION_PICKER_LIMIT,
     CONF_PRICE_FORMAT,
     PRICE_FORMAT_DOLLARS,
     PRICE_FORMAT_CENTS,
@@ -46,38 +50,177 @@ from .const import (
     CONF_ADD_TYRE_INFLATION_STATIONS,
     CONF_REMOVE_TYRE_INFLATION_STATIONS,
     CONF_LOCATION_ENTITY,
+    CONF_EXTRA_LOCATION_ENTITIES,
     CONF_RANGE,
     CONF_EXCLUDED_DISTRIBUTORS,
     CONF_EXCLUDED_OPERATORS,
+    CONF_SKIP_CLOSED_STATIONS,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    CONF_RECORD_PAYLOADS,
+    CONF_STATES,
+    CONF_ENTITY_RADIUS,
+    SUPPORTED_STATES,
+    DEFAULT_STATES,
+    DEFAULT_ENTITY_RADIUS,
+    CONF_ENABLE_FILL_COST,
+    CONF_TANK_SIZE,
+    CONF_FUEL_CONSUMPTION,
+    DEFAULT_TANK_SIZE,
+    DEFAULT_FUEL_CONSUMPTION,
     DISTRIBUTOR_URL,
     OPERATORS_URL,
 )
 from .api import TasFuelAPI
+from .search import StationSearchIndex
 
 FUEL_TYPES_OPTIONS = ["U91", "E10", "P95", "P98", "DL", "PDL", "B20", "E85", "LPG"]
 
-async def get_github_directory_options(url: str) -> list[str]:
+async def get_github_directory_options(hass: HomeAssistant, url: str) -> list[str]:
     """Fetch file names from a GitHub directory to use as multi-select options."""
     options = []
+    session = async_get_clientsession(hass)
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                files = await response.json()
-                for file_info in files:
-                    if file_info.get("type") == "file" and file_info.get("name").endswith(".txt"):
-                        options.append(file_info["name"].replace(".txt", ""))
+        async with session.get(url) as response:
+            response.raise_for_status()
+            files = await response.json()
+            for file_info in files:
+                if file_info.get("type") == "file" and file_info.get("name").endswith(".txt"):
+                    options.append(file_info["name"].replace(".txt", ""))
     except (ClientError, KeyError) as e:
         LOGGER.error("Could not fetch options from GitHub URL %s: %s", url, e)
     return sorted(options)
 
 
+async def get_summary_filter_options(
+    hass: HomeAssistant, entry_id: str | None = None
+) -> tuple[list[str], list[str]]:
+    """
+    Return the distributor and operator names to offer as exclusion options.
+    A loaded entry already holds these from GitHub, so they are only fetched
+    (concurrently) when there is no cached copy to reuse.
+    """
+    data_bundle = hass.data.get(DOMAIN, {}).get(entry_id) if entry_id else None
+    if data_bundle:
+        additional_data = data_bundle["additional_data_coordinator"].data or {}
+        distributors = additional_data.get("distributors")
+        operators = additional_data.get("operators")
+        if distributors and operators:
+            return sorted(set(distributors.values())), sorted(set(operators.values()))
+
+    distributor_options, operator_options = await asyncio.gather(
+        get_github_directory_options(hass, DISTRIBUTOR_URL),
+        get_github_directory_options(hass, OPERATORS_URL),
+    )
+    return distributor_options, operator_options
+
+
+def get_cached_station_index(hass: HomeAssistant, entry_id: str) -> StationSearchIndex | None:
+    """Return a search index over the price snapshot a loaded entry already holds."""
+    data_bundle = hass.data.get(DOMAIN, {}).get(entry_id)
+    if not data_bundle or not data_bundle["price_coordinator"].data:
+        return None
+
+    data = data_bundle["price_coordinator"].data
+    cached = data_bundle.get("station_index")
+    if cached is None or cached[0] is not data:
+        cached = (data, StationSearchIndex.from_snapshot(data))
+        data_bundle["station_index"] = cached
+    return cached[1]
+
+
+def station_picker_fields(
+    index: StationSearchIndex | None, selected: list[str], search: str
+) -> dict:
+    """Return the schema fields for searching and picking favourite stations."""
+    if index is None:
+        codes = []
+    elif search:
+        codes = index.search(search)
+    else:
+        codes = index.all_codes()[:STATION_PICKER_LIMIT]
+    # Already selected stations always stay in the list so they can be removed
+    codes = list(dict.fromkeys([*selected, *codes]))
+
+    return {
+        vol.Optional(CONF_STATION_SEARCH, default=""): str,
+        vol.Optional(CONF_STATIONS, default=selected): SelectSelector(
+            SelectSelectorConfig(
+                options=[
+                    SelectOptionDict(value=code, label=index.label(code) if index else code)
+                    for code in codes
+                ],
+                multiple=True,
+                custom_value=True,
+                mode=SelectSelectorMode.DROPDOWN,
+            )
+        ),
+    }
+
+
+def parse_station_input(
+    index: StationSearchIndex | None, user_input: dict[str, Any]
+) -> tuple[list[str], str, list[str]]:
+    """
+    Pull the favourite stations and search text out of a submitted form.
+    Returns the selected codes, the search text and any codes that do not exist.
+    """
+    search = (user_input.pop(CONF_STATION_SEARCH, "") or "").strip()
+    selected = [str(s).strip() for s in user_input.get(CONF_STATIONS) or [] if str(s).strip()]
+    if index is not None:
+        invalid = [code for code in selected if code not in index]
+    else:
+        invalid = [code for code in selected if not code.isdigit()]
+    return selected, search, invalid
+
+
+def coverage_fields(states: list[str], entity_radius: int) -> dict:
+    """Return the schema fields for the covered states and the price sensor radius."""
+    return {
+        vol.Required(CONF_STATES, default=states): cv.multi_select(SUPPORTED_STATES),
+        vol.Optional(CONF_ENTITY_RADIUS, default=entity_radius): NumberSelector(
+            NumberSelectorConfig(min=0, max=1000, step=5, unit_of_measurement="km"),
+        ),
+    }
+
+
+def fill_cost_fields(enabled: bool, tank_size: float, consumption: float) -> dict:
+    """Return the schema fields for the fill cost summary sensors."""
+    return {
+        vol.Optional(CONF_ENABLE_FILL_COST, default=enabled): bool,
+        vol.Optional(CONF_TANK_SIZE, default=tank_size): NumberSelector(
+            NumberSelectorConfig(min=5, max=200, step=1, unit_of_measurement="L"),
+        ),
+        vol.Optional(CONF_FUEL_CONSUMPTION, default=consumption): NumberSelector(
+            NumberSelectorConfig(min=1, max=40, step=0.1, unit_of_measurement="L/100km"),
+        ),
+    }
+
+
+def validate_coverage(user_input: dict[str, Any]) -> dict[str, str]:
+    """
+    Check the state coverage options.
+    Covering more than Tasmania needs an entity radius, as a sensor for every
+    station in NSW would add thousands of entities.
+    """
+    errors: dict[str, str] = {}
+    states = user_input.get(CONF_STATES) or []
+    if not states:
+        errors[CONF_STATES] = "no_states"
+    elif set(states) != set(DEFAULT_STATES) and not user_input.get(CONF_ENTITY_RADIUS):
+        errors[CONF_ENTITY_RADIUS] = "entity_radius_required"
+    return errors
+
+
 class TasFuelConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Tasmanian Fuel Prices."""
 
     VERSION = 10
     data: dict[str, Any] = {}
     options: dict[str, Any] = {}
+    _station_index: StationSearchIndex | None = None
 
 
     async def async_step_user(
@@ -99,6 +242,11 @@ class TasFuelConfigFlow(ConfigFlow, domain=DOMAIN):
                 errors["base"] = "unknown_error"
             else:
                 self.data.update(user_input)
+                try:
+                    # One snapshot fetch lets the station picker search locally from here on
+                    self._station_index = StationSearchIndex.from_snapshot(await api.fetch_prices())
+                except Exception as err:
+                    LOGGER.warning("Could not load stations for the station picker: %s", err)
                 return await self.async_step_init_options()
 
         schema = vol.Schema(
@@ -115,13 +263,17 @@ class TasFuelConfigFlow(ConfigFlow, domain=DOMAIN):
         self, user_input: dict[str, Any] | None = None
     ) -> dict[str, Any]:
         """Handle the main options step."""
+        errors: dict[str, str] = {}
+        selected: list[str] = []
+        search = ""
         if user_input is not None:
-            stations_str = user_input.get(CONF_STATIONS, "")
-            stations_list = [
-                s.strip() for s in stations_str.split(",") if s.strip().isdigit()
-            ]
+            selected, search, invalid = parse_station_input(self._station_index, user_input)
+            if invalid:
+                errors[CONF_STATIONS] = "invalid_stations"
+
+        if user_input is not None and not errors and not search:
             self.options.update(user_input)
-            self.options[CONF_STATIONS] = stations_list
+            self.options[CONF_STATIONS] = selected
 
             if self.options.get(CONF_ENABLE_WOOLWORTHS_DISCOUNT):
                 return await self.async_step_woolworths_discount()
@@ -139,7 +291,7 @@ class TasFuelConfigFlow(ConfigFlow, domain=DOMAIN):
                 vol.Required(CONF_FUEL_TYPES, default=["U91"]): cv.multi_select(
                     FUEL_TYPES_OPTIONS
                 ),
-                vol.Optional(CONF_STATIONS, default=""): str,
+                **station_picker_fields(self._station_index, selected, search),
                 vol.Optional(CONF_PRICE_FORMAT, default=PRICE_FORMAT_DOLLARS): SelectSelector(
                     SelectSelectorConfig(
                         options=[PRICE_FORMAT_DOLLARS, PRICE_FORMAT_CENTS],
@@ -151,9 +303,19 @@ class TasFuelConfigFlow(ConfigFlow, domain=DOMAIN):
                 vol.Optional(CONF_ENABLE_COLES_DISCOUNT, default=False): bool,
                 vol.Optional(CONF_ENABLE_RACT_DISCOUNT, default=False): bool,
                 vol.Optional(CONF_ENABLE_UNITED_DISCOUNT, default=False): bool,
+                vol.Optional(CONF_MIN_SCAN_INTERVAL, default=DEFAULT_MIN_SCAN_INTERVAL): NumberSelector(
+                    NumberSelectorConfig(min=5, max=720, step=5, unit_of_measurement="min"),
+                ),
+                vol.Optional(CONF_MAX_SCAN_INTERVAL, default=DEFAULT_MAX_SCAN_INTERVAL): NumberSelector(
+                    NumberSelectorConfig(min=5, max=720, step=5, unit_of_measurement="min"),
+                ),
+                vol.Optional(CONF_RECORD_PAYLOADS, default=False): bool,
             }
         )
-        return self.async_show_form(step_id="init_options", data_schema=schema)
+        if user_input is not None:
+            # Re-showing the form after a search or an error, keep what was entered
+            schema = self.add_suggested_values_to_schema(schema, user_input)
+        return self.async_show_form(step_id="init_options", data_schema=schema, errors=errors)
 
     async def async_step_woolworths_discount(
         self, user_input: dict[str, Any] | None = None
@@ -224,8 +386,9 @@ class TasFuelConfigFlow(ConfigFlow, domain=DOMAIN):
         return self.async_show_form(step_id="united_discount", data_schema=schema)
 
     async def async_step_geolocation(self, user_input: dict[str, Any] | None = None):
-        """Handle geolocation options."""
-        if user_input is not None:
+        """Handle geolocation and state coverage options."""
+        errors = validate_coverage(user_input) if user_input is not None else {}
+        if user_input is not None and not errors:
             self.options.update(user_input)
             return await self.async_step_summary_filtering()
 
@@ -236,8 +399,15 @@ class TasFuelConfigFlow(ConfigFlow, domain=DOMAIN):
             vol.Optional(CONF_RANGE, default=5): NumberSelector(
                 NumberSelectorConfig(min=1, max=100, step=1, unit_of_measurement="km"),
             ),
+            vol.Optional(CONF_EXTRA_LOCATION_ENTITIES, default=[]): EntitySelector(
+                EntitySelectorConfig(domain=["device_tracker", "person", "zone"], multiple=True),
+            ),
+            **coverage_fields(DEFAULT_STATES, DEFAULT_ENTITY_RADIUS),
+            **fill_cost_fields(False, DEFAULT_TANK_SIZE, DEFAULT_FUEL_CONSUMPTION),
         })
-        return self.async_show_form(step_id="geolocation", data_schema=schema)
+        if user_input is not None:
+            schema = self.add_suggested_values_to_schema(schema, user_input)
+        return self.async_show_form(step_id="geolocation", data_schema=schema, errors=errors)
 
     async def async_step_summary_filtering(self, user_input: dict[str, Any] | None = None):
         """Handle summary sensor filtering options."""
@@ -245,12 +415,12 @@ class TasFuelConfigFlow(ConfigFlow, domain=DOMAIN):
             self.options.update(user_input)
             return await self.async_step_tyre_inflation()
 
-        distributor_options = await get_github_directory_options(DISTRIBUTOR_URL)
-        operator_options = await get_github_directory_options(OPERATORS_URL)
+        distributor_options, operator_options = await get_summary_filter_options(self.hass)
 
         schema = vol.Schema({
             vol.Optional(CONF_EXCLUDED_DISTRIBUTORS, default=[]): cv.multi_select(distributor_options),
             vol.Optional(CONF_EXCLUDED_OPERATORS, default=[]): cv.multi_select(operator_options),
+            vol.Optional(CONF_SKIP_CLOSED_STATIONS, default=False): bool,
         })
         return self.async_show_form(step_id="summary_filtering", data_schema=schema)
 
@@ -280,19 +450,25 @@ class OptionsFlowHandler(OptionsFlow):
 
     def __init__(self, config_entry: ConfigEntry) -> None:
         """Initialize options flow."""
+        self._entry_id = config_entry.entry_id
         self.options = dict(config_entry.options)
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> dict[str, Any]:
         """Manage the options."""
+        errors: dict[str, str] = {}
+        station_index = get_cached_station_index(self.hass, self._entry_id)
+        selected = [str(s) for s in self.options.get(CONF_STATIONS, [])]
+        search = ""
         if user_input is not None:
-            stations_str = user_input.get(CONF_STATIONS, "")
-            stations_list = [
-                s.strip() for s in stations_str.split(",") if s.strip().isdigit()
-            ]
+            selected, search, invalid = parse_station_input(station_index, user_input)
+            if invalid:
+                errors[CONF_STATIONS] = "invalid_stations"
+
+        if user_input is not None and not errors and not search:
             self.options.update(user_input)
-            self.options[CONF_STATIONS] = stations_list
+            self.options[CONF_STATIONS] = selected
 
             if self.options.get(CONF_ENABLE_WOOLWORTHS_DISCOUNT):
                 return await self.async_step_woolworths_discount()
@@ -309,7 +485,7 @@ class OptionsFlowHandler(OptionsFlow):
                 vol.Required(CONF_FUEL_TYPES, default=self.options.get(CONF_FUEL_TYPES, ["U91"])): cv.multi_select(
                     FUEL_TYPES_OPTIONS
                 ),
-                vol.Optional(CONF_STATIONS, description={"suggested_value": ",".join(map(str, self.options.get(CONF_STATIONS, [])))}): str,
+                **station_picker_fields(station_index, selected, search),
                 vol.Optional(CONF_PRICE_FORMAT, default=self.options.get(CONF_PRICE_FORMAT, PRICE_FORMAT_DOLLARS)): SelectSelector(
                     SelectSelectorConfig(
                         options=[PRICE_FORMAT_DOLLARS, PRICE_FORMAT_CENTS],
@@ -321,8 +497,18 @@ class OptionsFlowHandler(OptionsFlow):
                 vol.Optional(CONF_ENABLE_COLES_DISCOUNT, default=self.options.get(CONF_ENABLE_COLES_DISCOUNT, False)): bool,
                 vol.Optional(CONF_ENABLE_RACT_DISCOUNT, default=self.options.get(CONF_ENABLE_RACT_DISCOUNT, False)): bool,
                 vol.Optional(CONF_ENABLE_UNITED_DISCOUNT, default=self.options.get(CONF_ENABLE_UNITED_DISCOUNT, False)): bool,
+                vol.Optional(CONF_MIN_SCAN_INTERVAL, default=self.options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL)): NumberSelector(
+                    NumberSelectorConfig(min=5, max=720, step=5, unit_of_measurement="min"),
+                ),
+                vol.Optional(CONF_MAX_SCAN_INTERVAL, default=self.options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)): NumberSelector(
+                    NumberSelectorConfig(min=5, max=720, step=5, unit_of_measurement="min"),
+                ),
+                vol.Optional(CONF_RECORD_PAYLOADS, default=self.options.get(CONF_RECORD_PAYLOADS, False)): bool,
         })
-        return self.async_show_form(step_id="init", data_schema=schema)
+        if user_input is not None:
+            # Re-showing the form after a search or an error, keep what was entered
+            schema = self.add_suggested_values_to_schema(schema, user_input)
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
 
     async def async_step_woolworths_discount(
         self, user_input: dict[str, Any] | None = None
@@ -394,7 +580,8 @@ class OptionsFlowHandler(OptionsFlow):
 
     async def async_step_geolocation(self, user_input: dict[str, Any] | None = None):
         """Handle geolocation options for re-configuration."""
-        if user_input is not None:
+        errors = validate_coverage(user_input) if user_input is not None else {}
+        if user_input is not None and not errors:
             self.options.update(user_input)
             return await self.async_step_summary_filtering()
 
@@ -410,8 +597,24 @@ class OptionsFlowHandler(OptionsFlow):
             ): NumberSelector(
                 NumberSelectorConfig(min=1, max=100, step=1, unit_of_measurement="km"),
             ),
+            vol.Optional(
+                CONF_EXTRA_LOCATION_ENTITIES, default=self.options.get(CONF_EXTRA_LOCATION_ENTITIES, [])
+            ): EntitySelector(
+                EntitySelectorConfig(domain=["device_tracker", "person", "zone"], multiple=True),
+            ),
+            **coverage_fields(
+                self.options.get(CONF_STATES, DEFAULT_STATES),
+                self.options.get(CONF_ENTITY_RADIUS, DEFAULT_ENTITY_RADIUS),
+            ),
+            **fill_cost_fields(
+                self.options.get(CONF_ENABLE_FILL_COST, False),
+                self.options.get(CONF_TANK_SIZE, DEFAULT_TANK_SIZE),
+                self.options.get(CONF_FUEL_CONSUMPTION, DEFAULT_FUEL_CONSUMPTION),
+            ),
         })
-        return self.async_show_form(step_id="geolocation", data_schema=schema)
+        if user_input is not None:
+            schema = self.add_suggested_values_to_schema(schema, user_input)
+        return self.async_show_form(step_id="geolocation", data_schema=schema, errors=errors)
 
     async def async_step_summary_filtering(self, user_input: dict[str, Any] | None = None):
         """Handle summary sensor filtering options for re-configuration."""
@@ -419,12 +622,21 @@ class OptionsFlowHandler(OptionsFlow):
             self.options.update(user_input)
             return await self.async_step_tyre_inflation()
 
-        distributor_options = await get_github_directory_options(DISTRIBUTOR_URL)
-        operator_options = await get_github_directory_options(OPERATORS_URL)
+        distributor_options, operator_options = await get_summary_filter_options(
+            self.hass, self._entry_id
+        )
+        # Keep existing exclusions selectable even if they have dropped off the lists
+        excluded_distributors = self.options.get(CONF_EXCLUDED_DISTRIBUTORS, [])
+        excluded_operators = self.options.get(CONF_EXCLUDED_OPERATORS, [])
+        distributor_options = sorted(set(distributor_options) | set(excluded_distributors))
+        operator_options = sorted(set(operator_options) | set(excluded_operators))
 
         schema = vol.Schema({
-            vol.Optional(CONF_EXCLUDED_DISTRIBUTORS, default=self.options.get(CONF_EXCLUDED_DISTRIBUTORS, [])): cv.multi_select(distributor_options),
-            vol.Optional(CONF_EXCLUDED_OPERATORS, default=self.options.get(CONF_EXCLUDED_OPERATORS, [])): cv.multi_select(operator_options),
+            vol.Optional(CONF_EXCLUDED_DISTRIBUTORS, default=excluded_distributors): cv.multi_select(distributor_options),
+            vol.Optional(CONF_EXCLUDED_OPERATORS, default=excluded_operators): cv.multi_select(operator_options),
+            vol.Optional(
+                CONF_SKIP_CLOSED_STATIONS, default=self.options.get(CONF_SKIP_CLOSED_STATIONS, False)
+            ): bool,
         })
         return self.async_show_form(step_id="summary_filtering", data_schema=schema)
 
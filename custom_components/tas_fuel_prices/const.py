@@ -24,9 +24,28 @@ ATTR_TYRE_INFLATION = "tyre_inflation"
 ATTR_IN_RANGE = "in_range"
 ATTR_DISTANCE = "distance"
 ATTR_STATIONS = "stations" # For summary sensors
+ATTR_FILL_COST = "fill_cost"
+ATTR_TRAVEL_COST = "travel_cost"
 ATTR_DISTRIBUTOR_EXCLUDED = "distributor_excluded"
 ATTR_OPERATOR_EXCLUDED = "operator_excluded"
 ATTR_TRADING_HOURS = "trading_hours"
+ATTR_POLLING_INTERVAL = "polling_interval"
+ATTR_DATA_AGE = "data_age"
+ATTR_STALE = "stale"
+ATTR_CIRCUIT_BREAKER = "circuit_breaker"
+ATTR_STAGES = "stages"
+ATTR_SNAPSHOT_BYTES = "snapshot_bytes"
+ATTR_CONFIDENCE = "confidence"
+ATTR_REGIONAL_AVERAGE = "regional_average"
+ATTR_LAST_RESTORATION = "last_restoration"
+ATTR_CYCLE_LENGTH = "cycle_length_days"
+ATTR_NEXT_TROUGH = "next_trough"
+ATTR_HOURS_TO_TROUGH = "hours_to_next_trough"
+ATTR_ALERT_ID = "alert_id"
+ATTR_PRICE = "price"
+ATTR_DIRECTION = "direction"
+ATTR_RADIUS = "radius"
+ATTR_CHEAPEST = "cheapest"
 
 
 # API Configuration
@@ -37,6 +56,83 @@ API_HEADERS = {
     "Accept": "application/json",
     "Content-Type": "application/json; charset=utf-8",
 }
+# Payloads larger than this (bytes) are decoded in an executor instead of the event loop
+JSON_EXECUTOR_THRESHOLD = 256 * 1024
+
+# Upstream resilience
+REQUEST_TIMEOUTS = {
+    "token": 15,
+    "prices": 30,
+    "trading_hours": 20,
+    "github_contents": 15,
+    "github_raw": 15,
+}
+# Endpoints served by the same upstream share a circuit breaker
+UPSTREAM_BY_ENDPOINT = {
+    "token": "onegov",
+    "prices": "onegov",
+    "trading_hours": "fuelcheck_tas",
+    "github_contents": "github",
+    "github_raw": "github",
+}
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 3
+CIRCUIT_BREAKER_COOLDOWN = timedelta(minutes=10)
+# How long the last good snapshot may be served while an upstream is failing
+MAX_STALE_AGE = timedelta(hours=24)
+# Refresh metrics are grouped by the coordinator whose cycle made the request
+METRICS_GROUP_BY_ENDPOINT = {
+    "token": "prices",
+    "prices": "prices",
+    "trading_hours": "trading_hours",
+    "github_contents": "additional_data",
+    "github_raw": "additional_data",
+}
+# Number of recent refresh cycles used for duration percentiles
+METRICS_SAMPLE_SIZE = 50
+
+# Payload recording, archived under the config directory in one folder per entry
+RECORDING_DIRECTORY = f"{DOMAIN}_recordings"
+RECORDING_MAX_SEGMENT_BYTES = 5 * 1024 * 1024
+RECORDING_MAX_SEGMENTS = 20
+
+# Services
+SERVICE_PROFILE_REFRESH = "profile_refresh"
+ATTR_TOP = "top"
+DEFAULT_PROFILE_TOP = 20
+SERVICE_REPLAY_PAYLOADS = "replay_payloads"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_SPEED = "speed"
+ATTR_STOP = "stop"
+DEFAULT_REPLAY_SPEED = 60.0
+SERVICE_PRICE_HISTORY = "price_history"
+ATTR_INCLUDE_RECORDS = "include_records"
+SERVICE_ADD_PRICE_ALERT = "add_price_alert"
+SERVICE_REMOVE_PRICE_ALERT = "remove_price_alert"
+SERVICE_LIST_PRICE_ALERTS = "list_price_alerts"
+SERVICE_FIND_CHEAPEST = "find_cheapest"
+ATTR_OPEN_NOW = "open_now"
+ATTR_FILTERED = "filtered"
+ATTR_EXCLUDE_STATIONS = "exclude_stations"
+DEFAULT_FIND_RADIUS = 10
+DEFAULT_FIND_TOP = 5
+SERVICE_FIND_ALONG_ROUTE = "find_along_route"
+ATTR_ROUTE = "route"
+ATTR_BUFFER = "buffer"
+DEFAULT_ROUTE_BUFFER = 2
+
+# Events
+EVENT_PRICE_CHANGES = f"{DOMAIN}_price_changes"
+
+# Price alerts
+EVENT_PRICE_ALERT = f"{DOMAIN}_price_alert"
+ALERT_BELOW = "below"
+ALERT_ABOVE = "above"
+
+# Fuel types accepted by the TAS FuelCheck website, used to look up trading hours
+TRADING_HOURS_FUEL_TYPES = ["E10", "U91", "E85", "P95", "P98", "DL", "PDL", "LPG"]
+# States whose stations the TAS FuelCheck website knows about
+TRADING_HOURS_STATES = {"TAS"}
 
 # Additional Data URLs from external repo
 BASE_DATA_URL = "https://raw.githubusercontent.com/ziogref/TAS-Fuel-HA-Additional-Data/main/"
@@ -54,6 +150,9 @@ CONF_API_KEY = "api_key"
 CONF_API_SECRET = "api_secret"
 CONF_FUEL_TYPES = "fuel_types"
 CONF_STATIONS = "stations"
+CONF_STATION_SEARCH = "station_search"
+# Most stations listed in the favourite station picker before a search narrows it down
+STATION_PICKER_LIMIT = 300
 CONF_PRICE_FORMAT = "price_format"
 PRICE_FORMAT_DOLLARS = "dollars"
 PRICE_FORMAT_CENTS = "cents"
@@ -82,10 +181,39 @@ CONF_REMOVE_TYRE_INFLATION_STATIONS = "remove_tyre_inflation_stations"
 # Geolocation Configuration
 CONF_LOCATION_ENTITY = "location_entity"
 CONF_RANGE = "range"
+# More people or vehicles, each getting their own Cheapest Near Me summaries
+CONF_EXTRA_LOCATION_ENTITIES = "extra_location_entities"
+
+# Fill cost ranking: the total cost of a fill, including the fuel burnt driving to the station and back
+CONF_ENABLE_FILL_COST = "enable_fill_cost"
+CONF_TANK_SIZE = "tank_size"
+CONF_FUEL_CONSUMPTION = "fuel_consumption"
+DEFAULT_TANK_SIZE = 50 # Litres
+DEFAULT_FUEL_CONSUMPTION = 8.0 # Litres per 100 km
 
 # Summary Sensor Filtering
 CONF_EXCLUDED_DISTRIBUTORS = "excluded_distributors"
 CONF_EXCLUDED_OPERATORS = "excluded_operators"
+CONF_SKIP_CLOSED_STATIONS = "skip_closed_stations"
+# Average speed used to estimate when you would arrive at a station
+ARRIVAL_SPEED_KMH = 50
+
+# Adaptive Polling Configuration (minutes)
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+DEFAULT_MIN_SCAN_INTERVAL = 15
+DEFAULT_MAX_SCAN_INTERVAL = 120
+
+# Payload Recording Configuration
+CONF_RECORD_PAYLOADS = "record_payloads"
+
+# State Coverage Configuration
+CONF_STATES = "states"
+CONF_ENTITY_RADIUS = "entity_radius"
+SUPPORTED_STATES = ["TAS", "NSW", "ACT"]
+DEFAULT_STATES = ["TAS"]
+# Price sensors for every station when 0, otherwise only within this many km of home
+DEFAULT_ENTITY_RADIUS = 0
 
 # Select Entity
 SELECT_FUEL_TYPE_ENTITY_NAME = "Fuel Type Selector"
@@ -104,4 +232,36 @@ FUEL_TYPE_ORDER = [
 
 # Update intervals
 SCAN_INTERVAL = timedelta(hours=1)
-ADDITIONAL_DATA_UPDATE_INTERVAL = timedelta(days=1)
\ No newline at end of file
+ADDITIONAL_DATA_UPDATE_INTERVAL = timedelta(days=1)
+
+# Persistent storage
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
+
+# Price cycle detection, per region (latitude, longitude, radius in km) and fuel type
+CYCLE_REGIONS = {
+    "hobart": (-42.8821, 147.3272, 25),
+    "launceston": (-41.4332, 147.1441, 20),
+}
+# A station rising by at least this many cents counts towards a restoration
+CYCLE_RESTORATION_RISE = 5.0
+# Share of a region's stations that must rise within the window to start a restoration
+CYCLE_RESTORATION_SHARE = 0.3
+CYCLE_RESTORATION_WINDOW = timedelta(hours=24)
+CYCLE_MIN_LENGTH = timedelta(days=3)
+CYCLE_MAX_RESTORATIONS = 8
+# Share of the cycle length after which prices are treated as being in the trough
+CYCLE_TROUGH_FRACTION = 0.8
+CYCLE_PHASE_UNKNOWN = "unknown"
+CYCLE_PHASE_RESTORING = "restoring"
+CYCLE_PHASE_FALLING = "falling"
+CYCLE_PHASE_TROUGH = "trough"
+
+# Price history, kept per station and fuel type
+HISTORY_CAPACITY = 512
+# Journal lines allowed beyond twice the history before it is rewritten
+HISTORY_COMPACT_SLACK = 10000
+
+# Hourly long-term statistics, imported a few minutes past each hour
+STATISTICS_IMPORT_MINUTE = 5
+STATISTICS_BACKFILL_HOURS = 48
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""Data update coordinator for the Tasmanian Fuel Prices integration."""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import DOMAIN
+from .metrics import RefreshMetrics, deep_sizeof
+
+
+class TasFuelDataUpdateCoordinator(DataUpdateCoordinator):
+    """
+    Coordinator that records refresh cycle metrics.
+
+    Every refresh is timed as one cycle, including the time spent updating
+    entities, and the memory size of each new snapshot is estimated.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        logger,
+        *,
+        metrics: RefreshMetrics,
+        metrics_group: str,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(hass, logger, **kwargs)
+        self.metrics = metrics
+        self.metrics_group = metrics_group
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh data as one metrics cycle."""
+        previous = self.data
+        self.metrics.begin_cycle(self.metrics_group)
+        try:
+            await super()._async_refresh(*args, **kwargs)
+        finally:
+            self.metrics.end_cycle(self.metrics_group)
+
+        if self.last_update_success and self.data is not previous:
+            # Sizing walks the whole payload, keep it off the event loop
+            size = await self.hass.async_add_executor_job(deep_sizeof, self.data)
+            self.metrics.set_snapshot_size(self.metrics_group, size)
+
+        if self.config_entry is not None:
+            async_dispatcher_send(self.hass, f"{DOMAIN}_{self.config_entry.entry_id}_metrics_updated")
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners and record how long the fan-out took."""
+        start = time.perf_counter()
+        super().async_update_listeners()
+        self.metrics.record(
+            self.metrics_group,
+            "fan_out",
+            (time.perf_counter() - start) * 1000,
+            record_count=len(self._listeners),
+        )
@@ -0,0 +1,699 @@
+"""
+Headless price engine for the Tasmanian Fuel Prices integration.
+
+Everything here works on the raw payloads returned by `TasFuelAPI` and the
+config entry options, so it can be used, tested and profiled without Home
+Assistant. The sensor entities are thin adapters over `FuelPriceEngine`.
+"""
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable, Mapping
+from datetime import datetime, timedelta, timezone, tzinfo
+import heapq
+from math import floor, radians, sin, cos, sqrt, atan2
+import operator
+from typing import Any
+
+from .const import (
+    LOGGER,
+    ATTR_TYRE_INFLATION,
+    ATTR_TRADING_HOURS,
+    ATTR_IN_RANGE,
+    ATTR_DISTANCE,
+    ATTR_FILL_COST,
+    ATTR_TRAVEL_COST,
+    CONF_ENABLE_COLES_DISCOUNT,
+    CONF_COLES_DISCOUNT_AMOUNT,
+    CONF_COLES_ADDITIONAL_STATIONS,
+    CONF_ENABLE_WOOLWORTHS_DISCOUNT,
+    CONF_WOOLWORTHS_DISCOUNT_AMOUNT,
+    CONF_WOOLWORTHS_ADDITIONAL_STATIONS,
+    CONF_ENABLE_RACT_DISCOUNT,
+    CONF_RACT_DISCOUNT_AMOUNT,
+    CONF_RACT_ADDITIONAL_STATIONS,
+    CONF_ENABLE_UNITED_DISCOUNT,
+    CONF_UNITED_DISCOUNT_AMOUNT,
+    CONF_UNITED_ADDITIONAL_STATIONS,
+    CONF_ADD_TYRE_INFLATION_STATIONS,
+    CONF_REMOVE_TYRE_INFLATION_STATIONS,
+    CONF_LOCATION_ENTITY,
+    CONF_EXTRA_LOCATION_ENTITIES,
+    CONF_RANGE,
+    CONF_EXCLUDED_DISTRIBUTORS,
+    CONF_EXCLUDED_OPERATORS,
+    CONF_SKIP_CLOSED_STATIONS,
+    ARRIVAL_SPEED_KMH,
+    CONF_PRICE_FORMAT,
+    PRICE_FORMAT_DOLLARS,
+    PRICE_FORMAT_CENTS,
+    CONF_ENABLE_FILL_COST,
+    CONF_TANK_SIZE,
+    CONF_FUEL_CONSUMPTION,
+    DEFAULT_TANK_SIZE,
+    DEFAULT_FUEL_CONSUMPTION,
+)
+from .trading_hours import NO_TRADING_HOURS, TradingHoursIndex
+
+NO_DATA = "No data found"
+
+# Discount programs in the order they are tried, only the first matching one applies
+DISCOUNT_PROGRAMS = (
+    ("Woolworths", "woolworths", CONF_ENABLE_WOOLWORTHS_DISCOUNT, CONF_WOOLWORTHS_DISCOUNT_AMOUNT, CONF_WOOLWORTHS_ADDITIONAL_STATIONS),
+    ("Coles", "coles", CONF_ENABLE_COLES_DISCOUNT, CONF_COLES_DISCOUNT_AMOUNT, CONF_COLES_ADDITIONAL_STATIONS),
+    ("RACT", "ract", CONF_ENABLE_RACT_DISCOUNT, CONF_RACT_DISCOUNT_AMOUNT, CONF_RACT_ADDITIONAL_STATIONS),
+    ("United", "united", CONF_ENABLE_UNITED_DISCOUNT, CONF_UNITED_DISCOUNT_AMOUNT, CONF_UNITED_ADDITIONAL_STATIONS),
+)
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Calculate the distance between two points in kilometers."""
+    R = 6371  # Radius of Earth in kilometers
+    dLat = radians(lat2 - lat1)
+    dLon = radians(lon2 - lon1)
+    a = sin(dLat / 2) * sin(dLat / 2) + cos(radians(lat1)) * cos(radians(lat2)) * sin(dLon / 2) * sin(dLon / 2)
+    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+    return R * c
+
+
+def stations_within(
+    stations: Iterable[dict],
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    always_include: Collection[str] = (),
+) -> list[dict]:
+    """
+    Return the raw stations within `radius_km` of a point, plus those whose code is in `always_include`.
+    A bounding box check skips the haversine calculation for stations far outside the radius.
+    """
+    lat_delta = radius_km / 111.2
+    lon_delta = radius_km / max(111.2 * cos(radians(latitude)), 1e-6)
+    result = []
+    for station in stations:
+        if str(station.get("code")) in always_include:
+            result.append(station)
+            continue
+        location = station.get("location") or {}
+        station_lat, station_lon = location.get("latitude"), location.get("longitude")
+        if station_lat is None or station_lon is None:
+            continue
+        if abs(station_lat - latitude) > lat_delta or abs(station_lon - longitude) > lon_delta:
+            continue
+        if haversine(latitude, longitude, station_lat, station_lon) <= radius_km:
+            result.append(station)
+    return result
+
+
+class SpatialIndex:
+    """
+    Grid of station locations for radius queries.
+
+    Stations are bucketed into cells of `cell_degrees` square, so a query only
+    measures the distance to stations in the cells its bounding box overlaps.
+    """
+
+    def __init__(self, stations: Iterable[dict], cell_degrees: float = 0.1) -> None:
+        """Index the raw stations of a price snapshot."""
+        self._cell_degrees = cell_degrees
+        self._cells: dict[tuple[int, int], list[tuple[str, float, float]]] = {}
+        for station in stations:
+            location = station.get("location") or {}
+            latitude, longitude = location.get("latitude"), location.get("longitude")
+            if latitude is None or longitude is None:
+                continue
+            self._cells.setdefault(self._cell(latitude, longitude), []).append(
+                (str(station.get("code")), latitude, longitude)
+            )
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        """Return the grid cell of a point."""
+        return floor(latitude / self._cell_degrees), floor(longitude / self._cell_degrees)
+
+    def within(self, latitude: float, longitude: float, radius_km: float) -> Iterable[tuple[str, float]]:
+        """Yield the code and distance in km of every station within `radius_km` of a point."""
+        lat_delta = radius_km / 111.2
+        lon_delta = radius_km / max(111.2 * cos(radians(latitude)), 1e-6)
+        min_row, min_column = self._cell(latitude - lat_delta, longitude - lon_delta)
+        max_row, max_column = self._cell(latitude + lat_delta, longitude + lon_delta)
+        for row in range(min_row, max_row + 1):
+            for column in range(min_column, max_column + 1):
+                for code, station_lat, station_lon in self._cells.get((row, column), ()):
+                    distance = haversine(latitude, longitude, station_lat, station_lon)
+                    if distance <= radius_km:
+                        yield code, distance
+
+    def near_route(self, route: list[tuple[float, float]], buffer_km: float) -> dict[str, tuple[float, float]]:
+        """
+        Return the stations within `buffer_km` of a route given as (latitude, longitude)
+        points, mapped to their distance from the route and how far along it they are, in km.
+        Only the cells around each segment's bounding box are searched.
+        """
+        found: dict[str, tuple[float, float]] = {}
+        if len(route) == 1:
+            route = route * 2
+        travelled = 0.0
+        for start, end in zip(route, route[1:]):
+            lat_delta = buffer_km / 111.2
+            lon_delta = buffer_km / max(111.2 * cos(radians(max(abs(start[0]), abs(end[0])))), 1e-6)
+            min_row, min_column = self._cell(min(start[0], end[0]) - lat_delta, min(start[1], end[1]) - lon_delta)
+            max_row, max_column = self._cell(max(start[0], end[0]) + lat_delta, max(start[1], end[1]) + lon_delta)
+            length = haversine(*start, *end)
+            for row in range(min_row, max_row + 1):
+                for column in range(min_column, max_column + 1):
+                    for code, station_lat, station_lon in self._cells.get((row, column), ()):
+                        offset, fraction = segment_offset(station_lat, station_lon, start, end)
+                        if offset <= buffer_km and (code not in found or offset < found[code][0]):
+                            found[code] = (offset, travelled + fraction * length)
+            travelled += length
+        return found
+
+
+def segment_offset(
+    latitude: float, longitude: float, start: tuple[float, float], end: tuple[float, float]
+) -> tuple[float, float]:
+    """
+    Return the distance in km from a point to the segment between `start` and `end`,
+    and how far along the segment (0 to 1) its closest point is. Uses a flat
+    projection around the point, which is accurate at the scale of a road trip.
+    """
+    km_per_lon = 111.32 * cos(radians(latitude))
+    ax, ay = (start[1] - longitude) * km_per_lon, (start[0] - latitude) * 110.574
+    bx, by = (end[1] - longitude) * km_per_lon, (end[0] - latitude) * 110.574
+    dx, dy = bx - ax, by - ay
+    length_squared = dx * dx + dy * dy
+    fraction = 0.0 if length_squared == 0 else min(1.0, max(0.0, -(ax * dx + ay * dy) / length_squared))
+    return sqrt((ax + fraction * dx) ** 2 + (ay + fraction * dy) ** 2), fraction
+
+
+def parse_station_codes(value: str | None) -> set[str]:
+    """Parse a comma separated list of station codes from the options."""
+    return {s.strip() for s in (value or "").split(',') if s.strip()}
+
+
+def format_last_updated(value: str | None, time_zone: tzinfo) -> str:
+    """Convert a FuelCheck 'dd/mm/yyyy HH:MM:SS' UTC timestamp to local time."""
+    if not value:
+        return "Unknown"
+    try:
+        update_time_utc = datetime.strptime(value, '%d/%m/%Y %H:%M:%S').replace(tzinfo=timezone.utc)
+        return update_time_utc.astimezone(time_zone).strftime('%Y-%m-%d %H:%M:%S')
+    except (ValueError, TypeError) as e:
+        LOGGER.warning("Could not parse timestamp '%s': %s", value, e)
+        return "Invalid Date Format"
+
+
+class FuelPriceEngine:
+    """
+    Turn the raw price, additional data and trading hours payloads into
+    per-station results and cheapest-station summaries.
+
+    Lookups, discounts, distances and per-fuel station lists are built once
+    per payload or location change and shared by every entity, instead of
+    each entity scanning the raw payloads itself.
+    """
+
+    def __init__(self, options: Mapping[str, Any], time_zone: tzinfo) -> None:
+        """Initialize the engine with the config entry options."""
+        self._options = options
+        self._time_zone = time_zone
+        self._cents = options.get(CONF_PRICE_FORMAT, PRICE_FORMAT_DOLLARS) == PRICE_FORMAT_CENTS
+        self._location_configured = bool(options.get(CONF_LOCATION_ENTITY))
+        self._range_km = options.get(CONF_RANGE, 5)
+        self._excluded_distributors = set(options.get(CONF_EXCLUDED_DISTRIBUTORS, []))
+        self._excluded_operators = set(options.get(CONF_EXCLUDED_OPERATORS, []))
+        self._skip_closed = bool(options.get(CONF_SKIP_CLOSED_STATIONS))
+        self._fill_cost = bool(options.get(CONF_ENABLE_FILL_COST))
+        self._tank_size = float(options.get(CONF_TANK_SIZE, DEFAULT_TANK_SIZE))
+        self._consumption = float(options.get(CONF_FUEL_CONSUMPTION, DEFAULT_FUEL_CONSUMPTION))
+
+        self._prices_data: dict | None = None
+        self._additional_data: dict | None = None
+        self._trading_hours: dict | None = None
+        # Origin -> (latitude, longitude); None is the main location entity, other origins are extra entity ids
+        self._locations: dict[str | None, tuple[float | None, float | None]] = {
+            origin: (None, None) for origin in [None, *options.get(CONF_EXTRA_LOCATION_ENTITIES, [])]
+        }
+
+        self._stations: dict[str, dict] = {}
+        self._prices: dict[tuple[str, str], dict] = {}
+        self._station_prices: dict[str, list[dict]] = {}
+        self._discounts: dict[str, tuple[str, float]] = {}
+        self._tyre_stations: set[str] = set()
+        # Origin -> station code -> distance, rebuilt for every origin at once
+        self._distances: dict[str | None, dict[str, float | None]] | None = None
+        # (fuel type, origin) -> station list
+        self._station_lists: dict[tuple[str, str | None], list[dict]] = {}
+        self._spatial_index: SpatialIndex | None = None
+        self._hours_index: TradingHoursIndex | None = None
+
+    @property
+    def unit(self) -> str:
+        """Return the unit prices are reported in."""
+        return "c/L" if self._cents else "AUD/L"
+
+    @property
+    def has_prices(self) -> bool:
+        """Return True if a price snapshot is loaded."""
+        return bool(self._prices_data)
+
+    def sync(
+        self,
+        prices: dict | None,
+        additional_data: dict | None,
+        trading_hours: dict | None,
+    ) -> None:
+        """Load the current payloads, rebuilding only what depends on a payload that changed."""
+        if prices is not self._prices_data:
+            self._prices_data = prices
+            self._index_prices()
+            self._distances = None
+            self._spatial_index = None
+            self._station_lists = {}
+        if additional_data is not self._additional_data:
+            self._additional_data = additional_data
+            self._index_additional_data()
+            self._station_lists = {}
+        if trading_hours is not self._trading_hours:
+            self._trading_hours = trading_hours
+            self._hours_index = None
+            self._station_lists = {}
+
+    @property
+    def location(self) -> tuple[float, float] | None:
+        """Return the location distances are measured from, None when it is not known."""
+        latitude, longitude = self._locations[None]
+        if latitude is None or longitude is None:
+            return None
+        return latitude, longitude
+
+    def set_location(self, latitude: float | None, longitude: float | None, origin: str | None = None) -> None:
+        """
+        Set the location distances are measured from, None when it is unknown.
+        `origin` is the extra location entity that moved, None for the main one.
+        """
+        if (latitude, longitude) == self._locations.get(origin):
+            return
+        self._locations[origin] = (latitude, longitude)
+        self._distances = None
+        # Station lists measured from the other origins keep their distances
+        self._station_lists = {key: value for key, value in self._station_lists.items() if key[1] != origin}
+
+    def _index_prices(self) -> None:
+        """Index the price snapshot by station and by station and fuel."""
+        data = self._prices_data or {}
+        self._stations = {str(s['code']): s for s in data.get('stations', [])}
+        self._prices = {}
+        self._station_prices = {}
+        for price_info in data.get('prices', []):
+            code = str(price_info.get("stationcode"))
+            # The first price listed for a station and fuel wins
+            self._prices.setdefault((code, price_info.get("fueltype")), price_info)
+            self._station_prices.setdefault(code, []).append(price_info)
+
+    def _index_additional_data(self) -> None:
+        """Resolve the discount and tyre inflation lists against the options."""
+        additional_data = self._additional_data or {}
+        options = self._options
+
+        self._discounts = {}
+        for provider, key, enable_key, amount_key, extra_key in DISCOUNT_PROGRAMS:
+            amount = float(options.get(amount_key, 0))
+            # A program without a discount must not stop a later one from applying
+            if not options.get(enable_key) or not amount:
+                continue
+            for code in set(additional_data.get(key, [])) | parse_station_codes(options.get(extra_key)):
+                self._discounts.setdefault(code, (provider, amount))
+
+        github_list = set(additional_data.get("tyre_inflation", []))
+        remove_list = parse_station_codes(options.get(CONF_REMOVE_TYRE_INFLATION_STATIONS))
+        self._tyre_stations = (github_list - remove_list) | parse_station_codes(
+            options.get(CONF_ADD_TYRE_INFLATION_STATIONS)
+        )
+
+    def _build_distance_matrix(self) -> None:
+        """Compute the distance from every known origin to every station in one pass over the stations."""
+        origins = [
+            (origin, latitude, longitude)
+            for origin, (latitude, longitude) in self._locations.items()
+            if latitude and longitude
+        ]
+        self._distances = {origin: {} for origin in self._locations}
+        for station_code, station_info in self._stations.items():
+            location = station_info.get("location")
+            if not location or not location["latitude"] or not location["longitude"]:
+                continue
+            station_lat, station_lon = location["latitude"], location["longitude"]
+            for origin, latitude, longitude in origins:
+                self._distances[origin][station_code] = haversine(latitude, longitude, station_lat, station_lon)
+
+    def _distance(self, code: str, origin: str | None = None) -> float | None:
+        """Return the distance from an origin to a station, computing the distance matrix on first use."""
+        if self._distances is None:
+            self._build_distance_matrix()
+        return self._distances.get(origin, {}).get(code)
+
+    def _origin_configured(self, origin: str | None) -> bool:
+        """Return True if distances are measured from an origin."""
+        return self._location_configured if origin is None else origin in self._locations
+
+    def distance(self, code: str) -> float | None:
+        """Return the distance to a station in km, None when no location is configured or it is unknown."""
+        if not self._location_configured:
+            return None
+        return self._distance(code)
+
+    def fill_cost_attributes(self, code: str, discounted_price: float, origin: str | None = None) -> dict:
+        """
+        Return the total cost in dollars of filling the tank at a station, and
+        the part of it spent driving there and back, from a price in dollars.
+        """
+        distance = self._distance(code, origin) if self._origin_configured(origin) else None
+        travel_cost = 2 * (distance or 0.0) * self._consumption / 100 * discounted_price
+        return {
+            ATTR_FILL_COST: round(self._tank_size * discounted_price + travel_cost, 2),
+            ATTR_TRAVEL_COST: round(travel_cost, 2),
+        }
+
+    def distance_attributes(self, code: str, origin: str | None = None) -> dict:
+        """Return the distance and in_range attributes of a station, measured from an origin."""
+        if not self._origin_configured(origin):
+            return {ATTR_DISTANCE: "Not Configured", ATTR_IN_RANGE: True}
+
+        distance = self._distance(code, origin)
+        return {
+            ATTR_DISTANCE: f"{distance:.2f} km" if distance is not None else "Unknown",
+            ATTR_IN_RANGE: distance <= self._range_km if distance is not None else True,
+        }
+
+    def format_price(self, cents: float) -> float:
+        """Convert a price in cents to the configured price format."""
+        if self._cents:
+            return round(cents, 1)
+        return round(cents / 100.0, 3)
+
+    def to_cents(self, price: float) -> float:
+        """Convert a price in the configured price format to cents."""
+        return price if self._cents else price * 100
+
+    def station(self, code: str) -> dict | None:
+        """Return the raw station details."""
+        return self._stations.get(code)
+
+    @property
+    def hours_index(self) -> TradingHoursIndex:
+        """Return the weekly open intervals of every station, compiled on first use."""
+        if self._hours_index is None:
+            self._hours_index = TradingHoursIndex(self._trading_hours if isinstance(self._trading_hours, dict) else None)
+        return self._hours_index
+
+    def open_at_arrival(self, code: str, when: datetime, distance_km: float | None) -> bool | None:
+        """
+        Return whether a station will be open when you get there, setting off at
+        `when` and driving `distance_km` at ARRIVAL_SPEED_KMH. None when its hours are unknown.
+        """
+        arrival = when + timedelta(hours=(distance_km or 0.0) / ARRIVAL_SPEED_KMH)
+        return self.hours_index.is_open(code, arrival.astimezone(self._time_zone))
+
+    def next_open_change(self, fuel_type: str, origin: str | None, now: datetime) -> datetime | None:
+        """
+        Return the next time a station in range opens or closes by the time you
+        would get there, so `summary` can be worked out again. None when closed
+        stations are not skipped or no station in range has known hours.
+        """
+        if not self._skip_closed:
+            return None
+        configured = self._origin_configured(origin)
+        changes = []
+        for station in self.station_list(fuel_type, origin):
+            if not station[ATTR_IN_RANGE]:
+                continue
+            distance_km = self._distance(station["code"], origin) if configured else None
+            travel = timedelta(hours=(distance_km or 0.0) / ARRIVAL_SPEED_KMH)
+            change = self.hours_index.next_change(station["code"], (now + travel).astimezone(self._time_zone))
+            if change is not None:
+                changes.append(change - travel)
+        return min(changes, default=None)
+
+    def trading_hours(self, code: str) -> Any:
+        """Return the trading hours of a station."""
+        return (self._trading_hours or {}).get(code, NO_TRADING_HOURS)
+
+    def distributor(self, code: str) -> str:
+        """Return the distributor of a station."""
+        return (self._additional_data or {}).get("distributors", {}).get(code, NO_DATA)
+
+    def operator(self, code: str) -> str:
+        """Return the operator of a station."""
+        return (self._additional_data or {}).get("operators", {}).get(code, NO_DATA)
+
+    def station_result(self, code: str, fuel_type: str) -> dict | None:
+        """
+        Return the price, discount and station details of one station and fuel.
+        Returns None when the station has no price for the fuel.
+        """
+        station_info = self._stations.get(code)
+        price_info = self._prices.get((code, fuel_type))
+        if not station_info or not price_info or price_info.get('price') is None:
+            return None
+
+        price = float(price_info['price'])
+        discount_provider, discount_amount = "None", 0.0
+        if self._additional_data:
+            discount_provider, discount_amount = self._discounts.get(code, ("None", 0.0))
+
+        station_prices = self._station_prices.get(code, [])
+        latest_update = max(
+            (p.get("lastupdated") for p in station_prices if p.get("lastupdated")),
+            default=None,
+        )
+        distributor = self.distributor(code)
+        operator_name = self.operator(code)
+
+        return {
+            "station": station_info,
+            "price": price,
+            "discounted_price": price - discount_amount,
+            "discount_amount": discount_amount,
+            "discount_provider": discount_provider,
+            "tyre_inflation": bool(self._additional_data) and code in self._tyre_stations,
+            "distributor": distributor,
+            "operator": operator_name,
+            "distributor_excluded": distributor in self._excluded_distributors,
+            "operator_excluded": operator_name in self._excluded_operators,
+            "trading_hours": self.trading_hours(code),
+            "all_prices": [{"fueltype": p.get("fueltype"), "price": p.get("price")} for p in station_prices],
+            "last_updated": format_last_updated(latest_update, self._time_zone),
+        }
+
+    def station_list(self, fuel_type: str, origin: str | None = None) -> list[dict]:
+        """
+        Return every station with a price for the fuel, as listed in the summary sensors,
+        with distances from `origin`: an extra location entity, or None for the main one.
+        """
+        if (fuel_type, origin) in self._station_lists:
+            return self._station_lists[(fuel_type, origin)]
+        if not self._prices_data or not self._additional_data:
+            return []
+
+        processed_stations = []
+        for code, station_info in self._stations.items():
+            price_info = self._prices.get((code, fuel_type))
+            if not price_info or price_info.get('price') is None:
+                continue
+
+            price = float(price_info['price'])
+            _, discount_amount = self._discounts.get(code, (None, 0.0))
+            discounted_price = round((price - discount_amount) / 100.0, 3)
+            station = {
+                "name": station_info.get("name"),
+                "address": station_info.get("address"),
+                "code": code,
+                "price": round(price / 100.0, 3),
+                "discounted_price": discounted_price,
+                "distributor": self.distributor(code),
+                "operator": self.operator(code),
+                ATTR_TYRE_INFLATION: code in self._tyre_stations,
+                ATTR_TRADING_HOURS: self.trading_hours(code),
+                **self.distance_attributes(code, origin),
+            }
+            if self._fill_cost:
+                # Shares the distance pass above, so every station is ranked from one batch
+                station.update(self.fill_cost_attributes(code, discounted_price, origin))
+            processed_stations.append(station)
+
+        self._station_lists[(fuel_type, origin)] = processed_stations
+        return processed_stations
+
+    @property
+    def fill_cost_enabled(self) -> bool:
+        """Return True if stations are also ranked by the total cost of a fill."""
+        return self._fill_cost
+
+    def summary(
+        self,
+        fuel_type: str,
+        filtered: bool = False,
+        by_fill_cost: bool = False,
+        origin: str | None = None,
+        now: datetime | None = None,
+    ) -> list[dict]:
+        """
+        Return the cheapest station in range, followed by the cheapest one with
+        tyre inflation if that is a different station. With `filtered`, stations
+        from excluded distributors and operators are skipped. With `by_fill_cost`,
+        stations are ranked by the total cost of a fill instead of the price.
+        The range is measured from `origin`, None for the main location entity.
+        When closed stations are skipped, those known to be closed by the time
+        you would get there, setting off `now`, are left out.
+        """
+        candidates = [s for s in self.station_list(fuel_type, origin) if s[ATTR_IN_RANGE]]
+        if self._skip_closed and now is not None:
+            configured = self._origin_configured(origin)
+            candidates = [
+                s for s in candidates
+                if self.open_at_arrival(
+                    s["code"], now, self._distance(s["code"], origin) if configured else None
+                ) is not False
+            ]
+        if filtered:
+            candidates = [
+                s for s in candidates
+                if s["distributor"] not in self._excluded_distributors
+                and s["operator"] not in self._excluded_operators
+            ]
+        if not candidates:
+            return []
+
+        sort_key = ATTR_FILL_COST if by_fill_cost and self._fill_cost else "discounted_price"
+        sorted_stations = sorted(candidates, key=operator.itemgetter(sort_key))
+        cheapest_overall = sorted_stations[0]
+        cheapest_with_tyres = next((s for s in sorted_stations if s[ATTR_TYRE_INFLATION]), None)
+
+        if cheapest_with_tyres and cheapest_with_tyres["code"] != cheapest_overall["code"]:
+            return [cheapest_overall, cheapest_with_tyres]
+        return [cheapest_overall]
+
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        """Return the spatial index of the stations in the price snapshot, built on first use."""
+        if self._spatial_index is None:
+            self._spatial_index = SpatialIndex(self._stations.values())
+        return self._spatial_index
+
+    def find_cheapest(
+        self,
+        fuel_type: str,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: int,
+        filtered: bool = False,
+        exclude: Collection[str] = (),
+        open_at: datetime | None = None,
+    ) -> list[dict]:
+        """
+        Return up to `limit` stations within `radius_km` of a point, cheapest
+        discounted price first and nearest first among equal prices. With
+        `filtered`, stations from excluded distributors and operators are
+        skipped; with `open_at`, stations known to be closed by the time you
+        would get there from the point, setting off at `open_at`, are.
+        """
+        return self._rank(
+            fuel_type,
+            (
+                (code, distance, distance, {})
+                for code, distance in self.spatial_index.within(latitude, longitude, radius_km)
+            ),
+            limit,
+            filtered,
+            exclude,
+            open_at,
+        )
+
+    def find_along_route(
+        self,
+        fuel_type: str,
+        route: list[tuple[float, float]],
+        buffer_km: float,
+        limit: int,
+        filtered: bool = False,
+        exclude: Collection[str] = (),
+        open_at: datetime | None = None,
+    ) -> list[dict]:
+        """
+        Return up to `limit` stations within `buffer_km` of a route, cheapest
+        discounted price first and smallest detour first among equal prices.
+        The detour is the round trip from the nearest point of the route, and
+        `open_at` is when the route is started.
+        """
+        return self._rank(
+            fuel_type,
+            (
+                (code, 2 * offset, along + offset, {"along_route": round(along, 2)})
+                for code, (offset, along) in self.spatial_index.near_route(route, buffer_km).items()
+            ),
+            limit,
+            filtered,
+            exclude,
+            open_at,
+            distance_key="detour",
+        )
+
+    def _rank(
+        self,
+        fuel_type: str,
+        nearby: Iterable[tuple[str, float, float, dict]],
+        limit: int,
+        filtered: bool,
+        exclude: Collection[str],
+        open_at: datetime | None,
+        distance_key: str = "distance",
+    ) -> list[dict]:
+        """
+        Return the cheapest of the (code, distance, km to drive there, extra attributes)
+        stations, ranked by discounted price and then distance, after the query filters.
+        """
+        candidates = []
+        for code, distance, travel_km, extra in nearby:
+            price_info = self._prices.get((code, fuel_type))
+            if code in exclude or not price_info or price_info.get('price') is None:
+                continue
+            if filtered and (
+                self.distributor(code) in self._excluded_distributors
+                or self.operator(code) in self._excluded_operators
+            ):
+                continue
+            open_now = self.open_at_arrival(code, open_at, travel_km) if open_at is not None else None
+            if open_now is False:
+                continue
+            price = float(price_info['price'])
+            discount_provider, discount_amount = self._discounts.get(code, ("None", 0.0))
+            candidates.append((price - discount_amount, distance, code, price, discount_provider, open_now, extra))
+
+        results = []
+        for discounted, distance, code, price, discount_provider, open_now, extra in heapq.nsmallest(
+            limit, candidates, key=operator.itemgetter(0, 1, 2)
+        ):
+            station_info = self._stations[code]
+            results.append({
+                "station_id": code,
+                "name": station_info.get("name"),
+                "address": station_info.get("address"),
+                "price": self.format_price(price),
+                "discounted_price": self.format_price(discounted),
+                "discount_provider": discount_provider,
+                distance_key: round(distance, 2),
+                **extra,
+                "distributor": self.distributor(code),
+                "operator": self.operator(code),
+                "open": open_now,
+            })
+        return results
+
+    def summary_value(self, summary: list[dict]) -> float | None:
+        """Return the state of a summary sensor: the cheapest price in the configured format."""
+        if not summary:
+            return None
+        if self._cents:
+            return round(summary[0]["discounted_price"] * 100, 1)
+        return summary[0]["discounted_price"]
@@ -0,0 +1,60 @@
+"""Diagnostics support for the Tasmanian Fuel Prices integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .api import TasFuelAPI
+from .const import DOMAIN, CONF_API_KEY, CONF_API_SECRET
+from .metrics import count_records
+
+TO_REDACT = {CONF_API_KEY, CONF_API_SECRET, "access_token"}
+
+# Snapshot and metrics key of each coordinator in the data bundle
+COORDINATORS = {
+    "prices": "price_coordinator",
+    "additional_data": "additional_data_coordinator",
+    "trading_hours": "trading_hours_coordinator",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data_bundle = hass.data[DOMAIN][entry.entry_id]
+    api: TasFuelAPI = data_bundle["api"]
+
+    coordinators = {}
+    for group, coordinator_key in COORDINATORS.items():
+        coordinator = data_bundle[coordinator_key]
+        snapshot_time = api.snapshot_time(group)
+        coordinators[group] = {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": str(coordinator.update_interval) if coordinator.update_interval else None,
+            "snapshot_time": snapshot_time.isoformat() if snapshot_time else None,
+            "stale": api.is_stale(group),
+            "records": count_records(coordinator.data),
+            "metrics": api.metrics.summary(group),
+        }
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "token_expiry": api.token_expiry.isoformat() if api.token_expiry else None,
+        "coordinators": coordinators,
+        "transfers": api.fetch_stats,
+        "circuit_breakers": api.circuit_states,
+        "adaptive_polling": data_bundle["adaptive_polling"].as_dict(),
+        "registry_cleanup": data_bundle.get("registry_cleanup"),
+        "price_history_records": len(data_bundle["price_history"]),
+        "price_alerts": len(data_bundle["price_alerts"]),
+        "statistics_import": (
+            data_bundle["statistics_importer"].last_import if data_bundle["statistics_importer"] else None
+        ),
+    }
@@ -0,0 +1,257 @@
+"""Compact price history for the Tasmanian Fuel Prices integration."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import NamedTuple
+
+from .snapshot import PriceChange
+
+
+class PriceRecord(NamedTuple):
+    """A price and the time (UTC epoch seconds) it was first seen."""
+
+    timestamp: float
+    price: float
+
+
+class PriceStats(NamedTuple):
+    """Summary of the prices in effect during a period."""
+
+    changes: int
+    minimum: float | None
+    maximum: float | None
+    mean: float | None
+
+
+class PriceRing:
+    """
+    Time-ordered (timestamp, price) records for one station and fuel type.
+
+    Records are held in two parallel `array('d')` buffers that grow up to
+    `capacity` and then wrap, overwriting the oldest record. A record that
+    repeats the latest price, or is older than it, is ignored.
+    """
+
+    __slots__ = ("_capacity", "_times", "_prices", "_start")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty ring."""
+        self._capacity = capacity
+        self._times = array("d")
+        self._prices = array("d")
+        # Physical index of the oldest record, only moves once the ring is full
+        self._start = 0
+
+    def __len__(self) -> int:
+        """Return the number of records held."""
+        return len(self._times)
+
+    def _index(self, position: int) -> int:
+        """Return the buffer index of the record at a logical position, oldest first."""
+        return (self._start + position) % len(self._times)
+
+    def append(self, timestamp: float, price: float) -> bool:
+        """Add a record, returning False if it was ignored."""
+        if self._times:
+            last = self._index(len(self._times) - 1)
+            if price == self._prices[last] or timestamp < self._times[last]:
+                return False
+        if len(self._times) < self._capacity:
+            self._times.append(timestamp)
+            self._prices.append(price)
+        else:
+            self._times[self._start] = timestamp
+            self._prices[self._start] = price
+            self._start = (self._start + 1) % self._capacity
+        return True
+
+    def _bisect(self, timestamp: float, inclusive: bool) -> int:
+        """Return the number of records before `timestamp`, or at or before it when `inclusive`."""
+        low, high = 0, len(self._times)
+        while low < high:
+            middle = (low + high) // 2
+            value = self._times[self._index(middle)]
+            if value < timestamp or (inclusive and value == timestamp):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def latest(self) -> PriceRecord | None:
+        """Return the newest record."""
+        if not self._times:
+            return None
+        index = self._index(len(self._times) - 1)
+        return PriceRecord(self._times[index], self._prices[index])
+
+    def price_at(self, timestamp: float) -> PriceRecord | None:
+        """Return the record in effect at `timestamp`, None if it is older than the history."""
+        position = self._bisect(timestamp, inclusive=True) - 1
+        if position < 0:
+            return None
+        index = self._index(position)
+        return PriceRecord(self._times[index], self._prices[index])
+
+    def records(self, start: float | None = None, end: float | None = None) -> list[PriceRecord]:
+        """Return the records between `start` and `end`, oldest first."""
+        first = 0 if start is None else self._bisect(start, inclusive=False)
+        last = len(self._times) if end is None else self._bisect(end, inclusive=True)
+        return [
+            PriceRecord(self._times[index], self._prices[index])
+            for index in (self._index(position) for position in range(first, last))
+        ]
+
+    def since(self, timestamp: float) -> PriceRing:
+        """Return a detached copy of the records from `timestamp` on, with the price already in effect then."""
+        records = self.records(timestamp)
+        if (prevailing := self.price_at(timestamp)) is not None and prevailing.timestamp < timestamp:
+            records.insert(0, prevailing)
+        ring = PriceRing(max(len(records), 1))
+        for record in records:
+            ring.append(*record)
+        return ring
+
+    def stats(self, start: float | None = None, end: float | None = None) -> PriceStats:
+        """
+        Return the lowest, highest and mean price in effect between `start` and `end`.
+
+        The mean is weighted by how long each price held within the period. An
+        open `end` means now, an open `start` the oldest record.
+        """
+        records = self.records(start, end)
+        changes = len(records)
+        # A price set before the period is in effect from its start, one set exactly at it is already a record
+        if start is not None and (prevailing := self.price_at(start)) is not None and prevailing.timestamp < start:
+            records.insert(0, PriceRecord(start, prevailing.price))
+        if not records:
+            return PriceStats(0, None, None, None)
+        prices = [record.price for record in records]
+        close = max(time.time() if end is None else end, records[-1].timestamp)
+        bounds = [record.timestamp for record in records[1:]] + [close]
+        duration = close - records[0].timestamp
+        if duration > 0:
+            mean = sum(record.price * (until - record.timestamp) for record, until in zip(records, bounds)) / duration
+        else:
+            mean = sum(prices) / len(prices)
+        return PriceStats(changes, min(prices), max(prices), mean)
+
+
+class PriceHistory:
+    """Price change history of every station and fuel type, one ring buffer per pair."""
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty history keeping up to `capacity` changes per station and fuel."""
+        self._capacity = capacity
+        self._series: dict[tuple[str, str], PriceRing] = {}
+
+    def __len__(self) -> int:
+        """Return the number of records held across every series."""
+        return sum(len(ring) for ring in self._series.values())
+
+    def add(self, station_code: str, fuel_type: str, timestamp: float, price: float) -> bool:
+        """Add one record, returning False if it was ignored."""
+        ring = self._series.get((station_code, fuel_type))
+        if ring is None:
+            ring = self._series[(station_code, fuel_type)] = PriceRing(self._capacity)
+        return ring.append(timestamp, price)
+
+    def record_changes(self, timestamp: float, changes: Iterable[PriceChange]) -> list[list]:
+        """
+        Add the new prices of a snapshot diff, seen at `timestamp`.
+        Returns the records that were added as journal rows.
+        """
+        rows = []
+        for change in changes:
+            if change.new_price is None:
+                continue
+            if self.add(change.station_code, change.fuel_type, timestamp, change.new_price):
+                rows.append([timestamp, change.station_code, change.fuel_type, change.new_price])
+        return rows
+
+    def items(self) -> Iterator[tuple[tuple[str, str], PriceRing]]:
+        """Yield every (station code, fuel type) key with its ring buffer."""
+        yield from self._series.items()
+
+    def series(self, station_code: str, fuel_type: str) -> PriceRing | None:
+        """Return the ring buffer of one station and fuel type."""
+        return self._series.get((station_code, fuel_type))
+
+    def rows(self) -> Iterator[list]:
+        """Yield every record as a journal row."""
+        for (station_code, fuel_type), ring in self._series.items():
+            for record in ring.records():
+                yield [record.timestamp, station_code, fuel_type, record.price]
+
+
+class HistoryJournal:
+    """
+    Append-only JSON-lines file persisting a `PriceHistory` incrementally.
+
+    Each refresh appends only the records it added. Once the file holds much
+    more than the history (records the ring buffers have since overwritten),
+    it is rewritten from the history. All methods do file I/O and must run in
+    an executor.
+    """
+
+    def __init__(self, path: str | Path, compact_slack: int) -> None:
+        """Initialize the journal."""
+        self._path = Path(path)
+        self._compact_slack = compact_slack
+        self._lines = 0
+        self._lock = threading.Lock()
+
+    def needs_compaction(self, history_size: int) -> bool:
+        """Return True if the journal holds well over `history_size` records."""
+        return self._lines > 2 * history_size + self._compact_slack
+
+    def load(self, history: PriceHistory) -> int:
+        """Add every journal record to `history`, returning the number of records read."""
+        with self._lock:
+            if not self._path.exists():
+                return 0
+            rows = []
+            with open(self._path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        rows.append(json.loads(line))
+                    except ValueError:
+                        continue  # A line cut short by a crash
+            self._lines = len(rows)
+        # Appends from concurrent refreshes may be out of order
+        rows.sort(key=lambda row: row[0])
+        for timestamp, station_code, fuel_type, price in rows:
+            history.add(station_code, fuel_type, timestamp, price)
+        return len(rows)
+
+    def append(self, rows: list[list]) -> None:
+        """Append records to the journal."""
+        with self._lock:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._path, "a", encoding="utf-8") as file:
+                file.writelines(json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+            self._lines += len(rows)
+
+    def save(self, rows: list[list], snapshot: list[list] | None = None) -> None:
+        """
+        Append the records one refresh added, or when `snapshot` is given,
+        rewrite the journal as that snapshot (which already holds them).
+        """
+        if snapshot is not None:
+            self.compact(snapshot)
+        else:
+            self.append(rows)
+
+    def compact(self, rows: list[list]) -> None:
+        """Replace the journal with exactly these records."""
+        with self._lock:
+            temp_path = self._path.with_suffix(".tmp")
+            with open(temp_path, "w", encoding="utf-8") as file:
+                file.writelines(json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+            os.replace(temp_path, self._path)
+            self._lines = len(rows)
@@ -0,0 +1,169 @@
+"""Refresh cycle metrics for the Tasmanian Fuel Prices integration."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+import math
+import sys
+import time
+from typing import Any
+
+STAGES = ("auth", "fetch", "decode", "normalize", "index", "cycles", "alerts", "fan_out")
+PERCENTILES = (50, 90, 99)
+
+
+def count_records(data: Any) -> int:
+    """Return the number of records in a decoded payload: list items, or the items of every list in a dict."""
+    if isinstance(data, list):
+        return len(data)
+    if isinstance(data, dict):
+        lists = [value for value in data.values() if isinstance(value, list)]
+        return sum(len(value) for value in lists) if lists else len(data)
+    return 0
+
+
+def deep_sizeof(obj: Any) -> int:
+    """Estimate the memory held by a decoded payload, counting shared objects once."""
+    seen: set[int] = set()
+    size = 0
+    pending = [obj]
+    while pending:
+        item = pending.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            pending.extend(item)
+    return size
+
+
+def percentile(sorted_values: list[float], pct: int) -> float:
+    """Return the nearest-rank percentile of an already sorted list."""
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class RefreshMetrics:
+    """
+    Per-stage durations, byte counts and record counts for each coordinator.
+
+    Stages recorded while a refresh cycle is open are summed, since one cycle
+    can make several requests, and the totals are kept as one sample when the
+    cycle ends. The most recent `sample_size` samples of each stage are kept
+    for percentiles.
+    """
+
+    def __init__(self, sample_size: int) -> None:
+        """Initialize the metrics."""
+        self._sample_size = sample_size
+        self._open: dict[str, dict[str, dict[str, float]]] = {}
+        self._last: dict[str, dict[str, dict[str, float]]] = {}
+        self._durations: dict[str, dict[str, deque[float]]] = {}
+        self._cycle_durations: dict[str, deque[float]] = {}
+        self._snapshot_bytes: dict[str, int] = {}
+
+    def begin_cycle(self, group: str) -> None:
+        """Start collecting the stages of a refresh cycle."""
+        self._open[group] = {"_cycle": {"start": time.perf_counter()}}
+
+    def end_cycle(self, group: str) -> None:
+        """Keep the stages collected since `begin_cycle` as one sample."""
+        stages = self._open.pop(group, None)
+        if stages is None:
+            return
+        cycle_ms = (time.perf_counter() - stages.pop("_cycle")["start"]) * 1000
+        self._cycle_durations.setdefault(group, deque(maxlen=self._sample_size)).append(cycle_ms)
+        for stage, sample in stages.items():
+            self._keep(group, stage, sample)
+
+    def record(
+        self,
+        group: str,
+        stage: str,
+        duration_ms: float,
+        byte_count: int | None = None,
+        record_count: int | None = None,
+    ) -> None:
+        """Record one stage measurement, adding it to the open cycle if there is one."""
+        sample = {"duration_ms": duration_ms, "bytes": byte_count, "records": record_count}
+        if (stages := self._open.get(group)) is None:
+            self._keep(group, stage, sample)
+            return
+
+        total = stages.setdefault(stage, {"duration_ms": 0.0, "bytes": None, "records": None})
+        total["duration_ms"] += duration_ms
+        for key in ("bytes", "records"):
+            if sample[key] is not None:
+                total[key] = (total[key] or 0) + sample[key]
+
+    @contextmanager
+    def stage(self, group: str, stage: str) -> Iterator[dict[str, int | None]]:
+        """Time a block of code as a stage; the block may set 'bytes' and 'records' on the yielded dict."""
+        counts: dict[str, int | None] = {"bytes": None, "records": None}
+        start = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            self.record(
+                group,
+                stage,
+                (time.perf_counter() - start) * 1000,
+                counts["bytes"],
+                counts["records"],
+            )
+
+    def set_snapshot_size(self, group: str, size: int) -> None:
+        """Remember the estimated memory size of the snapshot a coordinator is serving."""
+        self._snapshot_bytes[group] = size
+
+    def _keep(self, group: str, stage: str, sample: dict[str, float]) -> None:
+        """Store a finished stage sample."""
+        self._last.setdefault(group, {})[stage] = sample
+        durations = self._durations.setdefault(group, {})
+        durations.setdefault(stage, deque(maxlen=self._sample_size)).append(sample["duration_ms"])
+
+    def last_cycle_ms(self, group: str) -> float | None:
+        """Return how long the last complete refresh cycle of a coordinator took."""
+        if durations := self._cycle_durations.get(group):
+            return round(durations[-1], 1)
+        return None
+
+    def summary(self, group: str) -> dict[str, Any]:
+        """Return the last sample and recent percentiles of every stage of a coordinator."""
+        stages = {}
+        last = self._last.get(group, {})
+        for stage, durations in self._durations.get(group, {}).items():
+            ordered = sorted(durations)
+            stages[stage] = {
+                "last_ms": round(last[stage]["duration_ms"], 1),
+                **{f"p{pct}_ms": round(percentile(ordered, pct), 1) for pct in PERCENTILES},
+                "samples": len(ordered),
+                "bytes": last[stage]["bytes"],
+                "records": last[stage]["records"],
+            }
+
+        cycle = {}
+        if cycle_durations := self._cycle_durations.get(group):
+            ordered = sorted(cycle_durations)
+            cycle = {
+                "last_ms": round(cycle_durations[-1], 1),
+                **{f"p{pct}_ms": round(percentile(ordered, pct), 1) for pct in PERCENTILES},
+                "samples": len(ordered),
+            }
+
+        return {
+            "cycle": cycle,
+            # Known stages first, in pipeline order
+            "stages": dict(sorted(stages.items(), key=lambda s: STAGES.index(s[0]) if s[0] in STAGES else len(STAGES))),
+            "snapshot_bytes": self._snapshot_bytes.get(group),
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the summary of every coordinator."""
+        groups = set(self._durations) | set(self._cycle_durations) | set(self._snapshot_bytes)
+        return {group: self.summary(group) for group in sorted(groups)}
@@ -0,0 +1,104 @@
+"""Adaptive polling interval for the Tasmanian Fuel Prices integration."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+# Weight given to the newest observation when smoothing hourly activity
+ACTIVITY_SMOOTHING = 0.3
+# Share of the busiest hour's activity at which an hour counts as busy
+ACTIVE_RATIO = 0.5
+HOURS_PER_DAY = 24
+
+
+class AdaptivePollingController:
+    """
+    Learn when prices change during the day and pick the next poll interval.
+
+    Activity is tracked as a smoothed "price changes per hour" figure for each
+    local hour of the day. Busy hours are polled at the floor interval, quiet
+    hours back off towards the ceiling.
+    """
+
+    def __init__(
+        self,
+        default_interval: timedelta,
+        min_interval: timedelta,
+        max_interval: timedelta,
+    ) -> None:
+        """Initialize the controller."""
+        self._min_interval = min_interval
+        self._max_interval = max(max_interval, min_interval)
+        self._default_interval = min(max(default_interval, self._min_interval), self._max_interval)
+        self._activity: list[float | None] = [None] * HOURS_PER_DAY
+        self._last_poll: datetime | None = None
+        self._last_change_count = 0
+
+    @property
+    def activity(self) -> list[float | None]:
+        """Return the learned changes-per-hour figure for each hour of the day."""
+        return list(self._activity)
+
+    def record_poll(self, when: datetime, change_count: int) -> None:
+        """Record how many prices changed since the previous poll."""
+        if self._last_poll is not None and when > self._last_poll:
+            elapsed_hours = max((when - self._last_poll).total_seconds() / 3600, 1 / 60)
+            rate = change_count / elapsed_hours
+
+            # Spread the observation across every hour the poll window covered
+            hour = self._last_poll.replace(minute=0, second=0, microsecond=0)
+            while hour <= when:
+                previous = self._activity[hour.hour]
+                self._activity[hour.hour] = (
+                    rate if previous is None else previous + ACTIVITY_SMOOTHING * (rate - previous)
+                )
+                hour += timedelta(hours=1)
+
+        self._last_poll = when
+        self._last_change_count = change_count
+
+    def next_interval(self, when: datetime) -> timedelta:
+        """Return how long to wait before the next poll."""
+        known = [a for a in self._activity if a is not None]
+        if not known:
+            return self._default_interval
+
+        peak = max(known)
+        upcoming = [self._activity[(when.hour + offset) % HOURS_PER_DAY] for offset in (0, 1)]
+        if all(a is None for a in upcoming):
+            # Nothing learned about this window yet, keep sampling it normally
+            seconds = self._default_interval.total_seconds()
+        elif peak <= 0:
+            seconds = self._max_interval.total_seconds()
+        else:
+            ratio = max(a for a in upcoming if a is not None) / peak
+            span = (self._max_interval - self._min_interval).total_seconds()
+            seconds = self._max_interval.total_seconds() - ratio * span
+
+        if self._last_change_count:
+            # Prices moved on the last poll, so a burst may be underway
+            seconds = (self._min_interval.total_seconds() + seconds) / 2
+
+        if peak > 0:
+            # Don't sleep through the start of the next busy hour
+            next_hour = when.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+            while (next_hour - when).total_seconds() < seconds:
+                activity = self._activity[next_hour.hour]
+                if activity is not None and activity / peak >= ACTIVE_RATIO:
+                    seconds = (next_hour - when).total_seconds()
+                    break
+                next_hour += timedelta(hours=1)
+
+        seconds = min(max(seconds, self._min_interval.total_seconds()), self._max_interval.total_seconds())
+        return timedelta(seconds=round(seconds))
+
+    def as_dict(self) -> dict:
+        """Return the learned state for persistence."""
+        return {"activity": self._activity}
+
+    def load(self, data: dict | None) -> None:
+        """Restore learned state saved by `as_dict`."""
+        if not data:
+            return
+        activity = data.get("activity")
+        if isinstance(activity, list) and len(activity) == HOURS_PER_DAY:
+            self._activity = [float(a) if a is not None else None for a in activity]
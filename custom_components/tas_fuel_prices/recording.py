@@ -0,0 +1,81 @@
+"""Rolling archive of upstream payloads for the Tasmanian Fuel Prices integration."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import datetime
+import gzip
+import json
+from pathlib import Path
+import threading
+from typing import Any, NamedTuple
+
+SEGMENT_SUFFIX = ".jsonl.gz"
+
+
+class RecordedPayload(NamedTuple):
+    """One payload returned by a fetch method."""
+
+    recorded_at: datetime
+    key: str
+    payload: Any
+
+
+class PayloadArchive:
+    """
+    Gzip-compressed JSON-lines segments holding one payload per line.
+
+    New payloads are appended to the newest segment until it reaches
+    `max_segment_bytes`, then a new segment is started. Once there are more
+    than `max_segments` segments the oldest are deleted. All methods do file
+    I/O and must run in an executor.
+    """
+
+    def __init__(self, directory: str | Path, max_segment_bytes: int, max_segments: int) -> None:
+        """Initialize the archive."""
+        self._directory = Path(directory)
+        self._max_segment_bytes = max_segment_bytes
+        self._max_segments = max_segments
+        # Payloads fetched together are appended from different executor threads
+        self._lock = threading.Lock()
+
+    def segments(self) -> list[Path]:
+        """Return the segment files, oldest first."""
+        if not self._directory.is_dir():
+            return []
+        return sorted(self._directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+    def append(self, key: str, payload: Any, recorded_at: datetime) -> None:
+        """Append a payload to the archive."""
+        line = json.dumps(
+            {"recorded_at": recorded_at.isoformat(), "key": key, "payload": payload},
+            separators=(",", ":"),
+            default=sorted,  # Sets, such as the trading hours planner coverage
+        )
+        with self._lock:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            segments = self.segments()
+            if not segments or segments[-1].stat().st_size >= self._max_segment_bytes:
+                segment = self._directory / f"{recorded_at.strftime('%Y%m%dT%H%M%S%f')}{SEGMENT_SUFFIX}"
+                segments.append(segment)
+            else:
+                segment = segments[-1]
+
+            # Each append adds a gzip member, which gzip readers treat as one stream
+            with gzip.open(segment, "at", encoding="utf-8") as file:
+                file.write(line + "\n")
+
+            for expired in segments[:-self._max_segments]:
+                expired.unlink(missing_ok=True)
+
+    def read(self, start: datetime | None = None, end: datetime | None = None) -> Iterator[RecordedPayload]:
+        """Yield the recorded payloads between `start` and `end`, oldest first."""
+        for segment in self.segments():
+            with gzip.open(segment, "rt", encoding="utf-8") as file:
+                for line in file:
+                    record = json.loads(line)
+                    recorded_at = datetime.fromisoformat(record["recorded_at"])
+                    if start is not None and recorded_at < start:
+                        continue
+                    if end is not None and recorded_at > end:
+                        return
+                    yield RecordedPayload(recorded_at, record["key"], record["payload"])
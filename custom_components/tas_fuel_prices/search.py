@@ -0,0 +1,113 @@
+"""In-memory station search for the Tasmanian Fuel Prices integration."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from difflib import get_close_matches
+import re
+
+# Tokens in an address that say nothing about where the station is
+_ADDRESS_NOISE = {"tas", "nsw", "act", "vic", "qld", "sa", "wa", "nt"}
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+FUZZY_CUTOFF = 0.75
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Split text into lowercase search tokens."""
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def suburb_from_address(address: str | None) -> str:
+    """Return the suburb from an address such as '1 Main Rd, LINDISFARNE TAS 7018'."""
+    if not address:
+        return ""
+    locality = address.rsplit(",", 1)[-1]
+    words = [w for w in locality.split() if not w.isdigit() and w.lower() not in _ADDRESS_NOISE]
+    return " ".join(words).title()
+
+
+class StationSearchIndex:
+    """
+    Token index over station names, addresses, brands and suburbs.
+
+    Every query token is matched as a prefix of the indexed tokens using a
+    sorted token list, falling back to fuzzy matching for typos. Stations
+    must match every query token; if none do, stations matching the most
+    tokens are returned instead.
+    """
+
+    def __init__(self, stations: list[dict]) -> None:
+        """Initialize the index from the `stations` list of a price snapshot."""
+        self._stations: dict[str, dict] = {}
+        self._postings: dict[str, set[str]] = {}
+
+        for station in stations:
+            code = str(station.get("code"))
+            suburb = suburb_from_address(station.get("address"))
+            self._stations[code] = {
+                "code": code,
+                "name": station.get("name") or f"Station {code}",
+                "address": station.get("address") or "",
+                "brand": station.get("brand") or "",
+                "suburb": suburb,
+            }
+            text = " ".join((code, station.get("name") or "", station.get("address") or "", station.get("brand") or "", suburb))
+            for token in tokenize(text):
+                self._postings.setdefault(token, set()).add(code)
+
+        self._tokens = sorted(self._postings)
+
+    @classmethod
+    def from_snapshot(cls, data: dict | None) -> StationSearchIndex:
+        """Build the index from a raw `fetch_prices` payload."""
+        return cls((data or {}).get("stations", []))
+
+    def __contains__(self, code: str) -> bool:
+        """Return True if the station code is known."""
+        return code in self._stations
+
+    def __len__(self) -> int:
+        """Return the number of indexed stations."""
+        return len(self._stations)
+
+    def label(self, code: str) -> str:
+        """Return a human readable label for a station code."""
+        station = self._stations.get(code)
+        if station is None:
+            return code
+        return f"{station['name']} - {station['address']} ({code})"
+
+    def all_codes(self) -> list[str]:
+        """Return every station code, ordered by station name."""
+        return sorted(self._stations, key=lambda c: self._stations[c]["name"].lower())
+
+    def _match_token(self, query_token: str) -> set[str]:
+        """Return the stations with a token starting with, or close to, the query token."""
+        matches: set[str] = set()
+        position = bisect_left(self._tokens, query_token)
+        while position < len(self._tokens) and self._tokens[position].startswith(query_token):
+            matches |= self._postings[self._tokens[position]]
+            position += 1
+
+        if not matches and len(query_token) > 2:
+            for token in get_close_matches(query_token, self._tokens, n=5, cutoff=FUZZY_CUTOFF):
+                matches |= self._postings[token]
+        return matches
+
+    def search(self, query: str, limit: int = 25) -> list[str]:
+        """Return the station codes best matching the query."""
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+
+        hits: dict[str, int] = {}
+        for query_token in query_tokens:
+            for code in self._match_token(query_token):
+                hits[code] = hits.get(code, 0) + 1
+
+        best = max(hits.values(), default=0)
+        if best == 0:
+            return []
+
+        results = [code for code, count in hits.items() if count == best]
+        results.sort(key=lambda c: (c not in query_tokens, self._stations[c]["name"].lower()))
+        return results[:limit]
@@ -1,12 +1,12 @@
 """Sensor platform for Tasmanian Fuel Prices."""
 from __future__ import annotations
-from datetime import datetime, timezone
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-from math import radians, sin, cos, sqrt, atan2
-import operator
 import re
+import time
 
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
+from homeassistant.const import UnitOfInformation, UnitOfTime
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
@@ -17,16 +17,31 @@ from homeassistant.helpers.update_coordinator import (
 )
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_track_point_in_time
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers import device_registry as dr
 from homeassistant.util import dt as dt_util
 
+from .analytics import PriceCycleAnalytics
 from .api import TasFuelAPI
+from .core import FuelPriceEngine, stations_within
+from .unique_id import (
+    KIND_PRICE,
+    cycle_sensor_unique_id,
+    fuel_device_identifier,
+    parse_fuel_device_identifier,
+    parse_unique_id,
+    price_sensor_unique_id,
+    summary_sensor_unique_id,
+)
 from .const import (
     DOMAIN,
     CONF_DEVICE_NAME,
     CONF_FUEL_TYPES,
     CONF_STATIONS,
+    CONF_ENTITY_RADIUS,
+    CONF_EXTRA_LOCATION_ENTITIES,
+    DEFAULT_ENTITY_RADIUS,
     ATTR_STATION_ID,
     ATTR_ADDRESS,
     ATTR_BRAND,
@@ -38,44 +53,41 @@ from .const import (
     ATTR_DISCOUNT_PROVIDER,
     ATTR_USER_FAVOURITE,
     ATTR_TYRE_INFLATION,
-    ATTR_IN_RANGE,
-    ATTR_DISTANCE,
     ATTR_STATIONS,
+    ATTR_FILL_COST,
     ATTR_DISTRIBUTOR_EXCLUDED,
     ATTR_OPERATOR_EXCLUDED,
     ATTR_TRADING_HOURS,
+    ATTR_POLLING_INTERVAL,
+    ATTR_DATA_AGE,
+    ATTR_STALE,
+    ATTR_CIRCUIT_BREAKER,
+    ATTR_STAGES,
+    ATTR_SNAPSHOT_BYTES,
+    ATTR_CONFIDENCE,
+    ATTR_REGIONAL_AVERAGE,
+    ATTR_LAST_RESTORATION,
+    ATTR_CYCLE_LENGTH,
+    ATTR_NEXT_TROUGH,
+    ATTR_HOURS_TO_TROUGH,
+    CYCLE_REGIONS,
+    CYCLE_PHASE_UNKNOWN,
+    CYCLE_PHASE_RESTORING,
+    CYCLE_PHASE_FALLING,
+    CYCLE_PHASE_TROUGH,
+    UPSTREAM_BY_ENDPOINT,
     LOGGER,
-    CONF_ENABLE_COLES_DISCOUNT,
-    CONF_COLES_DISCOUNT_AMOUNT,
-    CONF_COLES_ADDITIONAL_STATIONS,
-    CONF_ENABLE_WOOLWORTHS_DISCOUNT,
-    CONF_WOOLWORTHS_DISCOUNT_AMOUNT,
-    CONF_WOOLWORTHS_ADDITIONAL_STATIONS,
-    CONF_ENABLE_RACT_DISCOUNT,
-    CONF_RACT_DISCOUNT_AMOUNT,
-    CONF_RACT_ADDITIONAL_STATIONS,
-    CONF_ENABLE_UNITED_DISCOUNT,
-    CONF_UNITED_DISCOUNT_AMOUNT,
-    CONF_UNITED_ADDITIONAL_STATIONS,
-    CONF_ADD_TYRE_INFLATION_STATIONS,
-    CONF_REMOVE_TYRE_INFLATION_STATIONS,
-    CONF_LOCATION_ENTITY,
-    CONF_RANGE,
-    CONF_EXCLUDED_DISTRIBUTORS,
-    CONF_EXCLUDED_OPERATORS,
-    CONF_PRICE_FORMAT,
-    PRICE_FORMAT_DOLLARS,
-    PRICE_FORMAT_CENTS,
 )
 
-def haversine(lat1, lon1, lat2, lon2):
-    """Calculate the distance between two points in kilometers."""
-    R = 6371  # Radius of Earth in kilometers
-    dLat = radians(lat2 - lat1)
-    dLon = radians(lon2 - lon1)
-    a = sin(dLat / 2) * sin(dLat / 2) + cos(radians(lat1)) * cos(radians(lat2)) * sin(dLon / 2) * sin(dLon / 2)
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
-    return R * c
+def snapshot_health_attributes(api_client: TasFuelAPI, key: str) -> dict:
+    """Return how old the served snapshot is and whether its upstream is healthy."""
+    fetched_at = api_client.snapshot_time(key)
+    age = dt_util.utcnow() - fetched_at if fetched_at else None
+    return {
+        ATTR_DATA_AGE: f"{age.total_seconds() / 60:.0f} min" if age is not None else "Unknown",
+        ATTR_STALE: api_client.is_stale(key),
+        ATTR_CIRCUIT_BREAKER: api_client.circuit_states.get(UPSTREAM_BY_ENDPOINT[key], "closed"),
+    }
 
 def slugify(text: str) -> str:
     """Convert a string to a slug."""
@@ -84,6 +96,71 @@ def slugify(text: str) -> str:
     text = re.sub(r"[\s_-]+", "_", text).strip("_")
     return text
 
+@callback
+def async_cleanup_registry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    fuel_types: list[str],
+    expected_unique_ids: set[str],
+    out_of_scope_stations: set[str] = frozenset(),
+) -> dict:
+    """
+    Remove price and summary sensors, and fuel type devices, that setup no longer creates.
+    `out_of_scope_stations` are stations in the snapshot that no longer get price sensors.
+    Returns a report with the number of removed entries and the time taken.
+    """
+    start = time.perf_counter()
+    active_fuels = set(fuel_types)
+    ent_reg = er.async_get(hass)
+    dev_reg = dr.async_get(hass)
+
+    obsolete_entities = []
+    for entity in er.async_entries_for_config_entry(ent_reg, entry.entry_id):
+        if entity.domain != "sensor" or entity.unique_id in expected_unique_ids:
+            continue
+        parsed = parse_unique_id(entry.entry_id, entity.unique_id)
+        if parsed is None:
+            continue
+        # A station missing from one snapshot keeps its sensor; only a removed fuel or a
+        # station outside the entity radius drops it
+        if (
+            parsed.kind == KIND_PRICE
+            and parsed.fuel_type in active_fuels
+            and parsed.station_code not in out_of_scope_stations
+        ):
+            continue
+        obsolete_entities.append(entity.entity_id)
+
+    expected_devices = {fuel_device_identifier(entry.entry_id, ft) for ft in fuel_types}
+    obsolete_devices = []
+    for device in dr.async_entries_for_config_entry(dev_reg, entry.entry_id):
+        fuel_identifiers = {
+            identifier
+            for domain, identifier in device.identifiers
+            if domain == DOMAIN and parse_fuel_device_identifier(entry.entry_id, identifier)
+        }
+        if fuel_identifiers and not fuel_identifiers & expected_devices:
+            obsolete_devices.append(device)
+
+    for entity_id in obsolete_entities:
+        LOGGER.debug("Removing obsolete entity: %s", entity_id)
+        ent_reg.async_remove(entity_id)
+    for device in obsolete_devices:
+        LOGGER.debug("Removing obsolete device: %s", device.name)
+        dev_reg.async_remove_device(device.id)
+
+    duration_ms = (time.perf_counter() - start) * 1000
+    if obsolete_entities or obsolete_devices:
+        LOGGER.info(
+            "Registry cleanup removed %s entities and %s devices in %.1f ms",
+            len(obsolete_entities), len(obsolete_devices), duration_ms,
+        )
+    return {
+        "entities_removed": len(obsolete_entities),
+        "devices_removed": len(obsolete_devices),
+        "duration_ms": round(duration_ms, 1),
+    }
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -95,75 +172,74 @@ async def async_setup_entry(
     additional_data_coordinator: DataUpdateCoordinator = data_bundle["additional_data_coordinator"]
     trading_hours_coordinator: DataUpdateCoordinator = data_bundle["trading_hours_coordinator"]
     api_client: TasFuelAPI = data_bundle["api"]
+    engine: FuelPriceEngine = data_bundle["engine"]
     
     fuel_types = entry.options.get(CONF_FUEL_TYPES, ["U91"])
     favourite_stations = entry.options.get(CONF_STATIONS, [])
-    time_zone = ZoneInfo(hass.config.time_zone)
-
-    # --- REGISTRY CLEANUP ---
-    ent_reg = er.async_get(hass)
-    dev_reg = dr.async_get(hass)
-
-    # 1. Cleanup Entities
-    registered_entities = er.async_entries_for_config_entry(ent_reg, entry.entry_id)
-    for entity in registered_entities:
-        current_fuel_found = False
-        for ft in fuel_types:
-            if f"_{ft}_" in entity.unique_id or entity.unique_id.endswith(f"_{ft}"):
-                current_fuel_found = True
-                break
-        
-        if not current_fuel_found:
-            is_price_sensor = any(entity.unique_id.endswith(f"_{ft}") for ft in ["U91", "E10", "P95", "P98", "DL", "PDL", "B20", "E85", "LPG"])
-            is_summary_sensor = "_cheapest_" in entity.unique_id
-            
-            if is_price_sensor or is_summary_sensor:
-                LOGGER.info("Removing obsolete entity: %s", entity.entity_id)
-                ent_reg.async_remove(entity.entity_id)
-
-    # 2. Cleanup Devices
-    registered_devices = dr.async_entries_for_config_entry(dev_reg, entry.entry_id)
-    for device in registered_devices:
-        is_fuel_device = False
-        fuel_active = False
-        
-        for identifier in device.identifiers:
-            if identifier[0] == DOMAIN:
-                id_val = identifier[1]
-                if id_val.startswith(f"{entry.entry_id}_"):
-                    is_fuel_device = True
-                    device_fuel_type = id_val.replace(f"{entry.entry_id}_", "")
-                    if device_fuel_type in fuel_types:
-                        fuel_active = True
-                    break
-        
-        if is_fuel_device and not fuel_active:
-            LOGGER.info("Removing obsolete device: %s", device.name)
-            dev_reg.async_remove_device(device.id)
-    # --- END CLEANUP ---
+    entity_radius = entry.options.get(CONF_ENTITY_RADIUS, DEFAULT_ENTITY_RADIUS)
 
     sensors: list[SensorEntity] = [
         TasFuelTokenExpirySensor(price_coordinator, api_client, hass.config.time_zone),
-        TasFuelPricesLastUpdatedSensor(price_coordinator),
-        TasFuelAdditionalDataLastUpdatedSensor(additional_data_coordinator),
-        TasFuelTradingHoursLastUpdatedSensor(trading_hours_coordinator),
+        TasFuelPricesLastUpdatedSensor(price_coordinator, api_client),
+        TasFuelAdditionalDataLastUpdatedSensor(additional_data_coordinator, api_client),
+        TasFuelTradingHoursLastUpdatedSensor(trading_hours_coordinator, api_client),
+        TasFuelDataTransferredSensor(
+            price_coordinator, additional_data_coordinator, trading_hours_coordinator, api_client
+        ),
+        TasFuelRefreshDurationSensor(entry, api_client, "prices", "Prices"),
+        TasFuelRefreshDurationSensor(entry, api_client, "additional_data", "Additional Data"),
+        TasFuelRefreshDurationSensor(entry, api_client, "trading_hours", "Trading Hours"),
     ]
 
     # Create summary sensors for each fuel type
     for fuel_type in fuel_types:
         sensors.append(
             TasFuelCheapestNearMeSummarySensor(
-                price_coordinator, additional_data_coordinator, trading_hours_coordinator, entry, fuel_type, hass
+                price_coordinator, additional_data_coordinator, trading_hours_coordinator, entry, engine, fuel_type, hass
             )
         )
         sensors.append(
             TasFuelCheapestFilteredSummarySensor(
-                price_coordinator, additional_data_coordinator, trading_hours_coordinator, entry, fuel_type, hass
+                price_coordinator, additional_data_coordinator, trading_hours_coordinator, entry, engine, fuel_type, hass
             )
         )
+        for origin in entry.options.get(CONF_EXTRA_LOCATION_ENTITIES, []):
+            sensors.append(
+                TasFuelCheapestNearMeSummarySensor(
+                    price_coordinator, additional_data_coordinator, trading_hours_coordinator, entry, engine, fuel_type, hass,
+                    origin=origin,
+                )
+            )
+        if engine.fill_cost_enabled:
+            sensors.append(
+                TasFuelCheapestFillSummarySensor(
+                    price_coordinator, additional_data_coordinator, trading_hours_coordinator, entry, engine, fuel_type, hass
+                )
+            )
+        for region in CYCLE_REGIONS:
+            sensors.append(
+                TasFuelPriceCycleSensor(price_coordinator, entry, engine, data_bundle["price_cycles"], region, fuel_type)
+            )
 
+    out_of_scope_stations: set[str] = set()
     if price_coordinator.data:
         all_stations = price_coordinator.data.get('stations', [])
+        if entity_radius:
+            # Only stations near home and favourites get price sensors, so covering more
+            # states does not multiply the entity count; summaries still rank every station
+            in_scope = stations_within(
+                all_stations,
+                hass.config.latitude,
+                hass.config.longitude,
+                entity_radius,
+                set(favourite_stations),
+            )
+            in_scope_codes = {str(s.get("code")) for s in in_scope}
+            out_of_scope_stations = {
+                str(s.get("code")) for s in all_stations if str(s.get("code")) not in in_scope_codes
+            }
+            all_stations = in_scope
+            data_bundle["price_sensor_stations"] = in_scope_codes
         
         for station_info in all_stations:
             station_code = str(station_info.get("code"))
@@ -174,15 +250,18 @@ async def async_setup_entry(
                         additional_data_coordinator=additional_data_coordinator,
                         trading_hours_coordinator=trading_hours_coordinator,
                         entry=entry,
+                        engine=engine,
                         station_code=station_code,
                         station_name=station_info.get("name", f"Station {station_code}"),
                         fuel_type=fuel_type,
-                        time_zone=time_zone,
                         favourite_stations=favourite_stations,
                         hass=hass,
                     )
                 )
-    
+
+    data_bundle["registry_cleanup"] = async_cleanup_registry(
+        hass, entry, fuel_types, {sensor.unique_id for sensor in sensors}, out_of_scope_stations
+    )
     async_add_entities(sensors)
 
 
@@ -195,10 +274,10 @@ class TasFuelPriceSensor(CoordinatorEntity, SensorEntity):
         additional_data_coordinator: DataUpdateCoordinator,
         trading_hours_coordinator: DataUpdateCoordinator,
         entry: ConfigEntry,
+        engine: FuelPriceEngine,
         station_code: str,
         station_name: str,
         fuel_type: str,
-        time_zone: ZoneInfo,
         favourite_stations: list[str],
         hass: HomeAssistant,
     ) -> None:
@@ -207,20 +286,20 @@ class TasFuelPriceSensor(CoordinatorEntity, SensorEntity):
         self.additional_data_coordinator = additional_data_coordinator
         self.trading_hours_coordinator = trading_hours_coordinator
         self.entry = entry
+        self._engine = engine
         self._station_code = station_code
         self._station_name = station_name
         self._fuel_type = fuel_type
-        self._time_zone = time_zone
         self._favourite_stations = favourite_stations
         self.hass = hass
 
         self._attr_name = f"{station_name} {fuel_type}"
         self.entity_id = f"sensor.{DOMAIN}_{slugify(station_code)}_{slugify(fuel_type)}"
-        self._attr_unique_id = f"{self.coordinator.config_entry.entry_id}_{station_code}_{fuel_type}"
+        self._attr_unique_id = price_sensor_unique_id(
+            self.coordinator.config_entry.entry_id, station_code, fuel_type
+        )
         self._attr_icon = "mdi:gas-station"
-        
-        price_format = self.entry.options.get(CONF_PRICE_FORMAT, PRICE_FORMAT_DOLLARS)
-        self._attr_native_unit_of_measurement = "c/L" if price_format == PRICE_FORMAT_CENTS else "AUD/L"
+        self._attr_native_unit_of_measurement = engine.unit
         
         self._update_state()
 
@@ -228,7 +307,7 @@ class TasFuelPriceSensor(CoordinatorEntity, SensorEntity):
     def device_info(self) -> DeviceInfo:
         """Return information about the device this sensor is part of."""
         return DeviceInfo(
-            identifiers={(DOMAIN, f"{self.coordinator.config_entry.entry_id}_{self._fuel_type}")},
+            identifiers={(DOMAIN, fuel_device_identifier(self.coordinator.config_entry.entry_id, self._fuel_type))},
             name=f"{CONF_DEVICE_NAME} - {self._fuel_type}",
             manufacturer="Custom Integration",
             via_device=(DOMAIN, self.coordinator.config_entry.entry_id)
@@ -264,36 +343,6 @@ class TasFuelPriceSensor(CoordinatorEntity, SensorEntity):
         self._update_state()
         self.async_write_ha_state()
 
-    def _calculate_distance_attributes(self) -> dict:
-        """Calculate distance and in_range attributes."""
-        location_entity_id = self.entry.options.get(CONF_LOCATION_ENTITY)
-        if not location_entity_id:
-            return {ATTR_DISTANCE: "Not Configured", ATTR_IN_RANGE: True}
-
-        range_km = self.entry.options.get(CONF_RANGE, 5)
-        all_stations_map = {str(station['code']): station for station in self.coordinator.data.get('stations', [])}
-        station_info = all_stations_map.get(self._station_code)
-        
-        distance = None
-        is_in_range = True
-
-        if station_info and station_info.get("location"):
-            location_state = self.hass.states.get(location_entity_id)
-            if location_state and 'latitude' in location_state.attributes and 'longitude' in location_state.attributes:
-                phone_lat = location_state.attributes['latitude']
-                phone_lon = location_state.attributes['longitude']
-                station_lat = station_info["location"]["latitude"]
-                station_lon = station_info["location"]["longitude"]
-
-                if phone_lat and phone_lon and station_lat and station_lon:
-                    distance = haversine(phone_lat, phone_lon, station_lat, station_lon)
-                    is_in_range = distance <= range_km
-        
-        return {
-            ATTR_DISTANCE: f"{distance:.2f} km" if distance is not None else "Unknown",
-            ATTR_IN_RANGE: is_in_range,
-        }
-
     @callback
     def async_recalculate_distance(self) -> None:
         """Recalculate distance attributes when the location entity updates."""
@@ -301,8 +350,7 @@ class TasFuelPriceSensor(CoordinatorEntity, SensorEntity):
             return
 
         LOGGER.debug("Recalculating distance for %s due to location update", self.entity_id)
-        new_geo_attrs = self._calculate_distance_attributes()
-        self._attr_extra_state_attributes.update(new_geo_attrs)
+        self._attr_extra_state_attributes.update(self._engine.distance_attributes(self._station_code))
         self.async_write_ha_state()
 
     def _update_state(self) -> None:
@@ -310,151 +358,50 @@ class TasFuelPriceSensor(CoordinatorEntity, SensorEntity):
         if not self.coordinator.data:
             self._attr_native_value = None
             return
-            
-        all_stations_map = {str(station['code']): station for station in self.coordinator.data.get('stations', [])}
-        all_prices = self.coordinator.data.get('prices', [])
 
-        station_info = all_stations_map.get(self._station_code)
-        
-        price_info = next(
-            (
-                p
-                for p in all_prices
-                if str(p.get("stationcode")) == self._station_code and p.get("fueltype") == self._fuel_type
-            ),
-            None,
+        self._engine.sync(
+            self.coordinator.data,
+            self.additional_data_coordinator.data,
+            self.trading_hours_coordinator.data,
         )
+        result = self._engine.station_result(self._station_code, self._fuel_type)
 
-        if station_info and price_info and price_info.get('price') is not None:
-            price = float(price_info.get('price'))
-            discount_applied_amount = 0.0
-            discount_provider = "None"
-            tyre_inflation = False
-            distributor = "No data found"
-            operator = "No data found"
-            options = self.entry.options
-            
-            excluded_distributors = set(options.get(CONF_EXCLUDED_DISTRIBUTORS, []))
-            excluded_operators = set(options.get(CONF_EXCLUDED_OPERATORS, []))
-
-            if self.additional_data_coordinator.data:
-                additional_data = self.additional_data_coordinator.data
-
-                distributors_map = additional_data.get("distributors", {})
-                distributor = distributors_map.get(self._station_code, "No data found")
-
-                operators_map = additional_data.get("operators", {})
-                operator = operators_map.get(self._station_code, "No data found")
-
-                if options.get(CONF_ENABLE_WOOLWORTHS_DISCOUNT):
-                    additional_ww = [s.strip() for s in options.get(CONF_WOOLWORTHS_ADDITIONAL_STATIONS, "").split(',') if s.strip()]
-                    woolworths_stations = set(additional_data.get("woolworths", []) + additional_ww)
-                    if self._station_code in woolworths_stations:
-                        discount_applied_amount = float(options.get(CONF_WOOLWORTHS_DISCOUNT_AMOUNT, 0))
-                        price -= discount_applied_amount
-                        discount_provider = "Woolworths"
-
-                if discount_provider == "None" and options.get(CONF_ENABLE_COLES_DISCOUNT):
-                    additional_coles = [s.strip() for s in options.get(CONF_COLES_ADDITIONAL_STATIONS, "").split(',') if s.strip()]
-                    coles_stations = set(additional_data.get("coles", []) + additional_coles)
-                    if self._station_code in coles_stations:
-                        discount_applied_amount = float(options.get(CONF_COLES_DISCOUNT_AMOUNT, 0))
-                        price -= discount_applied_amount
-                        discount_provider = "Coles"
-                
-                if discount_provider == "None" and options.get(CONF_ENABLE_RACT_DISCOUNT):
-                    additional_ract = [s.strip() for s in options.get(CONF_RACT_ADDITIONAL_STATIONS, "").split(',') if s.strip()]
-                    ract_stations = set(additional_data.get("ract", []) + additional_ract)
-                    if self._station_code in ract_stations:
-                        discount_applied_amount = float(options.get(CONF_RACT_DISCOUNT_AMOUNT, 0))
-                        price -= discount_applied_amount
-                        discount_provider = "RACT"
-
-                if discount_provider == "None" and options.get(CONF_ENABLE_UNITED_DISCOUNT):
-                    additional_united = [s.strip() for s in options.get(CONF_UNITED_ADDITIONAL_STATIONS, "").split(',') if s.strip()]
-                    united_stations = set(additional_data.get("united", []) + additional_united)
-                    if self._station_code in united_stations:
-                        discount_applied_amount = float(options.get(CONF_UNITED_DISCOUNT_AMOUNT, 0))
-                        price -= discount_applied_amount
-                        discount_provider = "United"
-                
-                github_list = set(additional_data.get("tyre_inflation", []))
-                add_list = {s.strip() for s in options.get(CONF_ADD_TYRE_INFLATION_STATIONS, "").split(',') if s.strip()}
-                remove_list = {s.strip() for s in options.get(CONF_REMOVE_TYRE_INFLATION_STATIONS, "").split(',') if s.strip()}
-
-                if self._station_code in add_list:
-                    tyre_inflation = True
-                elif self._station_code in github_list and self._station_code not in remove_list:
-                    tyre_inflation = True
-
-            # Extract Trading Hours
-            trading_hours = "Hours not provided by station"
-            if self.trading_hours_coordinator.data:
-                trading_hours = self.trading_hours_coordinator.data.get(self._station_code, "Hours not provided by station")
-
-            price_format = options.get(CONF_PRICE_FORMAT, PRICE_FORMAT_DOLLARS)
-            if price_format == PRICE_FORMAT_CENTS:
-                self._attr_native_value = round(price, 1)
-            else:
-                self._attr_native_value = round(price / 100.0, 3)
-            
-            is_favourite = self._station_code in self._favourite_stations
-            
-            station_prices = [
-                p for p in all_prices if str(p.get("stationcode")) == self._station_code
-            ]
-            
-            cleaned_prices = [
-                {"fueltype": p.get("fueltype"), "price": p.get("price")} 
-                for p in station_prices
-            ]
-
-            latest_update_str = None
-            if station_prices:
-                latest_update_str = max(p.get("lastupdated") for p in station_prices if p.get("lastupdated"))
-            
-            last_updated_local_str = "Unknown"
-            if latest_update_str:
-                try:
-                    update_time_utc = datetime.strptime(latest_update_str, '%d/%m/%Y %H:%M:%S').replace(tzinfo=timezone.utc)
-                    update_time_local = update_time_utc.astimezone(self._time_zone)
-                    last_updated_local_str = update_time_local.strftime('%Y-%m-%d %H:%M:%S')
-                except (ValueError, TypeError) as e:
-                    LOGGER.warning("Could not parse timestamp '%s': %s", latest_update_str, e)
-                    last_updated_local_str = "Invalid Date Format"
-
-            filtered_station_info = station_info.copy()
-            filtered_station_info.pop("brandid", None)
-            filtered_station_info.pop("stationid", None)
-            
-            attributes = {
-                **filtered_station_info,
-                "all_prices_at_station": cleaned_prices,
-                ATTR_TRADING_HOURS: trading_hours,
-                ATTR_LAST_UPDATED: last_updated_local_str,
-                ATTR_DISCOUNT_APPLIED: round(discount_applied_amount / 100.0, 3),
-                ATTR_DISCOUNT_PROVIDER: discount_provider,
-                ATTR_USER_FAVOURITE: is_favourite,
-                ATTR_TYRE_INFLATION: tyre_inflation,
-                ATTR_DISTRIBUTOR: distributor,
-                ATTR_OPERATOR: operator,
-                ATTR_DISTRIBUTOR_EXCLUDED: distributor in excluded_distributors,
-                ATTR_OPERATOR_EXCLUDED: operator in excluded_operators,
-            }
-            attributes.update(self._calculate_distance_attributes())
-            
-            self._attr_extra_state_attributes = attributes
-        else:
+        if result is None:
             self._attr_native_value = None
             self._attr_extra_state_attributes = {
                 ATTR_STATION_ID: self._station_code,
                 ATTR_FUEL_TYPE: self._fuel_type,
                 "error": "Price not available for this station and fuel type",
             }
+            return
+
+        self._attr_native_value = self._engine.format_price(result["discounted_price"])
+
+        filtered_station_info = result["station"].copy()
+        filtered_station_info.pop("brandid", None)
+        filtered_station_info.pop("stationid", None)
+
+        self._attr_extra_state_attributes = {
+            **filtered_station_info,
+            "all_prices_at_station": result["all_prices"],
+            ATTR_TRADING_HOURS: result["trading_hours"],
+            ATTR_LAST_UPDATED: result["last_updated"],
+            ATTR_DISCOUNT_APPLIED: round(result["discount_amount"] / 100.0, 3),
+            ATTR_DISCOUNT_PROVIDER: result["discount_provider"],
+            ATTR_USER_FAVOURITE: self._station_code in self._favourite_stations,
+            ATTR_TYRE_INFLATION: result["tyre_inflation"],
+            ATTR_DISTRIBUTOR: result["distributor"],
+            ATTR_OPERATOR: result["operator"],
+            ATTR_DISTRIBUTOR_EXCLUDED: result["distributor_excluded"],
+            ATTR_OPERATOR_EXCLUDED: result["operator_excluded"],
+            **self._engine.distance_attributes(self._station_code),
+        }
 
 class BaseSummarySensor(CoordinatorEntity, SensorEntity):
     """Base class for summary sensors."""
     _attr_has_entity_name = True
+    _filtered = False
+    _by_fill_cost = False
 
     def __init__(
         self,
@@ -462,17 +409,23 @@ class BaseSummarySensor(CoordinatorEntity, SensorEntity):
         additional_data_coordinator: DataUpdateCoordinator,
         trading_hours_coordinator: DataUpdateCoordinator,
         entry: ConfigEntry,
+        engine: FuelPriceEngine,
         fuel_type: str,
         hass: HomeAssistant,
+        origin: str | None = None,
     ) -> None:
-        """Initialize the summary sensor."""
+        """Initialize the summary sensor; `origin` is an extra location entity to measure distances from."""
         super().__init__(price_coordinator)
         self.additional_data_coordinator = additional_data_coordinator
         self.trading_hours_coordinator = trading_hours_coordinator
         self.entry = entry
+        self._engine = engine
         self._fuel_type = fuel_type
+        self._origin = origin
         self.hass = hass
+        self._attr_native_unit_of_measurement = engine.unit
         self._attr_extra_state_attributes = {ATTR_STATIONS: []}
+        self._open_change_cancel = None
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -485,6 +438,7 @@ class BaseSummarySensor(CoordinatorEntity, SensorEntity):
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
         await super().async_added_to_hass()
+        self.async_on_remove(self._cancel_open_change)
         self.async_on_remove(
             self.additional_data_coordinator.async_add_listener(self._handle_coordinator_update)
         )
@@ -494,7 +448,8 @@ class BaseSummarySensor(CoordinatorEntity, SensorEntity):
         self.async_on_remove(
             async_dispatcher_connect(
                 self.hass,
-                f"{DOMAIN}_{self.entry.entry_id}_recalculate_distance",
+                # Extra location entities have a signal of their own
+                f"{DOMAIN}_{self.entry.entry_id}_recalculate_distance" + (f"_{self._origin}" if self._origin else ""),
                 self._handle_coordinator_update,
             )
         )
@@ -503,102 +458,49 @@ class BaseSummarySensor(CoordinatorEntity, SensorEntity):
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from any coordinator."""
         self._update_state()
+        self._schedule_open_change()
         self.async_write_ha_state()
 
-    def _build_station_list(self) -> list[dict]:
-        """Build a comprehensive list of all stations for the fuel type."""
-        if not self.coordinator.data or not self.additional_data_coordinator.data:
-            return []
+    @callback
+    def _cancel_open_change(self) -> None:
+        """Cancel the pending re-evaluation at the next opening or closing."""
+        if self._open_change_cancel is not None:
+            self._open_change_cancel()
+            self._open_change_cancel = None
 
-        all_stations_info = self.coordinator.data.get('stations', [])
-        all_prices = self.coordinator.data.get('prices', [])
-        additional_data = self.additional_data_coordinator.data
-        options = self.entry.options
-        
-        processed_stations = []
-        for station_info in all_stations_info:
-            station_code = str(station_info.get("code"))
-            price_info = next((p for p in all_prices if str(p.get("stationcode")) == station_code and p.get("fueltype") == self._fuel_type), None)
-
-            if not price_info or price_info.get('price') is None:
-                continue
-
-            price = float(price_info.get('price'))
-            discounted_price = price
-            
-            if options.get(CONF_ENABLE_WOOLWORTHS_DISCOUNT):
-                woolworths_stations = set(additional_data.get("woolworths", []) + [s.strip() for s in options.get(CONF_WOOLWORTHS_ADDITIONAL_STATIONS, "").split(',') if s.strip()])
-                if station_code in woolworths_stations:
-                    discounted_price -= float(options.get(CONF_WOOLWORTHS_DISCOUNT_AMOUNT, 0))
-            
-            if discounted_price == price and options.get(CONF_ENABLE_COLES_DISCOUNT):
-                coles_stations = set(additional_data.get("coles", []) + [s.strip() for s in options.get(CONF_COLES_ADDITIONAL_STATIONS, "").split(',') if s.strip()])
-                if station_code in coles_stations:
-                    discounted_price -= float(options.get(CONF_COLES_DISCOUNT_AMOUNT, 0))
-
-            if discounted_price == price and options.get(CONF_ENABLE_RACT_DISCOUNT):
-                ract_stations = set(additional_data.get("ract", []) + [s.strip() for s in options.get(CONF_RACT_ADDITIONAL_STATIONS, "").split(',') if s.strip()])
-                if station_code in ract_stations:
-                    discounted_price -= float(options.get(CONF_RACT_DISCOUNT_AMOUNT, 0))
-
-            if discounted_price == price and options.get(CONF_ENABLE_UNITED_DISCOUNT):
-                united_stations = set(additional_data.get("united", []) + [s.strip() for s in options.get(CONF_UNITED_ADDITIONAL_STATIONS, "").split(',') if s.strip()])
-                if station_code in united_stations:
-                    discounted_price -= float(options.get(CONF_UNITED_DISCOUNT_AMOUNT, 0))
-
-            tyre_inflation_list = set(additional_data.get("tyre_inflation", []))
-            add_list = {s.strip() for s in options.get(CONF_ADD_TYRE_INFLATION_STATIONS, "").split(',') if s.strip()}
-            remove_list = {s.strip() for s in options.get(CONF_REMOVE_TYRE_INFLATION_STATIONS, "").split(',') if s.strip()}
-            has_tyres = station_code in add_list or (station_code in tyre_inflation_list and station_code not in remove_list)
-
-            trading_hours = "Hours not provided by station"
-            if self.trading_hours_coordinator.data:
-                trading_hours = self.trading_hours_coordinator.data.get(station_code, "Hours not provided by station")
-
-            processed_stations.append({
-                "name": station_info.get("name"),
-                "address": station_info.get("address"),
-                "code": station_code,
-                "price": round(price / 100.0, 3),
-                "discounted_price": round(discounted_price / 100.0, 3),
-                "distributor": additional_data.get("distributors", {}).get(station_code, "No data found"),
-                "operator": additional_data.get("operators", {}).get(station_code, "No data found"),
-                ATTR_TYRE_INFLATION: has_tyres,
-                ATTR_TRADING_HOURS: trading_hours,
-                **self._calculate_distance_attributes(station_info),
-            })
-        return processed_stations
-
-    def _calculate_distance_attributes(self, station_info: dict) -> dict:
-        """Helper to calculate distance for a single station."""
-        location_entity_id = self.entry.options.get(CONF_LOCATION_ENTITY)
-        if not location_entity_id:
-            return {ATTR_DISTANCE: "Not Configured", ATTR_IN_RANGE: True}
-
-        range_km = self.entry.options.get(CONF_RANGE, 5)
-        distance = None
-        is_in_range = True
-
-        if station_info and station_info.get("location"):
-            location_state = self.hass.states.get(location_entity_id)
-            if location_state and 'latitude' in location_state.attributes and 'longitude' in location_state.attributes:
-                phone_lat = location_state.attributes['latitude']
-                phone_lon = location_state.attributes['longitude']
-                station_lat = station_info["location"]["latitude"]
-                station_lon = station_info["location"]["longitude"]
-
-                if phone_lat and phone_lon and station_lat and station_lon:
-                    distance = haversine(phone_lat, phone_lon, station_lat, station_lon)
-                    is_in_range = distance <= range_km
-        
-        return {
-            ATTR_DISTANCE: f"{distance:.2f} km" if distance is not None else "Unknown",
-            ATTR_IN_RANGE: is_in_range,
-        }
+    @callback
+    def _schedule_open_change(self) -> None:
+        """Work the summary out again when a station in range next opens or closes, between price polls."""
+        self._cancel_open_change()
+        when = self._engine.next_open_change(self._fuel_type, self._origin, dt_util.now())
+        if when is not None:
+            # A second late so the boundary minute has been reached on arrival
+            self._open_change_cancel = async_track_point_in_time(
+                self.hass, self._handle_open_change, when + timedelta(seconds=1)
+            )
+
+    @callback
+    def _handle_open_change(self, now: datetime) -> None:
+        """Handle a station in range opening or closing."""
+        self._open_change_cancel = None
+        self._handle_coordinator_update()
 
     def _update_state(self) -> None:
-        """This method should be implemented by subclasses."""
-        raise NotImplementedError
+        """Update the state and attributes of the summary sensor."""
+        self._engine.sync(
+            self.coordinator.data,
+            self.additional_data_coordinator.data,
+            self.trading_hours_coordinator.data,
+        )
+        summary_list = self._engine.summary(
+            self._fuel_type,
+            filtered=self._filtered,
+            by_fill_cost=self._by_fill_cost,
+            origin=self._origin,
+            now=dt_util.now(),
+        )
+        self._attr_native_value = self._engine.summary_value(summary_list)
+        self._attr_extra_state_attributes[ATTR_STATIONS] = summary_list
 
 class TasFuelCheapestNearMeSummarySensor(BaseSummarySensor):
     """Representation of a summary sensor for the cheapest stations nearby."""
@@ -606,94 +508,113 @@ class TasFuelCheapestNearMeSummarySensor(BaseSummarySensor):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._attr_name = f"{self._fuel_type} Cheapest Near Me"
-        self._attr_unique_id = f"{self.entry.entry_id}_{self._fuel_type}_cheapest_near_me"
-        price_format = self.entry.options.get(CONF_PRICE_FORMAT, PRICE_FORMAT_DOLLARS)
-        self._attr_native_unit_of_measurement = "c/L" if price_format == PRICE_FORMAT_CENTS else "AUD/L"
-
-    def _update_state(self) -> None:
-        """Update the state and attributes of the summary sensor."""
-        all_stations = self._build_station_list()
-        
-        in_range_stations = [s for s in all_stations if s[ATTR_IN_RANGE]]
-
-        if not in_range_stations:
-            self._attr_native_value = None
-            self._attr_extra_state_attributes[ATTR_STATIONS] = []
-            return
-
-        sorted_stations = sorted(in_range_stations, key=operator.itemgetter("discounted_price"))
-        
-        cheapest_overall = sorted_stations[0]
-        cheapest_with_tyres = next((s for s in sorted_stations if s[ATTR_TYRE_INFLATION]), None)
-
-        summary_list = []
-        if cheapest_with_tyres and cheapest_with_tyres["code"] == cheapest_overall["code"]:
-            summary_list.append(cheapest_overall)
-        elif cheapest_with_tyres:
-            summary_list.append(cheapest_overall)
-            summary_list.append(cheapest_with_tyres)
+        if self._origin is None:
+            self._attr_name = f"{self._fuel_type} Cheapest Near Me"
+            self._attr_unique_id = summary_sensor_unique_id(self.entry.entry_id, self._fuel_type, "cheapest_near_me")
         else:
-            summary_list.append(cheapest_overall)
-
-        price_format = self.entry.options.get(CONF_PRICE_FORMAT, PRICE_FORMAT_DOLLARS)
-        if price_format == PRICE_FORMAT_CENTS:
-            self._attr_native_value = round(cheapest_overall["discounted_price"] * 100, 1)
-        else:
-            self._attr_native_value = cheapest_overall["discounted_price"]
-        self._attr_extra_state_attributes[ATTR_STATIONS] = summary_list
+            origin_state = self.hass.states.get(self._origin)
+            origin_name = origin_state.name if origin_state else self._origin.split(".", 1)[-1]
+            self._attr_name = f"{self._fuel_type} Cheapest Near {origin_name}"
+            self._attr_unique_id = summary_sensor_unique_id(
+                self.entry.entry_id, self._fuel_type, f"cheapest_near_{slugify(self._origin.replace('.', '_'))}"
+            )
 
 class TasFuelCheapestFilteredSummarySensor(BaseSummarySensor):
     """Representation of a summary sensor with user-defined filters."""
     _attr_icon = "mdi:filter-variant"
+    _filtered = True
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._attr_name = f"{self._fuel_type} Cheapest Filtered"
-        self._attr_unique_id = f"{self.entry.entry_id}_{self._fuel_type}_cheapest_filtered"
-        price_format = self.entry.options.get(CONF_PRICE_FORMAT, PRICE_FORMAT_DOLLARS)
-        self._attr_native_unit_of_measurement = "c/L" if price_format == PRICE_FORMAT_CENTS else "AUD/L"
+        self._attr_unique_id = summary_sensor_unique_id(self.entry.entry_id, self._fuel_type, "cheapest_filtered")
+
+class TasFuelCheapestFillSummarySensor(BaseSummarySensor):
+    """Representation of a summary sensor ranking nearby stations by the total cost of a fill."""
+    _attr_icon = "mdi:gas-station"
+    _attr_device_class = SensorDeviceClass.MONETARY
+    _by_fill_cost = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._attr_name = f"{self._fuel_type} Cheapest Fill"
+        self._attr_unique_id = summary_sensor_unique_id(self.entry.entry_id, self._fuel_type, "cheapest_fill")
+        self._attr_native_unit_of_measurement = "AUD"
 
     def _update_state(self) -> None:
-        """Update the state and attributes of the summary sensor."""
-        all_stations = self._build_station_list()
-        options = self.entry.options
-        
-        excluded_distributors = set(options.get(CONF_EXCLUDED_DISTRIBUTORS, []))
-        excluded_operators = set(options.get(CONF_EXCLUDED_OPERATORS, []))
+        """Update the state to the cost of a fill at the top ranked station."""
+        super()._update_state()
+        summary_list = self._attr_extra_state_attributes[ATTR_STATIONS]
+        self._attr_native_value = summary_list[0][ATTR_FILL_COST] if summary_list else None
 
-        filtered_stations = [
-            s for s in all_stations
-            if s.get(ATTR_IN_RANGE, False) and
-               s.get("distributor") not in excluded_distributors and
-               s.get("operator") not in excluded_operators
-        ]
 
-        if not filtered_stations:
-            self._attr_native_value = None
-            self._attr_extra_state_attributes[ATTR_STATIONS] = []
-            return
+class TasFuelPriceCycleSensor(CoordinatorEntity, SensorEntity):
+    """Representation of a sensor showing where a region is in its price cycle."""
+    _attr_has_entity_name = True
+    _attr_icon = "mdi:chart-bell-curve-cumulative"
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = [CYCLE_PHASE_UNKNOWN, CYCLE_PHASE_RESTORING, CYCLE_PHASE_FALLING, CYCLE_PHASE_TROUGH]
 
-        sorted_stations = sorted(filtered_stations, key=operator.itemgetter("discounted_price"))
-        
-        cheapest_overall = sorted_stations[0]
-        cheapest_with_tyres = next((s for s in sorted_stations if s.get(ATTR_TYRE_INFLATION)), None)
-
-        summary_list = []
-        if cheapest_with_tyres and cheapest_with_tyres["code"] == cheapest_overall["code"]:
-            summary_list.append(cheapest_overall)
-        elif cheapest_with_tyres:
-            summary_list.append(cheapest_overall)
-            summary_list.append(cheapest_with_tyres)
-        else:
-            summary_list.append(cheapest_overall)
-        
-        price_format = self.entry.options.get(CONF_PRICE_FORMAT, PRICE_FORMAT_DOLLARS)
-        if price_format == PRICE_FORMAT_CENTS:
-            self._attr_native_value = round(cheapest_overall["discounted_price"] * 100, 1)
-        else:
-            self._attr_native_value = cheapest_overall["discounted_price"]
-        self._attr_extra_state_attributes[ATTR_STATIONS] = summary_list
+    def __init__(
+        self,
+        price_coordinator: DataUpdateCoordinator,
+        entry: ConfigEntry,
+        engine: FuelPriceEngine,
+        analytics: PriceCycleAnalytics,
+        region: str,
+        fuel_type: str,
+    ) -> None:
+        """Initialize the price cycle sensor."""
+        super().__init__(price_coordinator)
+        self.entry = entry
+        self._engine = engine
+        self._analytics = analytics
+        self._region = region
+        self._fuel_type = fuel_type
+        self._attr_name = f"{fuel_type} {region.title()} Price Cycle"
+        self._attr_unique_id = cycle_sensor_unique_id(entry.entry_id, fuel_type, region)
+        self._update_state()
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return information about the device this sensor is part of."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.entry.entry_id)},
+            name=CONF_DEVICE_NAME,
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._update_state()
+        self.async_write_ha_state()
+
+    def _update_state(self) -> None:
+        """Update the phase and the cycle estimate attributes."""
+        now = dt_util.utcnow().timestamp()
+        estimate = self._analytics.estimate(self._region, self._fuel_type, now)
+        self._attr_native_value = estimate.phase
+        self._attr_extra_state_attributes = {
+            ATTR_CONFIDENCE: estimate.confidence,
+            ATTR_REGIONAL_AVERAGE: (
+                self._engine.format_price(estimate.average) if estimate.average is not None else None
+            ),
+            ATTR_STATIONS: estimate.stations,
+            ATTR_LAST_RESTORATION: (
+                dt_util.utc_from_timestamp(estimate.last_restoration).isoformat()
+                if estimate.last_restoration is not None else None
+            ),
+            ATTR_CYCLE_LENGTH: (
+                round(estimate.cycle_length / 86400, 1) if estimate.cycle_length is not None else None
+            ),
+            ATTR_NEXT_TROUGH: (
+                dt_util.utc_from_timestamp(estimate.next_trough).isoformat()
+                if estimate.next_trough is not None else None
+            ),
+            ATTR_HOURS_TO_TROUGH: (
+                round((estimate.next_trough - now) / 3600, 1) if estimate.next_trough is not None else None
+            ),
+        }
 
 
 class TasFuelTokenExpirySensor(CoordinatorEntity, SensorEntity):
@@ -740,13 +661,14 @@ class TasFuelPricesLastUpdatedSensor(CoordinatorEntity, SensorEntity):
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_device_class = SensorDeviceClass.TIMESTAMP
 
-    def __init__(self, coordinator: DataUpdateCoordinator) -> None:
+    def __init__(self, coordinator: DataUpdateCoordinator, api_client: TasFuelAPI) -> None:
         """Initialize the diagnostic sensor."""
         super().__init__(coordinator)
+        self._api_client = api_client
         self.entity_id = f"sensor.{DOMAIN}_prices_last_updated"
         self._attr_unique_id = f"{coordinator.config_entry.entry_id}_prices_last_updated"
         self._attr_name = "Prices Last Updated"
-        self._attr_native_value = dt_util.utcnow() if coordinator.last_update_success else None
+        self._attr_native_value = self._snapshot_time() if coordinator.last_update_success else None
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -756,10 +678,23 @@ class TasFuelPricesLastUpdatedSensor(CoordinatorEntity, SensorEntity):
             name=CONF_DEVICE_NAME,
         )
 
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the data age, upstream health and current adaptive polling interval."""
+        interval = self.coordinator.update_interval
+        return {
+            **snapshot_health_attributes(self._api_client, "prices"),
+            ATTR_POLLING_INTERVAL: f"{interval.total_seconds() / 60:.0f} min" if interval else "Unknown",
+        }
+
+    def _snapshot_time(self) -> datetime:
+        """Return when the data currently being served was fetched."""
+        return self._api_client.snapshot_time("prices") or dt_util.utcnow()
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._attr_native_value = dt_util.utcnow()
+        self._attr_native_value = self._snapshot_time()
         self.async_write_ha_state()
 
 class TasFuelAdditionalDataLastUpdatedSensor(CoordinatorEntity, SensorEntity):
@@ -768,13 +703,14 @@ class TasFuelAdditionalDataLastUpdatedSensor(CoordinatorEntity, SensorEntity):
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_device_class = SensorDeviceClass.TIMESTAMP
 
-    def __init__(self, coordinator: DataUpdateCoordinator) -> None:
+    def __init__(self, coordinator: DataUpdateCoordinator, api_client: TasFuelAPI) -> None:
         """Initialize the diagnostic sensor."""
         super().__init__(coordinator)
+        self._api_client = api_client
         self.entity_id = f"sensor.{DOMAIN}_additional_data_last_updated"
         self._attr_unique_id = f"{coordinator.config_entry.entry_id}_additional_data_last_updated"
         self._attr_name = "Additional Data Last Updated"
-        self._attr_native_value = dt_util.utcnow() if coordinator.last_update_success else None
+        self._attr_native_value = self._snapshot_time() if coordinator.last_update_success else None
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -784,10 +720,19 @@ class TasFuelAdditionalDataLastUpdatedSensor(CoordinatorEntity, SensorEntity):
             name=CONF_DEVICE_NAME,
         )
 
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the data age and upstream health."""
+        return snapshot_health_attributes(self._api_client, "additional_data")
+
+    def _snapshot_time(self) -> datetime:
+        """Return when the data currently being served was fetched."""
+        return self._api_client.snapshot_time("additional_data") or dt_util.utcnow()
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._attr_native_value = dt_util.utcnow()
+        self._attr_native_value = self._snapshot_time()
         self.async_write_ha_state()
 
 class TasFuelTradingHoursLastUpdatedSensor(CoordinatorEntity, SensorEntity):
@@ -796,13 +741,14 @@ class TasFuelTradingHoursLastUpdatedSensor(CoordinatorEntity, SensorEntity):
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_device_class = SensorDeviceClass.TIMESTAMP
 
-    def __init__(self, coordinator: DataUpdateCoordinator) -> None:
+    def __init__(self, coordinator: DataUpdateCoordinator, api_client: TasFuelAPI) -> None:
         """Initialize the diagnostic sensor."""
         super().__init__(coordinator)
+        self._api_client = api_client
         self.entity_id = f"sensor.{DOMAIN}_trading_hours_last_updated"
         self._attr_unique_id = f"{coordinator.config_entry.entry_id}_trading_hours_last_updated"
         self._attr_name = "Trading Hours Last Updated"
-        self._attr_native_value = dt_util.utcnow() if coordinator.last_update_success else None
+        self._attr_native_value = self._snapshot_time() if coordinator.last_update_success else None
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -812,8 +758,139 @@ class TasFuelTradingHoursLastUpdatedSensor(CoordinatorEntity, SensorEntity):
             name=CONF_DEVICE_NAME,
         )
 
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the data age and upstream health."""
+        return snapshot_health_attributes(self._api_client, "trading_hours")
+
+    def _snapshot_time(self) -> datetime:
+        """Return when the data currently being served was fetched."""
+        return self._api_client.snapshot_time("trading_hours") or dt_util.utcnow()
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._attr_native_value = dt_util.utcnow()
-        self.async_write_ha_state()
\ No newline at end of file
+        self._attr_native_value = self._snapshot_time()
+        self.async_write_ha_state()
+
+class TasFuelDataTransferredSensor(CoordinatorEntity, SensorEntity):
+    """Representation of a sensor that shows how much data was downloaded from upstream."""
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+    _attr_suggested_unit_of_measurement = UnitOfInformation.KILOBYTES
+    _attr_icon = "mdi:download-network"
+
+    def __init__(
+        self,
+        price_coordinator: DataUpdateCoordinator,
+        additional_data_coordinator: DataUpdateCoordinator,
+        trading_hours_coordinator: DataUpdateCoordinator,
+        api_client: TasFuelAPI,
+    ) -> None:
+        """Initialize the diagnostic sensor."""
+        super().__init__(price_coordinator)
+        self.additional_data_coordinator = additional_data_coordinator
+        self.trading_hours_coordinator = trading_hours_coordinator
+        self._api_client = api_client
+        self.entity_id = f"sensor.{DOMAIN}_data_transferred"
+        self._attr_unique_id = f"{price_coordinator.config_entry.entry_id}_data_transferred"
+        self._attr_name = "Upstream Data Transferred"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return information about the device this sensor is part of."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.coordinator.config_entry.entry_id)},
+            name=CONF_DEVICE_NAME,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Handle entity which will be added."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.additional_data_coordinator.async_add_listener(self._handle_coordinator_update)
+        )
+        self.async_on_remove(
+            self.trading_hours_coordinator.async_add_listener(self._handle_coordinator_update)
+        )
+
+    @property
+    def native_value(self) -> int:
+        """Return the compressed bytes received since startup."""
+        return self._api_client.total_compressed_bytes
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the per-endpoint transfer breakdown."""
+        return {
+            endpoint: {
+                "requests": stats.get("requests", 0),
+                "content_encoding": stats.get("content_encoding"),
+                "last_compressed_bytes": stats.get("compressed_bytes"),
+                "last_decompressed_bytes": stats.get("decompressed_bytes"),
+                "total_compressed_bytes": stats.get("total_compressed_bytes", 0),
+                "total_decompressed_bytes": stats.get("total_decompressed_bytes", 0),
+            }
+            for endpoint, stats in self._api_client.fetch_stats.items()
+        }
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from any coordinator."""
+        self.async_write_ha_state()
+
+class TasFuelRefreshDurationSensor(SensorEntity):
+    """Representation of a sensor that shows how long a coordinator's last refresh took."""
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_icon = "mdi:timer-outline"
+    _attr_should_poll = False
+
+    def __init__(self, entry: ConfigEntry, api_client: TasFuelAPI, group: str, name: str) -> None:
+        """Initialize the diagnostic sensor."""
+        self.entry = entry
+        self._api_client = api_client
+        self._group = group
+        self.entity_id = f"sensor.{DOMAIN}_{group}_refresh_duration"
+        self._attr_unique_id = f"{entry.entry_id}_{group}_refresh_duration"
+        self._attr_name = f"{name} Refresh Duration"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return information about the device this sensor is part of."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.entry.entry_id)},
+            name=CONF_DEVICE_NAME,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Handle entity which will be added."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                f"{DOMAIN}_{self.entry.entry_id}_metrics_updated",
+                self.async_write_ha_state,
+            )
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the duration of the last complete refresh cycle."""
+        return self._api_client.metrics.last_cycle_ms(self._group)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the per-stage timings, byte and record counts, and snapshot size."""
+        summary = self._api_client.metrics.summary(self._group)
+        return {
+            **{f"cycle_{key}": value for key, value in summary["cycle"].items()},
+            ATTR_STAGES: summary["stages"],
+            ATTR_SNAPSHOT_BYTES: summary["snapshot_bytes"],
+        }
\ No newline at end of file
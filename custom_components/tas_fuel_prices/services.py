@@ -0,0 +1,580 @@
+"""Services for the Tasmanian Fuel Prices integration."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import cProfile
+import io
+import pstats
+import time
+import uuid
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID, ATTR_ENTITY_ID, ATTR_LATITUDE, ATTR_LONGITUDE, ATTR_NAME
+from homeassistant.core import Event, HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    LOGGER,
+    SERVICE_PROFILE_REFRESH,
+    ATTR_TOP,
+    DEFAULT_PROFILE_TOP,
+    SERVICE_REPLAY_PAYLOADS,
+    ATTR_START,
+    ATTR_END,
+    ATTR_SPEED,
+    ATTR_STOP,
+    DEFAULT_REPLAY_SPEED,
+    SERVICE_PRICE_HISTORY,
+    ATTR_STATION_ID,
+    ATTR_FUEL_TYPE,
+    ATTR_INCLUDE_RECORDS,
+    SERVICE_ADD_PRICE_ALERT,
+    SERVICE_REMOVE_PRICE_ALERT,
+    SERVICE_LIST_PRICE_ALERTS,
+    ATTR_ALERT_ID,
+    ATTR_PRICE,
+    ATTR_DIRECTION,
+    ATTR_RADIUS,
+    ATTR_CHEAPEST,
+    ALERT_BELOW,
+    ALERT_ABOVE,
+    SERVICE_FIND_CHEAPEST,
+    ATTR_OPEN_NOW,
+    ATTR_FILTERED,
+    ATTR_EXCLUDE_STATIONS,
+    DEFAULT_FIND_RADIUS,
+    DEFAULT_FIND_TOP,
+    SERVICE_FIND_ALONG_ROUTE,
+    ATTR_ROUTE,
+    ATTR_BUFFER,
+    DEFAULT_ROUTE_BUFFER,
+    STORAGE_SAVE_DELAY,
+)
+from .alerts import PriceAlert, PriceAlertIndex
+from .core import FuelPriceEngine
+from .history import PriceHistory
+from .recording import PayloadArchive, RecordedPayload
+
+PROFILE_REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_TOP, default=DEFAULT_PROFILE_TOP): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+    }
+)
+
+REPLAY_PAYLOADS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_SPEED, default=DEFAULT_REPLAY_SPEED): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(ATTR_STOP, default=False): cv.boolean,
+    }
+)
+
+PRICE_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_STATION_ID): cv.string,
+        vol.Required(ATTR_FUEL_TYPE): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_INCLUDE_RECORDS, default=False): cv.boolean,
+    }
+)
+
+ADD_PRICE_ALERT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_ALERT_ID): cv.string,
+        vol.Optional(ATTR_NAME): cv.string,
+        vol.Required(ATTR_FUEL_TYPE): cv.string,
+        vol.Required(ATTR_PRICE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(ATTR_DIRECTION, default=ALERT_BELOW): vol.In([ALERT_BELOW, ALERT_ABOVE]),
+        vol.Optional(ATTR_STATION_ID): cv.string,
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_id,
+        vol.Inclusive(ATTR_LATITUDE, "coordinates"): cv.latitude,
+        vol.Inclusive(ATTR_LONGITUDE, "coordinates"): cv.longitude,
+        vol.Optional(ATTR_RADIUS): vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False)),
+        vol.Optional(ATTR_CHEAPEST, default=False): cv.boolean,
+    }
+)
+
+REMOVE_PRICE_ALERT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_ALERT_ID): cv.string,
+    }
+)
+
+LIST_PRICE_ALERTS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+FIND_CHEAPEST_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_FUEL_TYPE): cv.string,
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_id,
+        vol.Inclusive(ATTR_LATITUDE, "coordinates"): cv.latitude,
+        vol.Inclusive(ATTR_LONGITUDE, "coordinates"): cv.longitude,
+        vol.Optional(ATTR_RADIUS, default=DEFAULT_FIND_RADIUS): vol.All(
+            vol.Coerce(float), vol.Range(min=0, min_included=False)
+        ),
+        vol.Optional(ATTR_TOP, default=DEFAULT_FIND_TOP): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+        vol.Optional(ATTR_OPEN_NOW, default=False): cv.boolean,
+        vol.Optional(ATTR_FILTERED, default=False): cv.boolean,
+        vol.Optional(ATTR_EXCLUDE_STATIONS, default=[]): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+def route_point(value) -> tuple[float, float]:
+    """Validate a route point given as [latitude, longitude] or as a mapping with latitude and longitude."""
+    if isinstance(value, dict):
+        value = [value.get(ATTR_LATITUDE), value.get(ATTR_LONGITUDE)]
+    if not isinstance(value, (list, tuple)) or len(value) != 2:
+        raise vol.Invalid("Route points must be [latitude, longitude] pairs")
+    return cv.latitude(value[0]), cv.longitude(value[1])
+
+
+FIND_ALONG_ROUTE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_FUEL_TYPE): cv.string,
+        vol.Required(ATTR_ROUTE): vol.All(cv.ensure_list, vol.Length(min=1), [route_point]),
+        vol.Optional(ATTR_BUFFER, default=DEFAULT_ROUTE_BUFFER): vol.All(
+            vol.Coerce(float), vol.Range(min=0, min_included=False)
+        ),
+        vol.Optional(ATTR_TOP, default=DEFAULT_FIND_TOP): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+        vol.Optional(ATTR_OPEN_NOW, default=False): cv.boolean,
+        vol.Optional(ATTR_FILTERED, default=False): cv.boolean,
+        vol.Optional(ATTR_EXCLUDE_STATIONS, default=[]): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+# Coordinator fed by the payloads of each fetch method
+REPLAY_COORDINATORS = {
+    "prices": "price_coordinator",
+    "trading_hours": "trading_hours_coordinator",
+    "additional_data": "additional_data_coordinator",
+}
+
+
+def get_data_bundle(hass: HomeAssistant, call: ServiceCall) -> dict:
+    """Return the data bundle of the entry a service call targets, defaulting to the first entry."""
+    entries = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID) or next(iter(entries), None)
+    if entry_id not in entries:
+        raise HomeAssistantError(f"No loaded {DOMAIN} config entry found for '{entry_id}'")
+    return entries[entry_id]
+
+
+def hot_spots(stats: pstats.Stats, limit: int) -> list[dict]:
+    """Return the functions with the most time spent in their own code."""
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+    return [
+        {
+            "function": f"{filename}:{line}({name})",
+            "calls": calls,
+            "own_time_ms": round(own_time * 1000, 3),
+            "cumulative_time_ms": round(cumulative_time * 1000, 3),
+        }
+        for (filename, line, name), (_, calls, own_time, cumulative_time, _) in rows[:limit]
+    ]
+
+
+def write_profile_report(profiler: cProfile.Profile, path: str) -> None:
+    """Write the raw profile and a report sorted by cumulative time."""
+    profiler.dump_stats(f"{path}.prof")
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats(pstats.SortKey.CUMULATIVE).print_stats()
+    with open(f"{path}.txt", "w", encoding="utf-8") as file:
+        file.write(report.getvalue())
+
+
+async def async_resume_live_data(data_bundle: dict) -> None:
+    """Stop serving replayed payloads and refresh every coordinator from the upstreams."""
+    data_bundle["api"].stop_replay()
+    for key in REPLAY_COORDINATORS.values():
+        await data_bundle[key].async_request_refresh()
+
+
+async def async_replay(data_bundle: dict, records: list[RecordedPayload], speed: float) -> None:
+    """
+    Feed recorded payloads through the coordinators in order, waiting the recorded
+    time between them divided by `speed`, or not at all when `speed` is 0.
+    """
+    api = data_bundle["api"]
+    api.start_replay()
+    previous = records[0].recorded_at
+    try:
+        for record in records:
+            if speed:
+                await asyncio.sleep((record.recorded_at - previous).total_seconds() / speed)
+            previous = record.recorded_at
+            api.replay_payload(record.key, record.payload)
+            await data_bundle[REPLAY_COORDINATORS[record.key]].async_refresh()
+    except asyncio.CancelledError:
+        api.stop_replay()
+        raise
+    LOGGER.info("Replayed %s payloads up to %s", len(records), previous.isoformat())
+    await async_resume_live_data(data_bundle)
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+    if hass.services.has_service(DOMAIN, SERVICE_PROFILE_REFRESH):
+        return
+
+    async def async_profile_refresh(call: ServiceCall) -> ServiceResponse:
+        """
+        Run a full refresh of every coordinator, including the entity updates, under cProfile.
+        The profiler sees everything on the event loop while it runs, but not work done in executor threads.
+        """
+        data_bundle = get_data_bundle(hass, call)
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+        except ValueError as err:
+            raise HomeAssistantError(f"Another profiler is already running: {err}") from err
+        try:
+            for key in ("price_coordinator", "additional_data_coordinator", "trading_hours_coordinator"):
+                await data_bundle[key].async_refresh()
+        finally:
+            profiler.disable()
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        path = hass.config.path(f"{DOMAIN}_profile_{dt_util.now().strftime('%Y%m%d_%H%M%S')}")
+        await hass.async_add_executor_job(write_profile_report, profiler, path)
+        LOGGER.info("Profiled a full refresh in %.0f ms, report written to %s.txt", duration_ms, path)
+
+        return {
+            "duration_ms": round(duration_ms, 1),
+            "report": f"{path}.txt",
+            "profile": f"{path}.prof",
+            "hot_spots": hot_spots(pstats.Stats(profiler), call.data[ATTR_TOP]),
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_REFRESH,
+        async_profile_refresh,
+        schema=PROFILE_REFRESH_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_replay_payloads(call: ServiceCall) -> ServiceResponse:
+        """
+        Start replaying recorded payloads in the background, replacing any replay already running.
+        While it runs, scheduled refreshes serve the last replayed payloads instead of fetching.
+        """
+        data_bundle = get_data_bundle(hass, call)
+        if (task := data_bundle["replay_task"]) and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            data_bundle["replay_task"] = None
+            if call.data[ATTR_STOP]:
+                LOGGER.info("Payload replay stopped, going back to live data")
+                await async_resume_live_data(data_bundle)
+        if call.data[ATTR_STOP]:
+            return {"records": 0}
+
+        start = dt_util.as_utc(call.data[ATTR_START]) if ATTR_START in call.data else None
+        end = dt_util.as_utc(call.data[ATTR_END]) if ATTR_END in call.data else None
+        archive: PayloadArchive = data_bundle["archive"]
+        records = await hass.async_add_executor_job(lambda: list(archive.read(start, end)))
+        if not records:
+            raise HomeAssistantError("No recorded payloads found for the requested period")
+
+        speed = call.data[ATTR_SPEED]
+        recorded_seconds = (records[-1].recorded_at - records[0].recorded_at).total_seconds()
+        data_bundle["replay_task"] = hass.async_create_background_task(
+            async_replay(data_bundle, records, speed), f"{DOMAIN} payload replay"
+        )
+        LOGGER.info("Replaying %s payloads recorded over %.0f seconds at %sx", len(records), recorded_seconds, speed)
+
+        return {
+            "records": len(records),
+            "first_recorded": records[0].recorded_at.isoformat(),
+            "last_recorded": records[-1].recorded_at.isoformat(),
+            "duration_s": round(recorded_seconds / speed, 1) if speed else 0,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REPLAY_PAYLOADS,
+        async_replay_payloads,
+        schema=REPLAY_PAYLOADS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_price_history(call: ServiceCall) -> ServiceResponse:
+        """Return the recorded price changes of one station and fuel type over a period."""
+        data_bundle = get_data_bundle(hass, call)
+        start = dt_util.as_utc(call.data[ATTR_START]).timestamp() if ATTR_START in call.data else None
+        end = dt_util.as_utc(call.data[ATTR_END]).timestamp() if ATTR_END in call.data else None
+        return price_history_response(
+            data_bundle["price_history"],
+            call.data[ATTR_STATION_ID],
+            call.data[ATTR_FUEL_TYPE],
+            start,
+            end,
+            call.data[ATTR_INCLUDE_RECORDS],
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PRICE_HISTORY,
+        async_price_history,
+        schema=PRICE_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_add_price_alert(call: ServiceCall) -> ServiceResponse:
+        """Register a price alert, or replace the alert with the same alert_id."""
+        data_bundle = get_data_bundle(hass, call)
+        alert = price_alert_from_call(hass, call, data_bundle["engine"])
+        price_alerts: PriceAlertIndex = data_bundle["price_alerts"]
+        price_alerts.add(alert)
+        async_track_alert_locations(hass, data_bundle)
+        await data_bundle["alerts_store"].async_save(price_alerts.as_dict())
+        return {ATTR_ALERT_ID: alert.alert_id}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ADD_PRICE_ALERT,
+        async_add_price_alert,
+        schema=ADD_PRICE_ALERT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_remove_price_alert(call: ServiceCall) -> None:
+        """Unregister a price alert."""
+        data_bundle = get_data_bundle(hass, call)
+        price_alerts: PriceAlertIndex = data_bundle["price_alerts"]
+        if price_alerts.remove(call.data[ATTR_ALERT_ID]) is None:
+            raise HomeAssistantError(f"No price alert with id '{call.data[ATTR_ALERT_ID]}'")
+        async_track_alert_locations(hass, data_bundle)
+        await data_bundle["alerts_store"].async_save(price_alerts.as_dict())
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REMOVE_PRICE_ALERT,
+        async_remove_price_alert,
+        schema=REMOVE_PRICE_ALERT_SCHEMA,
+    )
+
+    async def async_list_price_alerts(call: ServiceCall) -> ServiceResponse:
+        """Return every registered price alert."""
+        data_bundle = get_data_bundle(hass, call)
+        return {
+            "alerts": [
+                price_alert_response(alert, data_bundle["engine"])
+                for alert in data_bundle["price_alerts"].alerts()
+            ]
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_LIST_PRICE_ALERTS,
+        async_list_price_alerts,
+        schema=LIST_PRICE_ALERTS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_find_cheapest(call: ServiceCall) -> ServiceResponse:
+        """
+        Return the cheapest stations for a fuel around a location, from the current snapshot.
+        Without coordinates or an entity, the configured location entity is used.
+        """
+        data_bundle = get_data_bundle(hass, call)
+        engine: FuelPriceEngine = data_bundle["engine"]
+        latitude, longitude = location_from_call(hass, call)
+        if latitude is None:
+            if engine.location is None:
+                raise HomeAssistantError("No location given and no location entity configured")
+            latitude, longitude = engine.location
+
+        start = time.perf_counter()
+        stations = engine.find_cheapest(
+            call.data[ATTR_FUEL_TYPE],
+            latitude,
+            longitude,
+            call.data[ATTR_RADIUS],
+            call.data[ATTR_TOP],
+            filtered=call.data[ATTR_FILTERED],
+            exclude=set(call.data[ATTR_EXCLUDE_STATIONS]),
+            open_at=dt_util.now() if call.data[ATTR_OPEN_NOW] else None,
+        )
+        LOGGER.debug("find_cheapest answered in %.3f ms", (time.perf_counter() - start) * 1000)
+        return {
+            ATTR_FUEL_TYPE: call.data[ATTR_FUEL_TYPE],
+            ATTR_LATITUDE: latitude,
+            ATTR_LONGITUDE: longitude,
+            "unit": engine.unit,
+            "stations": stations,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_CHEAPEST,
+        async_find_cheapest,
+        schema=FIND_CHEAPEST_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_find_along_route(call: ServiceCall) -> ServiceResponse:
+        """Return the cheapest stations for a fuel within a corridor along a route."""
+        data_bundle = get_data_bundle(hass, call)
+        engine: FuelPriceEngine = data_bundle["engine"]
+        start = time.perf_counter()
+        stations = engine.find_along_route(
+            call.data[ATTR_FUEL_TYPE],
+            call.data[ATTR_ROUTE],
+            call.data[ATTR_BUFFER],
+            call.data[ATTR_TOP],
+            filtered=call.data[ATTR_FILTERED],
+            exclude=set(call.data[ATTR_EXCLUDE_STATIONS]),
+            open_at=dt_util.now() if call.data[ATTR_OPEN_NOW] else None,
+        )
+        LOGGER.debug(
+            "find_along_route answered for %s route points in %.3f ms",
+            len(call.data[ATTR_ROUTE]), (time.perf_counter() - start) * 1000,
+        )
+        return {
+            ATTR_FUEL_TYPE: call.data[ATTR_FUEL_TYPE],
+            "unit": engine.unit,
+            "stations": stations,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_ALONG_ROUTE,
+        async_find_along_route,
+        schema=FIND_ALONG_ROUTE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def location_from_call(hass: HomeAssistant, call: ServiceCall) -> tuple[float | None, float | None]:
+    """Return the coordinates given to a service call, or the current location of its entity_id."""
+    if entity_id := call.data.get(ATTR_ENTITY_ID):
+        state = hass.states.get(entity_id)
+        if state is None or ATTR_LATITUDE not in state.attributes or ATTR_LONGITUDE not in state.attributes:
+            raise HomeAssistantError(f"{entity_id} has no location")
+        return state.attributes[ATTR_LATITUDE], state.attributes[ATTR_LONGITUDE]
+    return call.data.get(ATTR_LATITUDE), call.data.get(ATTR_LONGITUDE)
+
+
+@callback
+def async_track_alert_locations(hass: HomeAssistant, data_bundle: dict) -> None:
+    """Listen to the location entities price alerts follow, replacing the previous listener."""
+    if data_bundle.get("alert_location_listener_cancel"):
+        data_bundle["alert_location_listener_cancel"]()
+        data_bundle["alert_location_listener_cancel"] = None
+    price_alerts: PriceAlertIndex = data_bundle["price_alerts"]
+    if not (entity_ids := price_alerts.entity_ids()):
+        return
+
+    @callback
+    def alert_location_listener(event: Event) -> None:
+        """Move the alerts following an entity to its new location."""
+        state = event.data["new_state"]
+        if state is None or ATTR_LATITUDE not in state.attributes or ATTR_LONGITUDE not in state.attributes:
+            return
+        if price_alerts.move(event.data["entity_id"], state.attributes[ATTR_LATITUDE], state.attributes[ATTR_LONGITUDE]):
+            data_bundle["alerts_store"].async_delay_save(price_alerts.as_dict, STORAGE_SAVE_DELAY)
+
+    data_bundle["alert_location_listener_cancel"] = async_track_state_change_event(
+        hass, sorted(entity_ids), alert_location_listener
+    )
+
+
+def price_alert_from_call(hass: HomeAssistant, call: ServiceCall, engine: FuelPriceEngine) -> PriceAlert:
+    """Build the alert described by an add_price_alert call, starting an entity's alert at its current location."""
+    latitude, longitude = location_from_call(hass, call)
+
+    station_code = call.data.get(ATTR_STATION_ID)
+    radius = call.data.get(ATTR_RADIUS)
+    if station_code is None and (latitude is None or radius is None):
+        raise HomeAssistantError("An alert needs a station_id, or a location and a radius")
+    if station_code is not None and (latitude is not None or call.data[ATTR_CHEAPEST]):
+        raise HomeAssistantError("A station alert cannot also have a location or be a cheapest alert")
+
+    return PriceAlert(
+        alert_id=call.data.get(ATTR_ALERT_ID) or uuid.uuid4().hex,
+        fuel_type=call.data[ATTR_FUEL_TYPE],
+        threshold=engine.to_cents(call.data[ATTR_PRICE]),
+        direction=call.data[ATTR_DIRECTION],
+        station_code=station_code,
+        latitude=latitude,
+        longitude=longitude,
+        radius_km=radius if station_code is None else None,
+        cheapest=call.data[ATTR_CHEAPEST],
+        name=call.data.get(ATTR_NAME),
+        entity_id=call.data.get(ATTR_ENTITY_ID),
+    )
+
+
+def price_alert_response(alert: PriceAlert, engine: FuelPriceEngine) -> dict:
+    """Return an alert as a service response item, with the threshold in the configured price format."""
+    response = alert._asdict()
+    response["threshold"] = engine.format_price(alert.threshold)
+    return response
+
+
+def price_history_response(
+    history: PriceHistory,
+    station_code: str,
+    fuel_type: str,
+    start: float | None,
+    end: float | None,
+    include_records: bool,
+) -> dict:
+    """Return the price statistics, and optionally the records, of one station and fuel type."""
+    ring = history.series(station_code, fuel_type)
+    if ring is None:
+        raise HomeAssistantError(f"No price history for {fuel_type} at station {station_code}")
+
+    stats = ring.stats(start, end)
+    latest = ring.latest()
+    response = {
+        ATTR_STATION_ID: station_code,
+        ATTR_FUEL_TYPE: fuel_type,
+        "changes": stats.changes,
+        "lowest": stats.minimum,
+        "highest": stats.maximum,
+        "mean": round(stats.mean, 2) if stats.mean is not None else None,
+        "current": latest.price,
+        "current_since": dt_util.utc_from_timestamp(latest.timestamp).isoformat(),
+    }
+    if include_records:
+        response["records"] = [
+            {"time": dt_util.utc_from_timestamp(record.timestamp).isoformat(), "price": record.price}
+            for record in ring.records(start, end)
+        ]
+    return response
+
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the integration's services once no config entry is loaded."""
+    if hass.data.get(DOMAIN):
+        return
+    hass.services.async_remove(DOMAIN, SERVICE_PROFILE_REFRESH)
+    hass.services.async_remove(DOMAIN, SERVICE_REPLAY_PAYLOADS)
+    hass.services.async_remove(DOMAIN, SERVICE_PRICE_HISTORY)
+    hass.services.async_remove(DOMAIN, SERVICE_ADD_PRICE_ALERT)
+    hass.services.async_remove(DOMAIN, SERVICE_REMOVE_PRICE_ALERT)
+    hass.services.async_remove(DOMAIN, SERVICE_LIST_PRICE_ALERTS)
+    hass.services.async_remove(DOMAIN, SERVICE_FIND_CHEAPEST)
+    hass.services.async_remove(DOMAIN, SERVICE_FIND_ALONG_ROUTE)
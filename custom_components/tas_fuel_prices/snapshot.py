@@ -0,0 +1,81 @@
+"""Helpers for comparing FuelCheck price snapshots."""
+from __future__ import annotations
+
+from collections.abc import Collection, Mapping
+from typing import NamedTuple
+
+
+class PriceChange(NamedTuple):
+    """A single price that differs between two snapshots."""
+
+    station_code: str
+    fuel_type: str
+    old_price: float | None
+    new_price: float | None
+
+
+def index_prices(data: dict | None) -> dict[tuple[str, str], float]:
+    """Map (station code, fuel type) to price for a raw `fetch_prices` payload."""
+    if not data:
+        return {}
+
+    return {
+        (str(p.get("stationcode")), p.get("fueltype")): float(p["price"])
+        for p in data.get("prices", [])
+        if p.get("price") is not None
+    }
+
+
+def station_fuels(data: dict | None, states: Collection[str] | None = None) -> dict[str, set[str]]:
+    """
+    Map every station code in a raw `fetch_prices` payload to the fuels it has a price for.
+    With `states`, only stations in those states are included.
+    """
+    if not data:
+        return {}
+
+    fuels: dict[str, set[str]] = {
+        str(s.get("code")): set()
+        for s in data.get("stations", [])
+        if states is None or s.get("state") in states
+    }
+    for code, fuel in index_prices(data):
+        if states is None:
+            fuels.setdefault(code, set()).add(fuel)
+        elif code in fuels:
+            fuels[code].add(fuel)
+    return fuels
+
+
+def merge_snapshots(shards: Mapping[str, dict]) -> dict:
+    """
+    Merge `fetch_prices` payloads fetched per state into one payload.
+    Stations are tagged with the state they were fetched for, and a station
+    listed by more than one shard is kept once.
+    """
+    stations: dict[str, dict] = {}
+    prices: list[dict] = []
+    for state, shard in shards.items():
+        for station in shard.get("stations", []):
+            station.setdefault("state", state)
+            stations.setdefault(str(station.get("code")), station)
+        prices.extend(shard.get("prices", []))
+    return {"stations": list(stations.values()), "prices": prices}
+
+
+def diff_prices(
+    old_index: dict[tuple[str, str], float],
+    new_index: dict[tuple[str, str], float],
+) -> list[PriceChange]:
+    """Return every price that was added, removed or changed between two indexes."""
+    changes = [
+        PriceChange(code, fuel, old_index.get((code, fuel)), price)
+        for (code, fuel), price in new_index.items()
+        if old_index.get((code, fuel)) != price
+    ]
+    changes.extend(
+        PriceChange(code, fuel, price, None)
+        for (code, fuel), price in old_index.items()
+        if (code, fuel) not in new_index
+    )
+    return changes
@@ -0,0 +1,187 @@
+"""Long-term statistics import for the Tasmanian Fuel Prices integration."""
+from __future__ import annotations
+
+from collections.abc import Callable, Collection
+from datetime import datetime, timedelta
+import time
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LOGGER, STATISTICS_BACKFILL_HOURS
+from .core import FuelPriceEngine
+from .history import PriceHistory, PriceRing
+
+try:
+    from homeassistant.components.recorder.models import StatisticMeanType
+except ImportError:  # Home Assistant before 2025.4
+    StatisticMeanType = None
+
+# Newer recorders describe the mean with mean_type instead of has_mean, and expect a unit_class
+MEAN_METADATA = (
+    {"mean_type": StatisticMeanType.ARITHMETIC} if StatisticMeanType is not None else {"has_mean": True}
+)
+if "unit_class" in StatisticMetaData.__annotations__:
+    MEAN_METADATA["unit_class"] = None
+
+HOUR = timedelta(hours=1)
+
+
+def statistic_id(fuel_type: str, key: str) -> str:
+    """Return the external statistic id of a station or state aggregate."""
+    return f"{DOMAIN}:{fuel_type.lower()}_{key.lower()}"
+
+
+class StatisticsImporter:
+    """
+    Import hourly price statistics into the recorder's long-term statistics.
+
+    Each completed hour gets the lowest, mean and highest price in effect per
+    station and fuel type, taken from the price history, plus per-state
+    aggregates over every station. The rows are built in an executor and the
+    hours are imported together, one batch per statistic, and the last
+    imported hour is remembered so gaps are backfilled for up to
+    STATISTICS_BACKFILL_HOURS.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        history: PriceHistory,
+        engine: FuelPriceEngine,
+        fuel_types: Collection[str],
+        station_scope: Callable[[], Collection[str] | None],
+    ) -> None:
+        """Initialize the importer; `station_scope` returns the stations that get per-station statistics."""
+        self._hass = hass
+        self._history = history
+        self._engine = engine
+        self._fuel_types = set(fuel_types)
+        self._station_scope = station_scope
+        self._last_hour: datetime | None = None
+        self._importing = False
+        self.last_import: dict | None = None
+
+    def as_dict(self) -> dict:
+        """Return the import progress for persistence."""
+        return {"last_hour": self._last_hour.isoformat() if self._last_hour else None}
+
+    def load(self, data: dict | None) -> None:
+        """Restore the import progress saved by `as_dict`."""
+        if data and data.get("last_hour"):
+            self._last_hour = dt_util.parse_datetime(data["last_hour"])
+
+    def _pending_hours(self) -> list[datetime]:
+        """Return the start of every completed hour not imported yet."""
+        current_hour = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+        first = current_hour - timedelta(hours=STATISTICS_BACKFILL_HOURS)
+        if self._last_hour is not None:
+            first = max(first, self._last_hour + HOUR)
+        hours = []
+        while first < current_hour:
+            hours.append(first)
+            first += HOUR
+        return hours
+
+    def _build_statistics(
+        self,
+        hours: list[datetime],
+        series: list[tuple[tuple[str, str], PriceRing]],
+        scope: Collection[str] | None,
+    ) -> dict[str, tuple[str, list[StatisticData]]]:
+        """Return the name and hourly rows of every statistic id. Runs in an executor."""
+        format_price = self._engine.format_price
+        stations: dict[str, tuple[str, list[StatisticData]]] = {}
+        # (state, fuel type) -> hour -> [(min, mean, max) of each station]
+        aggregates: dict[tuple[str, str], dict[datetime, list[tuple[float, float, float]]]] = {}
+        for (code, fuel_type), ring in series:
+            if fuel_type not in self._fuel_types:
+                continue
+            station = self._engine.station(code) or {}
+            state = station.get("state", "TAS")
+            rows = []
+            for hour in hours:
+                # The end is just inside the hour so a change on the hour counts for the next one
+                stats = ring.stats(hour.timestamp(), (hour + HOUR).timestamp() - 0.001)
+                if stats.minimum is None:
+                    continue
+                aggregates.setdefault((state, fuel_type), {}).setdefault(hour, []).append(
+                    (stats.minimum, stats.mean, stats.maximum)
+                )
+                rows.append(StatisticData(
+                    start=hour,
+                    min=format_price(stats.minimum),
+                    mean=format_price(stats.mean),
+                    max=format_price(stats.maximum),
+                ))
+            if rows and (scope is None or code in scope):
+                stations[statistic_id(fuel_type, code)] = (
+                    f"{station.get('name', f'Station {code}')} {fuel_type}", rows
+                )
+
+        for (state, fuel_type), per_hour in aggregates.items():
+            stations[statistic_id(fuel_type, f"{state}_all_stations")] = (
+                f"{state} {fuel_type} all stations",
+                [
+                    StatisticData(
+                        start=hour,
+                        min=format_price(min(s[0] for s in values)),
+                        mean=format_price(sum(s[1] for s in values) / len(values)),
+                        max=format_price(max(s[2] for s in values)),
+                    )
+                    for hour, values in sorted(per_hour.items())
+                ],
+            )
+        return stations
+
+    async def async_import(self, now: datetime | None = None) -> None:
+        """Import the statistics of every completed hour since the last import."""
+        if self._importing or not (hours := self._pending_hours()):
+            return
+        self._importing = True
+        try:
+            start = time.perf_counter()
+            # Copy the records of the pending hours on the loop, refreshes keep appending to the live rings
+            series = [
+                (key, ring.since(hours[0].timestamp()))
+                for key, ring in self._history.items()
+                if key[1] in self._fuel_types
+            ]
+            stations = await self._hass.async_add_executor_job(
+                self._build_statistics, hours, series, self._station_scope()
+            )
+
+            failed = 0
+            for stat_id, (name, rows) in stations.items():
+                metadata = StatisticMetaData(
+                    source=DOMAIN,
+                    statistic_id=stat_id,
+                    name=name,
+                    unit_of_measurement=self._engine.unit,
+                    has_sum=False,
+                    **MEAN_METADATA,
+                )
+                try:
+                    async_add_external_statistics(self._hass, metadata, rows)
+                except Exception:  # One bad statistic id must not block the rest
+                    failed += 1
+                    LOGGER.exception("Could not import statistics for %s", stat_id)
+
+            # Failed ids are not retried, so one bad id cannot hold back every later hour
+            self._last_hour = hours[-1]
+        finally:
+            self._importing = False
+        duration_ms = (time.perf_counter() - start) * 1000
+        self.last_import = {
+            "hours": len(hours),
+            "statistics": len(stations),
+            "failed": failed,
+            "rows": sum(len(rows) for _, rows in stations.values()),
+            "duration_ms": round(duration_ms, 1),
+        }
+        LOGGER.debug(
+            "Imported %s hours of statistics for %s statistic ids (%s failed) in %.1f ms",
+            len(hours), len(stations), failed, duration_ms,
+        )
@@ -0,0 +1,213 @@
+"""Trading hours helpers for the Tasmanian Fuel Prices integration."""
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+import re
+from typing import Any
+
+from .const import LOGGER
+
+NO_TRADING_HOURS = "Hours not provided by station"
+DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# "06:00", "6:00", "06:00:00" or "6:00 AM"; seconds are ignored
+_TIME_RE = re.compile(r"(\d{1,2}):(\d{2})(?::\d{2})?\s*([AaPp][Mm])?")
+
+
+def format_trading_hours(raw_hours: list[dict] | None) -> dict[str, str] | str:
+    """Convert the TAS FuelCheck 'tradinghours' list into day name to display text."""
+    formatted_hours = {}
+    for day_info in raw_hours or []:
+        day_name = day_info.get('Day', '').capitalize()
+        if day_info.get('IsOpen24Hours'):
+            hours_string = "24 Hours"
+        elif day_info.get('IsClose'):
+            hours_string = "Closed"
+        else:
+            start = day_info.get('StartTime', 'N/A')
+            end = day_info.get('EndTime', 'N/A')
+            hours_string = f"{start} - {end}"
+        formatted_hours[day_name] = hours_string
+
+    return formatted_hours or NO_TRADING_HOURS
+
+
+def parse_time_of_day(text: str) -> int | None:
+    """Return the minutes since midnight of an upstream trading time, 1440 for "24:00", None if unparseable."""
+    match = _TIME_RE.fullmatch(text.strip())
+    if match is None:
+        return None
+    hour, minute, meridiem = int(match[1]), int(match[2]), match[3]
+    if meridiem is not None:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem.upper() == "PM" else 0)
+    if minute > 59 or hour * 60 + minute > MINUTES_PER_DAY:
+        return None
+    return hour * 60 + minute
+
+
+def minute_of_week(when: datetime) -> int:
+    """Return the minutes since Monday midnight of a local time."""
+    return when.weekday() * MINUTES_PER_DAY + when.hour * 60 + when.minute
+
+
+class WeeklyHours:
+    """
+    The trading hours of one station as sorted, non-overlapping open intervals
+    in minutes since Monday midnight, so a lookup is a single bisect.
+
+    Built from the display text of `format_trading_hours`. Hours running past
+    midnight spill into the next day, "24:00" closes at the end of the day, and
+    Sunday night wraps into Monday. Days without usable hours are remembered
+    as unknown.
+    """
+
+    __slots__ = ("_starts", "_ends", "_unknown_days")
+
+    def __init__(self, hours: Any) -> None:
+        """Compile the formatted trading hours of a station."""
+        intervals: list[tuple[int, int]] = []
+        self._unknown_days = set(range(len(DAYS)))
+        for day, day_name in enumerate(DAYS):
+            text = hours.get(day_name) if isinstance(hours, dict) else None
+            day_start = day * MINUTES_PER_DAY
+            if text == "24 Hours":
+                intervals.append((day_start, day_start + MINUTES_PER_DAY))
+            elif text != "Closed":
+                parts = (text or "").split(" - ")
+                times = [parse_time_of_day(part) for part in parts] if len(parts) == 2 else [None]
+                if None in times:
+                    if text is not None:
+                        LOGGER.debug("Unparseable trading hours %r on %s, treating the day as unknown", text, day_name)
+                    continue
+                opens = day_start + times[0]
+                closes = day_start + times[1]
+                if closes <= opens:
+                    closes += MINUTES_PER_DAY
+                if closes > MINUTES_PER_WEEK:
+                    intervals.append((0, closes - MINUTES_PER_WEEK))
+                    closes = MINUTES_PER_WEEK
+                intervals.append((opens, closes))
+            self._unknown_days.discard(day)
+
+        merged: list[list[int]] = []
+        for opens, closes in sorted(intervals):
+            if merged and opens <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], closes)
+            else:
+                merged.append([opens, closes])
+        self._starts = [opens for opens, _ in merged]
+        self._ends = [closes for _, closes in merged]
+
+    def is_open(self, when: datetime) -> bool | None:
+        """Return whether the station is open at a local time, None when its hours that day are unknown."""
+        minute = minute_of_week(when)
+        position = bisect_right(self._starts, minute) - 1
+        if position >= 0 and minute < self._ends[position]:
+            return True
+        return None if when.weekday() in self._unknown_days else False
+
+    def next_change(self, when: datetime) -> datetime | None:
+        """Return the next local time after `when` the station opens or closes, None if it never does."""
+        boundaries = [*self._starts, *self._ends]
+        if self._starts and self._starts[0] == 0 and self._ends[-1] == MINUTES_PER_WEEK:
+            # Open across Sunday midnight, the ends of the week are not a change
+            boundaries.remove(0)
+            boundaries.remove(MINUTES_PER_WEEK)
+        if not boundaries:
+            return None
+        minute = minute_of_week(when)
+        # The first boundary of next week when none is left this week
+        following = min((b for b in boundaries if b > minute), default=min(boundaries) + MINUTES_PER_WEEK)
+        return when.replace(second=0, microsecond=0) + timedelta(minutes=following - minute)
+
+
+class TradingHoursIndex:
+    """Weekly open intervals of every station, compiled once per trading hours payload."""
+
+    def __init__(self, trading_hours: Mapping[str, Any] | None) -> None:
+        """Compile the station code to formatted trading hours mapping built by `TasFuelAPI`."""
+        self._stations = {code: WeeklyHours(hours) for code, hours in (trading_hours or {}).items()}
+
+    def is_open(self, code: str, when: datetime) -> bool | None:
+        """Return whether a station is open at a local time, None when its hours are unknown."""
+        hours = self._stations.get(code)
+        return hours.is_open(when) if hours is not None else None
+
+    def next_change(self, code: str, when: datetime) -> datetime | None:
+        """Return the next local time after `when` a station opens or closes, None when its hours are unknown."""
+        hours = self._stations.get(code)
+        return hours.next_change(when) if hours is not None else None
+
+
+class TradingHoursPlanner:
+    """
+    Decide which fuel-type queries to run against the TAS FuelCheck website.
+
+    Each query returns every station in the state selling that fuel, so most
+    stations appear in several responses. The planner greedily picks the query
+    expected to cover the most still-uncovered stations, using the coverage
+    seen on previous runs and, for fuels it has not seen yet, the fuels each
+    station sells in the current price snapshot.
+    """
+
+    def __init__(self, fuel_types: list[str]) -> None:
+        """Initialize the planner."""
+        self._fuel_types = list(fuel_types)
+        self._coverage: dict[str, set[str]] = {}
+
+    @property
+    def coverage(self) -> dict[str, set[str]]:
+        """Return the station IDs each fuel-type query returned last time."""
+        return self._coverage
+
+    def next_query(
+        self,
+        uncovered: set[str],
+        queried: set[str],
+        station_fuels: dict[str, set[str]],
+    ) -> str | None:
+        """Return the next fuel type to query, or None when nothing useful is left."""
+        best_fuel = None
+        best_gain = 0
+        for fuel in self._fuel_types:
+            if fuel in queried:
+                continue
+            expected = self._coverage.get(fuel)
+            if expected is None:
+                expected = {code for code, fuels in station_fuels.items() if fuel in fuels}
+            gain = len(expected & uncovered)
+            if gain > best_gain:
+                best_fuel, best_gain = fuel, gain
+
+        if best_fuel is not None:
+            return best_fuel
+
+        # No known query covers what is left, so try a fuel we have never queried
+        return next(
+            (f for f in self._fuel_types if f not in queried and f not in self._coverage),
+            None,
+        )
+
+    def record(self, fuel: str, station_ids: set[str]) -> None:
+        """Remember which stations a fuel-type query returned."""
+        self._coverage[fuel] = set(station_ids)
+
+    def as_dict(self) -> dict:
+        """Return the remembered coverage for persistence."""
+        return {"coverage": {fuel: sorted(ids) for fuel, ids in self._coverage.items()}}
+
+    def load(self, data: dict | None) -> None:
+        """Restore coverage saved by `as_dict`."""
+        if not data:
+            return
+        self._coverage = {
+            fuel: set(ids)
+            for fuel, ids in data.get("coverage", {}).items()
+            if fuel in self._fuel_types
+        }
@@ -0,0 +1,74 @@
+"""Unique ID encoding and parsing for the Tasmanian Fuel Prices integration."""
+from __future__ import annotations
+
+from typing import NamedTuple
+
+from .const import FUEL_TYPE_ORDER
+
+KIND_PRICE = "price"
+KIND_SUMMARY = "summary"
+KIND_CYCLE = "cycle"
+SUMMARY_PREFIX = "cheapest_"
+CYCLE_PREFIX = "cycle_"
+
+_KNOWN_FUEL_TYPES = frozenset(FUEL_TYPE_ORDER)
+
+
+class ParsedUniqueId(NamedTuple):
+    """The parts of a per-fuel unique ID."""
+
+    kind: str
+    fuel_type: str
+    station_code: str | None = None
+    summary: str | None = None
+    region: str | None = None
+
+
+def price_sensor_unique_id(entry_id: str, station_code: str, fuel_type: str) -> str:
+    """Return the unique ID of a station price sensor."""
+    return f"{entry_id}_{station_code}_{fuel_type}"
+
+
+def summary_sensor_unique_id(entry_id: str, fuel_type: str, summary: str) -> str:
+    """Return the unique ID of a summary sensor such as 'cheapest_near_me'."""
+    return f"{entry_id}_{fuel_type}_{summary}"
+
+
+def cycle_sensor_unique_id(entry_id: str, fuel_type: str, region: str) -> str:
+    """Return the unique ID of a price cycle sensor."""
+    return f"{entry_id}_{fuel_type}_{CYCLE_PREFIX}{region}"
+
+
+def fuel_device_identifier(entry_id: str, fuel_type: str) -> str:
+    """Return the device identifier of a fuel type device."""
+    return f"{entry_id}_{fuel_type}"
+
+
+def parse_unique_id(entry_id: str, unique_id: str) -> ParsedUniqueId | None:
+    """
+    Parse a price, summary or price cycle sensor unique ID.
+    Returns None for IDs of other entities or other config entries.
+    """
+    prefix = f"{entry_id}_"
+    if not unique_id.startswith(prefix):
+        return None
+    rest = unique_id[len(prefix):]
+
+    fuel_type, _, summary = rest.partition("_")
+    if fuel_type in _KNOWN_FUEL_TYPES and summary.startswith(SUMMARY_PREFIX):
+        return ParsedUniqueId(KIND_SUMMARY, fuel_type, summary=summary)
+    if fuel_type in _KNOWN_FUEL_TYPES and summary.startswith(CYCLE_PREFIX):
+        return ParsedUniqueId(KIND_CYCLE, fuel_type, region=summary[len(CYCLE_PREFIX):])
+
+    station_code, _, fuel_type = rest.rpartition("_")
+    if station_code and fuel_type in _KNOWN_FUEL_TYPES:
+        return ParsedUniqueId(KIND_PRICE, fuel_type, station_code=station_code)
+    return None
+
+
+def parse_fuel_device_identifier(entry_id: str, identifier: str) -> str | None:
+    """Return the fuel type of a fuel type device identifier, or None for other devices."""
+    prefix = f"{entry_id}_"
+    if identifier.startswith(prefix) and identifier[len(prefix):] in _KNOWN_FUEL_TYPES:
+        return identifier[len(prefix):]
+    return None
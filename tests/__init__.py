@@ -0,0 +1 @@
+"""Tests for the Tasmanian Fuel Prices integration."""
@@ -0,0 +1,203 @@
+"""Tests for the price engine and trading hours, run without Home Assistant."""
+from __future__ import annotations
+
+from datetime import datetime
+from itertools import product
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from benchmarks import load_integration_module
+
+const = load_integration_module("const")
+core = load_integration_module("core")
+trading_hours = load_integration_module("trading_hours")
+
+TZ = ZoneInfo("Australia/Hobart")
+HOBART = (-42.8821, 147.3272)
+# Monday 19 October 2026, 12:00 local time
+MONDAY_NOON = datetime(2026, 10, 19, 12, 0, tzinfo=TZ)
+
+PROGRAMS = (
+    ("Woolworths", "woolworths", const.CONF_ENABLE_WOOLWORTHS_DISCOUNT, const.CONF_WOOLWORTHS_DISCOUNT_AMOUNT),
+    ("Coles", "coles", const.CONF_ENABLE_COLES_DISCOUNT, const.CONF_COLES_DISCOUNT_AMOUNT),
+    ("RACT", "ract", const.CONF_ENABLE_RACT_DISCOUNT, const.CONF_RACT_DISCOUNT_AMOUNT),
+    ("United", "united", const.CONF_ENABLE_UNITED_DISCOUNT, const.CONF_UNITED_DISCOUNT_AMOUNT),
+)
+
+
+def station(code: str, latitude: float, longitude: float) -> dict:
+    """Return a FuelPriceCheck station."""
+    return {
+        "code": code,
+        "name": f"Station {code}",
+        "address": f"{code} Main Road, HOBART TAS 7000",
+        "location": {"latitude": latitude, "longitude": longitude},
+        "state": "TAS",
+    }
+
+
+def price(code: str, cents: float, fuel_type: str = "U91") -> dict:
+    """Return a FuelPriceCheck price."""
+    return {"stationcode": code, "fueltype": fuel_type, "price": cents, "lastupdated": "19/10/2026 09:00:00"}
+
+
+def additional_data(**lists) -> dict:
+    """Return the GitHub lists `TasFuelAPI` builds, empty unless given."""
+    data = {key: [] for _, key, _, _ in PROGRAMS}
+    data.update(tyre_inflation=[], distributors={}, operators={})
+    data.update(lists)
+    return data
+
+
+def make_engine(prices: dict, extra: dict, hours: dict | None = None, **options) -> core.FuelPriceEngine:
+    """Return an engine synced to the payloads, measuring distances from Hobart."""
+    engine = core.FuelPriceEngine({const.CONF_LOCATION_ENTITY: "device_tracker.car", **options}, TZ)
+    engine.sync(prices, extra, hours or {})
+    engine.set_location(*HOBART)
+    return engine
+
+
+def legacy_discount(code: str, options: dict, extra: dict) -> tuple[str, float]:
+    """The discount chain of the per-entity price sensors before the engine replaced it."""
+    provider, amount = "None", 0.0
+    for name, key, enable_key, amount_key in PROGRAMS:
+        if provider == "None" and options.get(enable_key) and code in set(extra.get(key, [])):
+            provider, amount = name, float(options.get(amount_key, 0))
+    return provider, amount
+
+
+@pytest.mark.parametrize("enabled", list(product([False, True], repeat=len(PROGRAMS))))
+def test_discount_order_matches_legacy_sensor(enabled: tuple[bool, ...]) -> None:
+    """Only the first enabled program listing a station applies, Woolworths first and United last."""
+    options = {}
+    for (_, _, enable_key, amount_key), on, amount in zip(PROGRAMS, enabled, (4, 5, 6, 7)):
+        options[enable_key] = on
+        options[amount_key] = amount
+    # One station in every subset of the four program lists
+    memberships = list(product([False, True], repeat=len(PROGRAMS)))
+    codes = [str(100 + index) for index in range(len(memberships))]
+    extra = additional_data(**{
+        key: [code for code, member in zip(codes, memberships) if member[position]]
+        for position, (_, key, _, _) in enumerate(PROGRAMS)
+    })
+    prices = {"stations": [station(code, *HOBART) for code in codes], "prices": [price(code, 200.0) for code in codes]}
+    engine = make_engine(prices, extra, **options)
+
+    for code in codes:
+        provider, amount = legacy_discount(code, options, extra)
+        result = engine.station_result(code, "U91")
+        assert (result["discount_provider"], result["discount_amount"]) == (provider, amount)
+        assert result["discounted_price"] == 200.0 - amount
+
+
+def test_zero_amount_program_does_not_block_a_later_one() -> None:
+    """An enabled program with no discount leaves the station to the next program, as the summaries did."""
+    options = {
+        const.CONF_ENABLE_WOOLWORTHS_DISCOUNT: True,
+        const.CONF_WOOLWORTHS_DISCOUNT_AMOUNT: 0,
+        const.CONF_ENABLE_COLES_DISCOUNT: True,
+        const.CONF_COLES_DISCOUNT_AMOUNT: 4,
+    }
+    prices = {"stations": [station("1", *HOBART)], "prices": [price("1", 200.0)]}
+    engine = make_engine(prices, additional_data(woolworths=["1"], coles=["1"]), **options)
+
+    result = engine.station_result("1", "U91")
+    assert (result["discount_provider"], result["discount_amount"]) == ("Coles", 4.0)
+    assert engine.station_list("U91")[0]["discounted_price"] == 1.96
+
+
+def test_range_filtering_and_summary_ranking() -> None:
+    """Stations out of range are left out, and the cheapest with tyre inflation follows the cheapest overall."""
+    prices = {
+        "stations": [
+            station("1", *HOBART),
+            station("2", HOBART[0] + 0.03, HOBART[1]),  # About 3.3 km north
+            station("3", HOBART[0] + 0.2, HOBART[1]),  # About 22 km north
+            station("4", HOBART[0] - 0.02, HOBART[1]),
+        ],
+        "prices": [price("1", 199.9), price("2", 195.9), price("3", 179.9), price("4", 197.9)],
+    }
+    engine = make_engine(prices, additional_data(tyre_inflation=["4"]), **{const.CONF_RANGE: 10})
+
+    in_range = {s["code"]: s[const.ATTR_IN_RANGE] for s in engine.station_list("U91")}
+    assert in_range == {"1": True, "2": True, "3": False, "4": True}
+    assert [s["code"] for s in engine.summary("U91")] == ["2", "4"]
+
+    engine = make_engine(prices, additional_data(tyre_inflation=["2"]), **{const.CONF_RANGE: 10})
+    assert [s["code"] for s in engine.summary("U91")] == ["2"]
+
+
+def test_filtered_summary_skips_excluded_operators() -> None:
+    """The filtered summary skips stations run by an excluded operator."""
+    prices = {"stations": [station("1", *HOBART), station("2", *HOBART)], "prices": [price("1", 190.0), price("2", 195.0)]}
+    extra = additional_data(operators={"1": "Reddy Express", "2": "Independent"})
+    engine = make_engine(prices, extra, **{const.CONF_EXCLUDED_OPERATORS: ["Reddy Express"]})
+
+    assert [s["code"] for s in engine.summary("U91")] == ["1"]
+    assert [s["code"] for s in engine.summary("U91", filtered=True)] == ["2"]
+
+
+def test_skip_closed_keeps_stations_with_unknown_hours() -> None:
+    """Only stations known to be closed on arrival are skipped."""
+    closed = {day: "Closed" for day in trading_hours.DAYS}
+    hours = {
+        "1": closed,
+        "2": {"Monday": "N/A - N/A"},
+        "3": trading_hours.NO_TRADING_HOURS,
+        "4": {day: "6:00 AM - 24:00" for day in trading_hours.DAYS},
+    }
+    prices = {
+        "stations": [station(code, *HOBART) for code in hours],
+        "prices": [price("1", 180.0), price("2", 185.0), price("3", 190.0), price("4", 195.0)],
+    }
+    engine = make_engine(prices, additional_data(), hours, **{const.CONF_SKIP_CLOSED_STATIONS: True})
+
+    assert engine.open_at_arrival("1", MONDAY_NOON, 0.0) is False
+    assert engine.open_at_arrival("2", MONDAY_NOON, 0.0) is None
+    assert engine.open_at_arrival("3", MONDAY_NOON, 0.0) is None
+    assert engine.open_at_arrival("4", MONDAY_NOON, 0.0) is True
+    assert [s["code"] for s in engine.summary("U91", now=MONDAY_NOON)] == ["2"]
+    # Station 4 is the only one with a boundary ahead, closing at midnight
+    assert engine.next_open_change("U91", None, MONDAY_NOON) == datetime(2026, 10, 20, 0, 0, tzinfo=TZ)
+
+
+@pytest.mark.parametrize(
+    ("text", "minutes"),
+    [
+        ("06:00", 360),
+        ("6:00", 360),
+        ("06:00:00", 360),
+        ("6:30 am", 390),
+        ("12:00 AM", 0),
+        ("9:15 PM", 1275),
+        ("24:00", 1440),
+        ("24:30", None),
+        ("13:00 PM", None),
+        ("N/A", None),
+    ],
+)
+def test_parse_time_of_day(text: str, minutes: int | None) -> None:
+    """Upstream trading times parse to minutes since midnight."""
+    assert trading_hours.parse_time_of_day(text) == minutes
+
+
+def test_weekly_hours_overnight_and_next_change() -> None:
+    """Hours past midnight spill into the next day, and Sunday night wraps into Monday."""
+    hours = trading_hours.WeeklyHours({"Sunday": "22:00 - 02:00", "Monday": "06:00 - 24:00"})
+
+    assert hours.is_open(datetime(2026, 10, 19, 1, 0, tzinfo=TZ)) is True
+    assert hours.is_open(datetime(2026, 10, 19, 3, 0, tzinfo=TZ)) is False
+    assert hours.is_open(datetime(2026, 10, 19, 23, 59, tzinfo=TZ)) is True
+    assert hours.is_open(datetime(2026, 10, 20, 12, 0, tzinfo=TZ)) is None
+    assert hours.next_change(datetime(2026, 10, 19, 3, 0, tzinfo=TZ)) == datetime(2026, 10, 19, 6, 0, tzinfo=TZ)
+
+
+def test_next_change_skips_the_week_boundary() -> None:
+    """A station open around the clock never changes, and one open over Sunday midnight does not change then."""
+    always = trading_hours.WeeklyHours({day: "24 Hours" for day in trading_hours.DAYS})
+    assert always.next_change(MONDAY_NOON) is None
+
+    overnight = trading_hours.WeeklyHours({"Sunday": "22:00 - 02:00"})
+    sunday_night = datetime(2026, 10, 25, 23, 0, tzinfo=TZ)
+    assert overnight.next_change(sunday_night) == datetime(2026, 10, 26, 2, 0, tzinfo=TZ)
@@ -0,0 +1,103 @@
+"""Tests for the price history ring buffers and journal, run without Home Assistant."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from benchmarks import load_integration_module
+
+history = load_integration_module("history")
+snapshot = load_integration_module("snapshot")
+
+
+def test_ring_wraps_around_keeping_the_newest_records() -> None:
+    """A full ring overwrites its oldest record and still reads oldest first."""
+    ring = history.PriceRing(3)
+    for timestamp, price in [(0.0, 1.0), (10.0, 2.0), (20.0, 3.0), (30.0, 4.0), (40.0, 5.0)]:
+        assert ring.append(timestamp, price)
+
+    assert len(ring) == 3
+    assert ring.records() == [(20.0, 3.0), (30.0, 4.0), (40.0, 5.0)]
+    assert ring.records(25.0, 40.0) == [(30.0, 4.0), (40.0, 5.0)]
+    assert ring.latest() == (40.0, 5.0)
+    assert ring.price_at(35.0) == (30.0, 4.0)
+    # Older than what is left of the history
+    assert ring.price_at(15.0) is None
+
+
+def test_ring_ignores_repeated_and_older_prices() -> None:
+    """A record that repeats the latest price, or is older than it, is ignored."""
+    ring = history.PriceRing(4)
+    assert ring.append(10.0, 1.0)
+    assert not ring.append(20.0, 1.0)
+    assert not ring.append(5.0, 2.0)
+    assert ring.records() == [(10.0, 1.0)]
+
+
+def test_since_copies_the_prevailing_price() -> None:
+    """A detached copy holds the price in effect at its start, and does not follow the original."""
+    ring = history.PriceRing(3)
+    for timestamp, price in [(0.0, 1.0), (10.0, 2.0), (20.0, 3.0), (30.0, 4.0)]:
+        ring.append(timestamp, price)
+
+    copy = ring.since(25.0)
+    ring.append(40.0, 5.0)
+    assert copy.records() == [(20.0, 3.0), (30.0, 4.0)]
+    assert ring.since(30.0).records() == [(30.0, 4.0), (40.0, 5.0)]
+
+
+def test_stats_counts_a_record_at_the_start_once() -> None:
+    """A change exactly at the period start is not also counted as the prevailing price."""
+    ring = history.PriceRing(16)
+    ring.append(0.0, 100.0)
+    ring.append(3600.0, 200.0)
+
+    assert ring.stats(3600.0, 7200.0) == history.PriceStats(1, 200.0, 200.0, 200.0)
+
+
+def test_stats_mean_is_weighted_by_time() -> None:
+    """The mean weighs each price by how long it held within the period."""
+    ring = history.PriceRing(16)
+    ring.append(0.0, 100.0)
+    ring.append(3540.0, 160.0)
+
+    stats = ring.stats(0.0, 3600.0)
+    assert stats.changes == 2
+    assert (stats.minimum, stats.maximum) == (100.0, 160.0)
+    assert stats.mean == pytest.approx(101.0)
+
+    # The price set before the period holds from its start
+    stats = ring.stats(1800.0, 3600.0)
+    assert stats.changes == 1
+    assert stats.mean == pytest.approx(102.0)
+
+
+def test_stats_of_an_empty_period() -> None:
+    """A period before the history, with nothing in effect, has no prices."""
+    ring = history.PriceRing(16)
+    ring.append(100.0, 1.0)
+
+    assert ring.stats(0.0, 50.0) == history.PriceStats(0, None, None, None)
+
+
+def test_journal_round_trip_and_compaction(tmp_path: Path) -> None:
+    """Appended and compacted journals load back into the same history."""
+    price_history = history.PriceHistory(2)
+    journal = history.HistoryJournal(tmp_path / "history.jsonl", compact_slack=0)
+    old_price = None
+    for timestamp, price in [(0.0, 1.0), (10.0, 2.0), (20.0, 3.0), (30.0, 4.0), (40.0, 5.0)]:
+        journal.save(price_history.record_changes(timestamp, [snapshot.PriceChange("211", "U91", old_price, price)]))
+        old_price = price
+
+    loaded = history.PriceHistory(2)
+    assert journal.load(loaded) == 5
+    assert list(loaded.rows()) == list(price_history.rows()) == [[30.0, "211", "U91", 4.0], [40.0, "211", "U91", 5.0]]
+
+    # Five lines for a history of two records
+    assert journal.needs_compaction(len(price_history))
+    journal.save([], list(price_history.rows()))
+    assert not journal.needs_compaction(len(price_history))
+    loaded = history.PriceHistory(2)
+    assert journal.load(loaded) == 2
+    assert list(loaded.rows()) == list(price_history.rows())